@@ -0,0 +1,187 @@
+# data_processing/cache.py
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Tuple
+
+
+def file_signature(path: str) -> Tuple[str, int, int]:
+    """
+    Liefert die Identität einer Quelldatei als (absoluter Pfad, mtime_ns, Größe).
+    Ändert sich die Datei, ändert sich die Signatur – alte Cache-Einträge
+    werden damit automatisch unerreichbar.
+    """
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    return abs_path, st.st_mtime_ns, st.st_size
+
+
+def _mentions_path(key: Any, abs_path: str) -> bool:
+    """True, wenn key (beliebig verschachteltes Tupel) eine Signatur von abs_path enthält."""
+    if not isinstance(key, tuple):
+        return False
+    if len(key) == 3 and key[0] == abs_path and isinstance(key[1], int):
+        return True
+    return any(_mentions_path(part, abs_path) for part in key)
+
+
+class LayerCache:
+    """
+    Prozessweiter, thread-sicherer LRU-Cache für geladene Layer und
+    abgeleitete Daten (z. B. den "einfachsten" Layer einer Datei).
+
+    Schlüssel sind Tupel, deren erstes Element die Dateisignatur
+    (siehe file_signature) ist. Jobs auf denselben Quelldateien teilen
+    sich dadurch die Einträge, solange sie im selben Prozess laufen.
+
+    Hintergrund-Laden (siehe background()) legt Einträge mit niedriger
+    Priorität ab: sie werden zuerst verdrängt, zählen nicht in die
+    Trefferstatistik und werden beim ersten Vordergrund-Zugriff zu
+    normalen Einträgen. Läuft ein Ladevorgang für einen Schlüssel
+    bereits, wartet get_or_load auf dessen Ergebnis statt doppelt zu laden.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._low: set = set()                              # Schlüssel mit niedriger Priorität
+        self._pending: Dict[Hashable, threading.Event] = {}  # laufende Ladevorgänge
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Alle Zugriffe dieses Threads im Block gelten als Hintergrund-Laden."""
+        previous = getattr(self._local, "background", False)
+        self._local.background = True
+        try:
+            yield
+        finally:
+            self._local.background = previous
+
+    @property
+    def in_background(self) -> bool:
+        return getattr(self._local, "background", False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            background = self.in_background
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if not background:
+                    self._low.discard(key)
+                    self.hits += 1
+                return self._entries[key]
+            if not background:
+                self.misses += 1
+            return default
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Reine Abfrage, zählt weder als Treffer noch als Fehlzugriff
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if self.in_background:
+                if key not in self._entries:
+                    self._low.add(key)
+            else:
+                self._low.discard(key)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._evict(keep=key)
+
+    def _evict(self, keep: Hashable) -> None:
+        """Verdrängt den ältesten Hintergrund-Eintrag, sonst den ältesten überhaupt."""
+        victim = next((k for k in self._entries if k in self._low and k != keep), None)
+        if victim is None:
+            victim = next(k for k in self._entries if k != keep)
+        del self._entries[victim]
+        self._low.discard(victim)
+
+    def claim(self, key: Hashable) -> bool:
+        """
+        Meldet einen Ladevorgang für key an. False, wenn der Eintrag schon
+        vorliegt oder gerade von einem anderen Thread geladen wird. Nach
+        True muss release(key) folgen (auch bei Fehlern).
+        """
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return False
+            self._pending[key] = threading.Event()
+            return True
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Gibt den Eintrag zurück oder lädt ihn über loader() nach. Lädt ein
+        anderer Thread denselben Schlüssel gerade (z. B. der Prefetcher),
+        wird auf dessen Ergebnis gewartet.
+        """
+        sentinel = object()
+        while True:
+            value = self.get(key, sentinel)
+            if value is not sentinel:
+                return value
+            with self._lock:
+                event = self._pending.get(key)
+                if event is None:
+                    self._pending[key] = threading.Event()
+            if event is None:
+                break
+            event.wait()
+            # Erneut nachsehen; ist der andere Ladevorgang gescheitert, selbst laden
+
+        try:
+            value = loader()
+            self.put(key, value)
+        finally:
+            self.release(key)
+        return value
+
+    def invalidate_path(self, path: str) -> int:
+        """
+        Entfernt alle Einträge, die von der Datei path abhängen – auch
+        abgeleitete, deren Schlüssel die Signatur verschachtelt enthalten
+        (z. B. der GID-Index eines Basis-Frames). Rückgabe: Anzahl Einträge.
+        """
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            stale = [k for k in self._entries if _mentions_path(k, abs_path)]
+            for key in stale:
+                del self._entries[key]
+                self._low.discard(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._low.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "background": len(self._low),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# Gemeinsame Instanz für den ganzen Prozess (GUI oder Batch-Worker)
+layer_cache = LayerCache()
@@ -0,0 +1,398 @@
+# data_processing/catalog.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data_processing.cache import file_signature
+from data_processing.gid_index import layer_level
+from data_processing.sources import SNAPSHOT_DIRNAME
+
+# Standard-Speicherort (relativ zum Projekt-Root, wie die Log-Datei)
+DEFAULT_CATALOG_FILE = "cache/catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    country  TEXT,
+    gid_0    TEXT
+);
+CREATE TABLE IF NOT EXISTS layers (
+    path        TEXT NOT NULL,
+    layer       TEXT NOT NULL,
+    level       INTEGER,
+    features    INTEGER,
+    minx REAL, miny REAL, maxx REAL, maxy REAL,   -- Ausdehnung in EPSG:4326
+    crs         TEXT,
+    columns     TEXT,                              -- JSON-Liste der Spalten
+    name_column TEXT,
+    PRIMARY KEY (path, layer)
+);
+CREATE TABLE IF NOT EXISTS names (
+    path  TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    name  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS names_by_layer ON names (path, layer);
+CREATE INDEX IF NOT EXISTS names_by_name ON names (name COLLATE NOCASE);
+"""
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _open_gpkg(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(Path(path).as_uri() + "?mode=ro", uri=True)
+
+
+class GpkgCatalog:
+    """
+    Persistenter Katalog über GeoPackage-Dateien (SQLite).
+
+    Je Datei werden Layer, Feature-Anzahl, Ausdehnung in EPSG:4326, CRS,
+    Spaltenschema und Regionsnamen abgelegt – direkt aus den GPKG-Metadaten
+    (gpkg_contents, R-Tree) gelesen, ohne Geometrien zu dekodieren.
+    Einträge gelten, solange mtime und Größe der Datei passen; refresh()
+    und ensure() indizieren nur neue bzw. geänderte Dateien nach.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+        # Räumlicher Index über die Datei-Ausdehnungen: (Zeilen, STRtree)
+        self._tree: Optional[Tuple[tuple, Any]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._initialized:
+            return sqlite3.connect(self.db_path, timeout=30)
+        with self._lock:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(self.db_path, timeout=30)
+            if not self._initialized:
+                con.executescript(SCHEMA)
+                self._initialized = True
+        return con
+
+    # ------------------------------------------------------------
+    # Aktualisieren
+    # ------------------------------------------------------------
+    def refresh(self, directory: str, recursive: bool = False) -> int:
+        """
+        Gleicht den Katalog mit allen .gpkg-Dateien in directory ab.
+        Nur neue oder geänderte Dateien werden gelesen; verschwundene
+        Dateien fliegen raus. Rückgabe: Anzahl neu indizierter Dateien.
+        """
+        root = os.path.abspath(directory)
+        if recursive:
+            found = []
+            for d, dirs, files in os.walk(root):
+                # Schnappschüsse der SourceRegistry nicht mit indizieren
+                dirs[:] = [x for x in dirs if x != SNAPSHOT_DIRNAME]
+                found.extend(os.path.join(d, f) for f in files if f.lower().endswith(".gpkg"))
+        else:
+            found = [
+                os.path.join(root, f) for f in os.listdir(root)
+                if f.lower().endswith(".gpkg")
+            ]
+
+        indexed = 0
+        for path in found:
+            try:
+                indexed += self._update(path)
+            except (OSError, sqlite3.Error) as e:
+                logging.warning("Katalog: %s nicht indizierbar: %s", path, e)
+
+        # Verschwundene Dateien entfernen
+        con = self._connect()
+        try:
+            known = [r[0] for r in con.execute(
+                "SELECT path FROM files WHERE path LIKE ? ESCAPE '\\'",
+                (root.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + os.sep + "%",),
+            )]
+            gone = [p for p in known if not os.path.exists(p)]
+            with con:
+                for path in gone:
+                    self._delete(con, path)
+        finally:
+            con.close()
+        if indexed or gone:
+            logging.info("Katalog %s: %d Datei(en) indiziert, %d entfernt", root, indexed, len(gone))
+        return indexed
+
+    def ensure(self, path: str) -> bool:
+        """Stellt sicher, dass path aktuell im Katalog steht. False bei Fehlern/Nicht-GPKG."""
+        if Path(str(path)).suffix.lower() != ".gpkg":
+            return False
+        try:
+            self._update(str(path))
+            return True
+        except (OSError, sqlite3.Error) as e:
+            logging.debug("Katalog: %s nicht indizierbar: %s", path, e)
+            return False
+
+    def _update(self, path: str) -> bool:
+        """Indiziert path, falls unbekannt oder geändert. True, wenn neu gelesen wurde."""
+        signature = file_signature(path)
+        abs_path, mtime_ns, size = signature
+        con = self._connect()
+        try:
+            row = con.execute(
+                "SELECT mtime_ns, size FROM files WHERE path = ?", (abs_path,)
+            ).fetchone()
+            if row == (mtime_ns, size):
+                return False
+            file_row, layer_rows, name_rows = self._read_gpkg(abs_path)
+            with con:
+                self._delete(con, abs_path)
+                con.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                    (abs_path, mtime_ns, size, *file_row),
+                )
+                con.executemany(
+                    "INSERT INTO layers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(abs_path, *r) for r in layer_rows],
+                )
+                con.executemany(
+                    "INSERT INTO names VALUES (?, ?, ?)",
+                    [(abs_path, *r) for r in name_rows],
+                )
+            return True
+        finally:
+            con.close()
+
+    @staticmethod
+    def _delete(con: sqlite3.Connection, path: str) -> None:
+        for table in ("files", "layers", "names"):
+            con.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    # ------------------------------------------------------------
+    # GPKG-Metadaten lesen
+    # ------------------------------------------------------------
+    def _read_gpkg(self, path: str) -> Tuple[tuple, List[tuple], List[tuple]]:
+        from data_processing.layers import _name_column
+
+        gpkg = _open_gpkg(path)
+        try:
+            contents = gpkg.execute(
+                "SELECT c.table_name, c.min_x, c.min_y, c.max_x, c.max_y, "
+                "       s.organization, s.organization_coordsys_id, g.column_name "
+                "FROM gpkg_contents c "
+                "LEFT JOIN gpkg_spatial_ref_sys s ON s.srs_id = c.srs_id "
+                "LEFT JOIN gpkg_geometry_columns g ON g.table_name = c.table_name "
+                "WHERE c.data_type = 'features'"
+            ).fetchall()
+
+            layer_rows, name_rows = [], []
+            country = gid_0 = None
+            for table, minx, miny, maxx, maxy, org, org_id, geom_col in contents:
+                columns = [r[1] for r in gpkg.execute(f"PRAGMA table_info({_ident(table)})")]
+                crs = f"{org.upper()}:{org_id}" if org and org_id is not None and org_id >= 0 else None
+
+                # R-Tree liefert Anzahl und Ausdehnung, ohne die Tabelle zu scannen
+                rtree = f"rtree_{table}_{geom_col}" if geom_col else None
+                stats = None
+                if rtree and gpkg.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = ?", (rtree,)
+                ).fetchone():
+                    stats = gpkg.execute(
+                        f"SELECT COUNT(*), MIN(minx), MIN(miny), MAX(maxx), MAX(maxy) FROM {_ident(rtree)}"
+                    ).fetchone()
+                if stats is not None:
+                    features, *bounds = stats
+                    if minx is None:
+                        minx, miny, maxx, maxy = bounds
+                else:
+                    features = gpkg.execute(f"SELECT COUNT(*) FROM {_ident(table)}").fetchone()[0]
+
+                minx, miny, maxx, maxy = self._to_wgs84(crs, minx, miny, maxx, maxy)
+
+                name_col = _name_column(table, columns)
+                if name_col:
+                    name_rows.extend(
+                        (table, str(r[0])) for r in gpkg.execute(
+                            f"SELECT DISTINCT {_ident(name_col)} FROM {_ident(table)} "
+                            f"WHERE {_ident(name_col)} IS NOT NULL"
+                        )
+                    )
+
+                # Staat aus dem obersten Layer (GADM: COUNTRY/GID_0)
+                if country is None and "COUNTRY" in columns:
+                    first = gpkg.execute(
+                        f"SELECT COUNTRY{', GID_0' if 'GID_0' in columns else ''} "
+                        f"FROM {_ident(table)} LIMIT 1"
+                    ).fetchone()
+                    if first:
+                        country = first[0]
+                        gid_0 = first[1] if len(first) > 1 else None
+
+                layer_rows.append((
+                    table, layer_level(table), features, minx, miny, maxx, maxy,
+                    crs, json.dumps(columns), name_col,
+                ))
+        finally:
+            gpkg.close()
+        return (country, gid_0), layer_rows, name_rows
+
+    @staticmethod
+    def _to_wgs84(crs: Optional[str], minx, miny, maxx, maxy) -> tuple:
+        """Ausdehnung nach EPSG:4326 (alle vier Ecken, damit gedrehte Gitter passen)."""
+        if None in (minx, miny, maxx, maxy) or crs in (None, "EPSG:4326"):
+            return minx, miny, maxx, maxy
+        try:
+            from data_processing.proj_cache import proj_cache
+            t = proj_cache.transformer(crs, "EPSG:4326")
+            xs, ys = t.transform([minx, minx, maxx, maxx], [miny, maxy, miny, maxy])
+            return min(xs), min(ys), max(xs), max(ys)
+        except Exception as e:
+            logging.debug("Katalog: Ausdehnung aus %s nicht umrechenbar: %s", crs, e)
+            return None, None, None, None
+
+    # ------------------------------------------------------------
+    # Abfragen (indizieren die Datei bei Bedarf nach)
+    # ------------------------------------------------------------
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        con = self._connect()
+        try:
+            return con.execute(sql, tuple(params)).fetchall()
+        finally:
+            con.close()
+
+    def files(self) -> List[str]:
+        return [r[0] for r in self._query("SELECT path FROM files ORDER BY path")]
+
+    def layers(self, path: str) -> Optional[List[str]]:
+        """Layer einer Datei (GPKG-Reihenfolge); None, wenn nicht katalogisierbar."""
+        if not self.ensure(path):
+            return None
+        return [r[0] for r in self._query(
+            "SELECT layer FROM layers WHERE path = ? ORDER BY rowid", (os.path.abspath(path),)
+        )]
+
+    def layer_info(self, path: str, layer: str) -> Optional[Dict[str, Any]]:
+        if not self.ensure(path):
+            return None
+        rows = self._query(
+            "SELECT level, features, minx, miny, maxx, maxy, crs, columns, name_column "
+            "FROM layers WHERE path = ? AND layer = ?", (os.path.abspath(path), layer)
+        )
+        if not rows:
+            return None
+        level, features, minx, miny, maxx, maxy, crs, columns, name_col = rows[0]
+        return {
+            "level": level,
+            "features": features,
+            "bounds": (minx, miny, maxx, maxy) if minx is not None else None,
+            "crs": crs,
+            "columns": json.loads(columns),
+            "name_column": name_col,
+        }
+
+    def simplest_layer(self, path: str) -> Optional[str]:
+        """ADM_ADM_0, sonst der Layer mit den wenigsten Features."""
+        if not self.ensure(path):
+            return None
+        rows = self._query(
+            "SELECT layer FROM layers WHERE path = ? "
+            "ORDER BY layer = 'ADM_ADM_0' DESC, features ASC LIMIT 1",
+            (os.path.abspath(path),),
+        )
+        return rows[0][0] if rows else None
+
+    def region_names(self, path: str, layer: str) -> Optional[List[str]]:
+        """Regionsnamen eines Layers; None ohne NAME_-Spalte oder ohne Katalogeintrag."""
+        info = self.layer_info(path, layer)
+        if info is None or not info["name_column"]:
+            return None
+        return [r[0] for r in self._query(
+            "SELECT name FROM names WHERE path = ? AND layer = ?",
+            (os.path.abspath(path), layer),
+        )]
+
+    def country(self, path: str) -> Optional[str]:
+        """Staatsname (GADM-Spalte COUNTRY) einer Datei."""
+        if not self.ensure(path):
+            return None
+        rows = self._query("SELECT country FROM files WHERE path = ?", (os.path.abspath(path),))
+        return rows[0][0] if rows else None
+
+    def search_regions(self, text: str, limit: int = 50) -> List[Tuple[str, str, str]]:
+        """Regionen aller katalogisierten Dateien, deren Name text enthält: (Name, Datei, Layer)."""
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._query(
+            "SELECT name, path, layer FROM names WHERE name LIKE ? ESCAPE '\\' "
+            "ORDER BY name COLLATE NOCASE LIMIT ?",
+            (pattern, int(limit)),
+        )
+
+    # ------------------------------------------------------------
+    # Räumliche Abfrage (Nachbarländer)
+    # ------------------------------------------------------------
+    def neighbours(
+        self,
+        bounds: Tuple[float, float, float, float],
+        dirs: Iterable[str],
+        level: int = 0,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Dateien aus dirs, deren Layer der Ebene level die Ausdehnung bounds
+        (minx, miny, maxx, maxy in EPSG:4326) schneidet: (Datei, Layer, CRS).
+        Abfrage über einen STRtree, der nur neu gebaut wird, wenn sich die
+        Katalogeinträge geändert haben.
+        """
+        from shapely import box
+
+        roots = tuple(os.path.join(os.path.abspath(d), "") for d in dirs)
+        skip = {os.path.abspath(p) for p in exclude if p}
+        rows, tree = self._spatial_index(level)
+        hits = tree.query(box(*bounds), predicate="intersects") if rows else []
+        result = []
+        for i in sorted(int(i) for i in hits):
+            path, layer, crs = rows[i][:3]
+            if path not in skip and path.startswith(roots):
+                result.append((path, layer, crs))
+        return result
+
+    def _spatial_index(self, level: int) -> Tuple[tuple, Any]:
+        from shapely import STRtree, box
+
+        rows = tuple(self._query(
+            "SELECT path, layer, crs, minx, miny, maxx, maxy FROM layers "
+            "WHERE level = ? AND minx IS NOT NULL ORDER BY path", (level,)
+        ))
+        with self._lock:
+            if self._tree is not None and self._tree[0] == rows:
+                return self._tree
+        tree = STRtree([box(*r[3:]) for r in rows]) if rows else None
+        with self._lock:
+            self._tree = (rows, tree)
+        return rows, tree
+
+
+_catalog: Optional[GpkgCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> GpkgCatalog:
+    """Gemeinsamer Katalog; Speicherort aus config["catalog"]["file"]."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            from utils.config import BASE_DIR, config_manager
+            try:
+                cfg = config_manager.get_base().get("catalog", {})
+            except Exception:
+                cfg = {}
+            db_path = Path(cfg.get("file", DEFAULT_CATALOG_FILE))
+            if not db_path.is_absolute():
+                db_path = BASE_DIR / db_path
+            _catalog = GpkgCatalog(str(db_path))
+        return _catalog
@@ -1,45 +1,163 @@
 # data_processing/crs.py
 
-import json
-from pathlib import Path
-import geopandas as gpd
-from typing import Tuple
-
-# ---- Config laden ----
-# Annahme: config/config.json im Projekt-Root
-_CONFIG_PATH = (
-    Path(__file__).resolve().parent.parent
-    / "config"
-    / "config.json"
-)
-try:
-    with _CONFIG_PATH.open(encoding="utf-8") as _f:
-        _CONFIG    = json.load(_f)
-        _KARTE_CFG = _CONFIG.get("karte", {})
-except Exception:
-    _KARTE_CFG = {}
-
-# Padding-Werte aus Config (Default 5%)
-PADDING_X = _KARTE_CFG.get("padding_x", 0.05)
-PADDING_Y = _KARTE_CFG.get("padding_y", 0.05)
-
-
-def reproject(gdf: gpd.GeoDataFrame, target_crs: str) -> gpd.GeoDataFrame:
+import os
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from data_processing.proj_cache import proj_cache
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# Default-Padding (5%), falls die Config keine Werte setzt
+DEFAULT_PADDING = 0.05
+
+# Koordinaten pro Chunk bei der gebündelten Reprojektion (reproject_many)
+REPROJECT_CHUNK = 250_000
+
+
+def _config_padding() -> Tuple[float, float]:
+    """
+    Padding-Werte aus der Basis-Config (karte.padding_x / padding_y).
+    Wird erst beim Aufruf gelesen – config.json wird nicht beim Import geparst.
+    """
+    from utils.config import config_manager
+    karte_cfg = config_manager.get_base().get("karte", {})
+    return (
+        karte_cfg.get("padding_x", DEFAULT_PADDING),
+        karte_cfg.get("padding_y", DEFAULT_PADDING),
+    )
+
+
+def reproject(gdf: "gpd.GeoDataFrame", target_crs: str) -> "gpd.GeoDataFrame":
     """
     Reprojiziert das GeoDataFrame ins target_crs.
+    Der Transformer kommt aus dem prozessweiten proj_cache, statt wie bei
+    gdf.to_crs für jeden Layer neu aus der PROJ-Datenbank aufgebaut zu werden.
+    """
+    if gdf.crs is None:
+        # Gleiche Fehlermeldung wie geopandas bei fehlendem Quell-CRS
+        return gdf.to_crs(target_crs)
+
+    dst = proj_cache.crs(target_crs)
+    if gdf.crs == dst:
+        return gdf
+
+    import numpy as np
+    import shapely
+
+    transformer = proj_cache.transformer(gdf.crs, dst, always_xy=True)
+
+    def _transform(coords):
+        return np.column_stack(transformer.transform(*coords.T))
+
+    values = np.asarray(gdf.geometry.values)
+    include_z = bool(shapely.has_z(values).any())
+    return _with_geometry(gdf, shapely.transform(values, _transform, include_z=include_z), dst)
+
+
+def reproject_many(
+    frames: List["gpd.GeoDataFrame"],
+    target_crs: str,
+    max_workers: Optional[int] = None
+) -> List["gpd.GeoDataFrame"]:
+    """
+    Reprojiziert mehrere GeoDataFrames in einem Durchgang.
+
+    Alle Koordinaten von Frames mit gleichem Quell-CRS landen in einem
+    zusammenhängenden Puffer (shapely.get_coordinates), werden in Chunks
+    parallel mit dem gecachten Transformer umgerechnet und per
+    shapely.set_coordinates zurückgeschrieben. Reihenfolge und Index der
+    Frames bleiben erhalten; Frames ohne CRS, im Ziel-CRS oder mit
+    Z-Koordinaten laufen über reproject().
+    """
+    import numpy as np
+    import shapely
+
+    dst = proj_cache.crs(target_crs)
+    results: List["gpd.GeoDataFrame"] = list(frames)
+
+    # Frames nach Quell-CRS gruppieren (ein Transformer pro Gruppe)
+    groups: Dict[Any, List[int]] = {}
+    for i, gdf in enumerate(frames):
+        if gdf.crs is None or gdf.crs == dst:
+            results[i] = reproject(gdf, target_crs)
+            continue
+        if shapely.has_z(np.asarray(gdf.geometry.values)).any():
+            results[i] = reproject(gdf, target_crs)
+            continue
+        groups.setdefault(gdf.crs, []).append(i)
+
+    for src, indices in groups.items():
+        # np.concatenate erzeugt ein neues Objekt-Array; set_coordinates arbeitet
+        # in-place darauf, die (gecachten) Ausgangsgeometrien bleiben unberührt.
+        geoms = np.concatenate([np.asarray(frames[i].geometry.values) for i in indices])
+        coords = shapely.get_coordinates(geoms)
+        x = np.ascontiguousarray(coords[:, 0])
+        y = np.ascontiguousarray(coords[:, 1])
+
+        transformer = proj_cache.transformer(src, dst, always_xy=True)
+        _transform_chunked(transformer, x, y, max_workers)
+        shapely.set_coordinates(geoms, np.column_stack([x, y]))
+
+        offset = 0
+        for i in indices:
+            n = len(frames[i])
+            results[i] = _with_geometry(frames[i], geoms[offset:offset + n], dst)
+            offset += n
+
+    return results
+
+
+def _transform_chunked(transformer, x, y, max_workers: Optional[int] = None) -> None:
+    """
+    Transformiert die Koordinatenpuffer x/y in-place, bei großen Puffern
+    in Chunks über mehrere Threads (PROJ gibt dabei den GIL frei).
     """
-    return gdf.to_crs(target_crs)
+    n = len(x)
+    bounds = [(start, min(start + REPROJECT_CHUNK, n)) for start in range(0, n, REPROJECT_CHUNK)]
+
+    def run(bound: Tuple[int, int]) -> None:
+        start, end = bound
+        # Slices zusammenhängender float64-Arrays → pyproj schreibt direkt hinein
+        transformer.transform(x[start:end], y[start:end], inplace=True)
+
+    workers = min(len(bounds), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for bound in bounds:
+            run(bound)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, bounds))
+
+
+def _with_geometry(gdf: "gpd.GeoDataFrame", values, crs) -> "gpd.GeoDataFrame":
+    """Flache Kopie von gdf mit neuen Geometrien im angegebenen CRS."""
+    import geopandas as gpd
+
+    result = gdf.copy(deep=False)
+    result.geometry = gpd.GeoSeries(values, index=gdf.index, crs=crs, name=gdf.geometry.name)
+    return result
 
 
 def compute_bbox(
-    gdf: gpd.GeoDataFrame,
-    aspect_ratio: float
+    gdf: "gpd.GeoDataFrame",
+    aspect_ratio: float,
+    padding_x: Optional[float] = None,
+    padding_y: Optional[float] = None
 ) -> Tuple[float, float, float, float]:
     """
     Berechnet ein Bounding-Box-Tuple (xmin, xmax, ymin, ymax),
     das das gegebene GeoDataFrame mit dem gewünschten Seitenverhältnis
-    umschließt und dabei PADDING_X / PADDING_Y aus der Config anwendet.
+    umschließt und dabei padding_x / padding_y anwendet
+    (ohne Angabe: Werte aus der Config).
     """
+    if padding_x is None or padding_y is None:
+        cfg_x, cfg_y = _config_padding()
+        padding_x = cfg_x if padding_x is None else padding_x
+        padding_y = cfg_y if padding_y is None else padding_y
+
     minx, miny, maxx, maxy = gdf.total_bounds
     width, height = maxx - minx, maxy - miny
     center_x, center_y = (minx + maxx) / 2, (miny + maxy) / 2
@@ -52,13 +170,29 @@ def compute_bbox(
         new_height = height
         new_width = height * aspect_ratio
 
-    # Padding aus config.json
-    new_width *= (1 + PADDING_X)
-    new_height *= (1 + PADDING_Y)
+    # Padding anwenden
+    new_width *= (1 + padding_x)
+    new_height *= (1 + padding_y)
 
     xmin = center_x - new_width / 2
     xmax = center_x + new_width / 2
     ymin = center_y - new_height / 2
     ymax = center_y + new_height / 2
 
-    return xmin, xmax, ymin, ymax
\ No newline at end of file
+    return xmin, xmax, ymin, ymax
+
+
+def transform_bounds(
+    bounds: Tuple[float, float, float, float],
+    src: Any,
+    dst: Any
+) -> Tuple[float, float, float, float]:
+    """
+    Rechnet eine Ausdehnung (minx, miny, maxx, maxy) von src nach dst um.
+    Die Kanten werden verdichtet, damit gekrümmte Ränder (z. B. UTM → WGS84)
+    vollständig in der Ziel-Box liegen.
+    """
+    if proj_cache.crs(src) == proj_cache.crs(dst):
+        return tuple(bounds)
+    transformer = proj_cache.transformer(src, dst, always_xy=True)
+    return tuple(transformer.transform_bounds(*bounds, densify_pts=21))
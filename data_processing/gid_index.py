@@ -0,0 +1,145 @@
+# data_processing/gid_index.py
+
+from typing import List, Optional, TYPE_CHECKING
+
+# numpy/pandas erst bei Bedarf laden
+if TYPE_CHECKING:
+    import numpy as np
+    import geopandas as gpd
+
+# GADM kodiert die Hierarchie in GID_0 (Staat) bis GID_5
+MAX_LEVEL = 5
+
+
+def layer_level(key: str) -> Optional[int]:
+    """Verwaltungsebene aus einem Layernamen (ADM_ADM_2) bzw. einer Spalte (NAME_2)."""
+    tail = str(key).rsplit("_", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+class GidIndex:
+    """
+    Präfixbaum über die GID-Spalten eines Basis-Frames (alle Ebenen, alle Layer).
+
+    Knoten aller Ebenen sind global durchnummeriert, Ebene für Ebene:
+    - level_offset[i] .. level_offset[i + 1]: Knoten der i-ten vorhandenen Ebene
+    - node_gid[n]:  GID des Knotens
+    - parent[n]:    Elternknoten (-1 für Wurzeln)
+    - child_ptr / child_idx: Kinder je Knoten als CSR-Arrays
+    - row_node[r]:  Knoten der Zeile r (ihre tiefste GID), -1 ohne GID
+
+    Hide/Highlight eines Elternknotens erreicht so alle Nachkommen über
+    Array-Indizierung statt über Stringvergleiche in jedem Layer.
+    """
+
+    def __init__(self, levels, level_offset, node_gid, parent, child_ptr, child_idx, row_node) -> None:
+        self.levels: List[int] = levels
+        self.level_offset = level_offset
+        self.node_gid = node_gid
+        self.parent = parent
+        self.child_ptr = child_ptr
+        self.child_idx = child_idx
+        self.row_node = row_node
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_gid)
+
+    # ------------------------------------------------------------
+    # Aufbau
+    # ------------------------------------------------------------
+    @classmethod
+    def from_frame(cls, gdf: "gpd.GeoDataFrame") -> Optional["GidIndex"]:
+        """Baut den Index aus den GID_x-Spalten; None, wenn es keine gibt."""
+        import numpy as np
+        import pandas as pd
+
+        levels = [k for k in range(MAX_LEVEL + 1) if f"GID_{k}" in gdf.columns]
+        if not levels:
+            return None
+
+        row_node = np.full(len(gdf), -1, dtype=np.int64)
+        gid_parts, parent_parts, offsets = [], [], [0]
+        prev_nodes, prev_offset, prev_col = None, 0, None
+
+        for k in levels:
+            col = f"GID_{k}"
+            gids = gdf[col].to_numpy(dtype=object)
+            # Fehlende GIDs sind NaN oder (nach der Bereinigung im Composer) ""
+            present = pd.notna(gids) & (gids != "")
+            if not present.any():
+                continue
+            gids = gids[present].astype(str)
+
+            # Knoten dieser Ebene = eindeutige GIDs (auch aus tieferen Layern)
+            codes, uniques = pd.factorize(gids)
+            offset = offsets[-1]
+            # Tiefere Ebenen überschreiben → jede Zeile landet auf ihrer tiefsten GID
+            row_node[present] = codes + offset
+
+            parent = np.full(len(uniques), -1, dtype=np.int64)
+            if prev_nodes is not None:
+                # Elternteil je Knoten aus der ersten Zeile, in der er vorkommt
+                first = np.unique(codes, return_index=True)[1]
+                parent_gids = gdf[prev_col].to_numpy(dtype=object)[present][first]
+                idx = prev_nodes.get_indexer(pd.Index(parent_gids).astype(str))
+                parent = np.where(idx >= 0, idx + prev_offset, -1)
+
+            gid_parts.append(np.asarray(uniques, dtype=object))
+            parent_parts.append(parent)
+            offsets.append(offset + len(uniques))
+            prev_nodes, prev_offset, prev_col = pd.Index(uniques), offset, col
+
+        if not gid_parts:
+            return None
+
+        node_gid = np.concatenate(gid_parts)
+        parent = np.concatenate(parent_parts)
+
+        # Kinder als CSR: child_idx[child_ptr[n]:child_ptr[n + 1]] sind die Kinder von n
+        has_parent = np.flatnonzero(parent >= 0)
+        order = np.argsort(parent[has_parent], kind="stable")
+        child_idx = has_parent[order]
+        counts = np.bincount(parent[has_parent], minlength=len(node_gid))
+        child_ptr = np.concatenate([[0], np.cumsum(counts)])
+
+        return cls(levels, np.asarray(offsets), node_gid, parent, child_ptr, child_idx, row_node)
+
+    # ------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------
+    def _children_of(self, nodes: "np.ndarray") -> "np.ndarray":
+        """Alle Kinder der gegebenen Knoten, vektorisiert über die CSR-Arrays."""
+        import numpy as np
+
+        starts = self.child_ptr[nodes]
+        counts = self.child_ptr[nodes + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64)
+        # Position j der Gruppe i: starts[i] + j – ohne Python-Schleife
+        shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.child_idx[shift + np.arange(total)]
+
+    def subtree_mask(self, nodes) -> "np.ndarray":
+        """
+        Bool-Array über alle Knoten (plus ein leerer Platz am Ende für -1):
+        True für die Knoten selbst und alle ihre Nachkommen.
+        """
+        import numpy as np
+
+        selected = np.zeros(self.n_nodes + 1, dtype=bool)
+        frontier = np.unique(np.asarray(nodes, dtype=np.int64))
+        frontier = frontier[frontier >= 0]
+        while frontier.size:
+            selected[frontier] = True
+            frontier = self._children_of(frontier)
+        return selected
+
+    def cascade_rows(self, seed_rows) -> "np.ndarray":
+        """
+        Zeilenmaske: die Zeilen aus seed_rows (Bool-Array) und alle Zeilen,
+        die in der GID-Hierarchie unter ihnen liegen – auch in anderen Layern.
+        """
+        seeds = self.row_node[seed_rows]
+        return self.subtree_mask(seeds)[self.row_node]
@@ -1,25 +1,278 @@
 # data_processing/layers.py
 
-import pandas as pd
-import geopandas as gpd
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 
-def merge_hauptland_layers(
+from data_processing.cache import file_signature, layer_cache
+from data_processing.crs import reproject, reproject_many
+
+# pandas/geopandas erst bei Bedarf laden (schneller Import für Worker-Prozesse)
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+
+# Ab so vielen Namen wird nicht mehr per SQL gefiltert (Länge der WHERE-Klausel)
+MAX_PUSHDOWN_VALUES = 5000
+
+
+def _layer_key(
+    path,
+    layer: Optional[str],
+    crs: Optional[str],
+    where: Optional[str] = None,
+    bbox: Optional[tuple] = None
+) -> tuple:
+    return (file_signature(str(path)), "layer", layer, crs, where, bbox)
+
+
+def _bbox_arg(bbox: Optional[tuple]) -> Optional[tuple]:
+    """Gerundete Box (Layer-CRS) – stabiler Cache-Schlüssel trotz Fließkomma-Rauschen."""
+    return tuple(round(float(v), 6) for v in bbox) if bbox is not None else None
+
+
+def _read_layer(
+    path,
+    layer: Optional[str],
+    where: Optional[str] = None,
+    bbox: Optional[tuple] = None
+) -> "gpd.GeoDataFrame":
+    import geopandas as gpd
+    kwargs = {"where": where} if where else {}
+    if bbox is not None:
+        kwargs["bbox"] = bbox
+    if layer is None:
+        return gpd.read_file(str(path), **kwargs)
+    return gpd.read_file(str(path), layer=layer, **kwargs)
+
+
+def _load_layer(
+    path: Path,
+    layer: Optional[str],
+    crs: Optional[str],
+    where: Optional[str] = None,
+    bbox: Optional[tuple] = None
+) -> "gpd.GeoDataFrame":
+    """
+    Liest einen Layer (oder ein Shapefile, wenn layer None ist) und
+    reprojiziert ihn ins Ziel-CRS. Das Ergebnis wird im prozessweiten
+    Layer-Cache abgelegt; zurückgegeben wird eine flache Kopie, damit
+    Aufrufer Spalten ergänzen können, ohne den Cache zu verändern.
+    Mit where bzw. bbox (minx, miny, maxx, maxy im Layer-CRS) werden nur
+    passende Features gelesen (beides Teil des Cache-Schlüssels).
+    """
+    bbox = _bbox_arg(bbox)
+
+    def loader() -> "gpd.GeoDataFrame":
+        gdf = _read_layer(path, layer, where, bbox)
+        if crs:
+            gdf = reproject(gdf, crs)
+        return gdf
+
+    return layer_cache.get_or_load(_layer_key(path, layer, crs, where, bbox), loader).copy(deep=False)
+
+
+# ------------------------------------------------------------
+# Filter-Pushdown (GeoPackage = SQLite)
+# ------------------------------------------------------------
+def _name_column(layer: str, columns) -> Optional[str]:
+    """NAME_x-Spalte eines Layers: passend zur Ebene, sonst die erste NAME_-Spalte."""
+    col = f"NAME_{layer.split('_')[-1]}"
+    if col in columns:
+        return col
+    candidates = [c for c in columns if c.startswith("NAME_")]
+    return candidates[0] if candidates else None
+
+
+@lru_cache(maxsize=256)
+def _gpkg_columns(signature: tuple, layer: str) -> Tuple[str, ...]:
+    """Spaltennamen eines GPKG-Layers direkt aus SQLite, ohne Features zu lesen."""
+    import sqlite3
+    uri = Path(signature[0]).as_uri() + "?mode=ro"
+    con = sqlite3.connect(uri, uri=True)
+    try:
+        rows = con.execute(f"PRAGMA table_info({_sql_ident(layer)})").fetchall()
+    finally:
+        con.close()
+    return tuple(r[1] for r in rows)
+
+
+def _sql_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_list(values) -> str:
+    return ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+
+
+def _filter_names(cfg: Optional[Dict[str, Any]], key: str) -> List[str]:
+    """Namen aus einer hide_cfg/include_cfg für einen Layer bzw. eine Spalte (nur Strings)."""
+    if not cfg or not cfg.get("aktiv", False):
+        return []
+    values = cfg.get("bereiche", {}).get(key)
+    if not isinstance(values, (list, set, tuple)):
+        return []
+    return sorted({v for v in values if isinstance(v, str)})
+
+
+def layer_where(
+    path,
+    layer: Optional[str],
+    hide_cfg: Optional[Dict[str, Any]] = None,
+    include_cfg: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """
+    Baut für einen GPKG-Layer die WHERE-Klausel aus Hide- und Subset-Auswahl,
+    damit ausgeschlossene Features gar nicht erst gelesen, dekodiert und
+    reprojiziert werden. None, wenn nichts zu filtern ist oder der Filter
+    nicht übertragbar ist (Shapefile, keine NAME_-Spalte, sehr lange Listen) –
+    dann filtert merge_hauptland_layers wie bisher nach dem Laden.
+    """
+    if layer is None or Path(str(path)).suffix.lower() != ".gpkg":
+        return None
+    hide = _filter_names(hide_cfg, layer)
+    include = _filter_names(include_cfg, layer)
+    if not hide and not include:
+        return None
+    if len(hide) + len(include) > MAX_PUSHDOWN_VALUES:
+        return None
+
+    try:
+        columns = _gpkg_columns(file_signature(str(path)), layer)
+    except Exception as e:
+        logging.debug("Spalten von %s (%s) nicht lesbar: %s", path, layer, e)
+        return None
+    col = _name_column(layer, columns)
+    if col is None:
+        return None
+
+    ident = _sql_ident(col)
+    clauses = []
+    if hide:
+        # NULL-Namen bleiben erhalten (wie ~isin nach dem Laden)
+        clauses.append(f"({ident} IS NULL OR {ident} NOT IN ({_sql_list(hide)}))")
+    if include:
+        clauses.append(f"{ident} IN ({_sql_list(include)})")
+    return " AND ".join(clauses)
+
+
+def layer_name_column(path, layer: str) -> Optional[str]:
+    """NAME_x-Spalte eines GPKG-Layers laut Tabellenschema (ohne Features zu lesen)."""
+    if Path(str(path)).suffix.lower() != ".gpkg":
+        return None
+    return _name_column(layer, _gpkg_columns(file_signature(str(path)), layer))
+
+
+def region_names(path, layer: str) -> Optional[List[str]]:
+    """
+    Eindeutige Regionsnamen (NAME_x) eines GPKG-Layers aus dem Katalog
+    bzw. direkt per SQL, ohne Geometrien zu dekodieren; gecacht je Dateisignatur. None für
+    Shapefiles oder Layer ohne NAME_-Spalte.
+    """
+    if Path(str(path)).suffix.lower() != ".gpkg":
+        return None
+    signature = file_signature(str(path))
+
+    def loader() -> Optional[List[str]]:
+        # Zuerst der persistente Katalog (überlebt Neustarts), sonst direkt per SQL
+        from data_processing.catalog import get_catalog
+        try:
+            names = get_catalog().region_names(signature[0], layer)
+        except Exception as e:
+            logging.debug("Katalog für %s nicht verfügbar: %s", path, e)
+            names = None
+        if names is not None:
+            return names
+
+        col = layer_name_column(path, layer)
+        if col is None:
+            return None
+        import sqlite3
+        con = sqlite3.connect(Path(signature[0]).as_uri() + "?mode=ro", uri=True)
+        try:
+            rows = con.execute(
+                f"SELECT DISTINCT {_sql_ident(col)} FROM {_sql_ident(layer)} "
+                f"WHERE {_sql_ident(col)} IS NOT NULL"
+            ).fetchall()
+        finally:
+            con.close()
+        return [str(r[0]) for r in rows]
+
+    return layer_cache.get_or_load((signature, "region_names", layer), loader)
+
+
+def preload_layers(
+    sources: List[tuple],
+    crs: Optional[str]
+) -> None:
+    """
+    Lädt alle (Datei, Layer)-Paare, die noch nicht im Layer-Cache liegen,
+    und reprojiziert sie gemeinsam in einem Durchgang (reproject_many)
+    statt Layer für Layer. Nachfolgende merge_hauptland_layers-Aufrufe
+    treffen danach den Cache. Lesefehler werden hier nur protokolliert –
+    sie treten beim eigentlichen Laden erneut auf und werden dort behandelt.
+
+    sources: Tupel (Datei, Layer) oder (Datei, Layer, hide_cfg, include_cfg[, bbox]) –
+    die Filter müssen denen des späteren merge_hauptland_layers-Aufrufs entsprechen.
+    """
+    keys, claimed, frames = [], [], []
+    try:
+        for path, layers, *filters in sources:
+            hide_cfg, include_cfg, bbox = (list(filters) + [None, None, None])[:3]
+            bbox = _bbox_arg(bbox)
+            for layer in (layers or [None]):
+                try:
+                    where = layer_where(path, layer, hide_cfg, include_cfg)
+                    key = _layer_key(path, layer, crs, where, bbox)
+                    # Schon im Cache oder von einem anderen Thread in Arbeit
+                    if not layer_cache.claim(key):
+                        continue
+                    claimed.append(key)
+                    frames.append(_read_layer(path, layer, where, bbox))
+                    keys.append(key)
+                except Exception as e:
+                    logging.debug("Vorladen von %s (%s) fehlgeschlagen: %s", path, layer, e)
+
+        if not frames:
+            return
+        if crs:
+            frames = reproject_many(frames, crs)
+        for key, gdf in zip(keys, frames):
+            layer_cache.put(key, gdf)
+    finally:
+        for key in claimed:
+            layer_cache.release(key)
+
+
+def load_base_layers(
     gpkg_path: str,
     selected_layers: Optional[List[str]] = None,
+    crs: str = "EPSG:4326",
     hide_cfg: Optional[Dict[str, Any]] = None,
-    hl_cfg: Optional[Dict[str, Any]] = None,
-    crs: str = "EPSG:4326"
-) -> gpd.GeoDataFrame:
+    include_cfg: Optional[Dict[str, Any]] = None,
+    bbox: Optional[tuple] = None
+) -> "gpd.GeoDataFrame":
+    """
+    Lädt die gewählten Layer einer Datei als stabilen Basis-Frame – ohne
+    Highlight und (ohne hide_cfg) ohne Ausblendungen, damit er unabhängig
+    vom UI-Zustand gecacht werden kann. Zusätzliche Spalten:
+    - source_layer: Ursprungslayer ("shapefile" bei Shapefiles)
+    - __region: Regionsname aus der passenden NAME_x-Spalte
+    - __filter_key: Schlüssel in hide_cfg/hl_cfg (Layername bzw. NAME_-Spalte)
+    hide_cfg/include_cfg filtern bereits beim Laden (Batch, Teilauswahl);
+    für interaktive Änderungen stattdessen apply_region_masks verwenden.
+    bbox (Layer-CRS) liest nur Features, die die Box schneiden (Nachbarländer).
+    """
+    import pandas as pd
+    import geopandas as gpd
+
     path = Path(gpkg_path)
     dfs = []
 
     # --- Shapefile- oder "kein Layer"-Fall ---
     if not selected_layers:
-        gdf = gpd.read_file(str(path))
-        if crs:
-            gdf = gdf.to_crs(crs)
+        gdf = _load_layer(path, None, crs, bbox=bbox)
 
         # NAME_-Spalte suchen oder Dummy anlegen
         name_col = next((c for c in gdf.columns if c.startswith("NAME_")), None)
@@ -29,76 +282,159 @@ def merge_hauptland_layers(
 
         # Spalte für den Ursprungslayer hinzufügen (Shapefile → kein Layername)
         gdf["source_layer"] = "shapefile"
-
-        # Hide nur anwenden, wenn Spalte existiert und Werte Strings sind
-        if hide_cfg and hide_cfg.get("aktiv", False):
-            bereiche = hide_cfg.get("bereiche", {})
-            if (
-                name_col in gdf.columns
-                and name_col in bereiche
-                and isinstance(bereiche[name_col], (list, set, tuple))
-            ):
-                to_hide = {v for v in bereiche[name_col] if isinstance(v, str)}
-                if to_hide:
-                    gdf = gdf[~gdf[name_col].isin(to_hide)]
-
-        # Highlight nur anwenden, wenn Spalte existiert und Werte Strings sind
-        if hl_cfg and hl_cfg.get("aktiv", False):
-            hl_layer = hl_cfg.get("layer")
-            if hl_layer in gdf.columns:
-                names = {v for v in hl_cfg.get("namen", []) if isinstance(v, str)}
-                gdf["highlight"] = gdf[hl_layer].isin(names)
-            else:
-                gdf["highlight"] = False
-        else:
-            gdf["highlight"] = False
-
+        gdf["__region"] = gdf[name_col]
+        gdf["__filter_key"] = name_col
+        gdf = _filter_regions(gdf, name_col, hide_cfg, include_cfg)
         dfs.append(gdf)
 
     else:
         # --- GPKG mit Layernamen ---
         for layer in selected_layers:
-            gdf = gpd.read_file(str(path), layer=layer)
-            if crs:
-                gdf = gdf.to_crs(crs)
+            # Hide/Subset möglichst schon beim Lesen per SQL anwenden
+            where = layer_where(path, layer, hide_cfg, include_cfg)
+            gdf = _load_layer(path, layer, crs, where, bbox)
 
             # Dynamisch passende NAME_-Spalte finden
-            lvl = layer.split("_")[-1]
-            name_col = f"NAME_{lvl}"
-            if name_col not in gdf.columns:
-                candidates = [c for c in gdf.columns if c.startswith("NAME_")]
-                name_col = candidates[0] if candidates else None
-
+            name_col = _name_column(layer, gdf.columns)
             if name_col is None:
                 gdf["__name_col"] = ""
                 name_col = "__name_col"
 
             # Spalte für den Ursprungslayer hinzufügen
             gdf["source_layer"] = layer
-
-            # Hide nur anwenden, wenn Spalte existiert
-            if hide_cfg and hide_cfg.get("aktiv", False):
-                bereiche = hide_cfg.get("bereiche", {})
-                if (
-                    name_col in gdf.columns
-                    and layer in bereiche
-                    and isinstance(bereiche[layer], (list, set, tuple))
-                ):
-                    to_hide = {v for v in bereiche[layer] if isinstance(v, str)}
-                    if to_hide:
-                        gdf = gdf[~gdf[name_col].isin(to_hide)]
-
-            # Highlight nur anwenden, wenn Spalte existiert
-            if hl_cfg and hl_cfg.get("aktiv", False):
-                if hl_cfg.get("layer") == layer and name_col in gdf.columns:
-                    names = {v for v in hl_cfg.get("namen", []) if isinstance(v, str)}
-                    gdf["highlight"] = gdf[name_col].isin(names)
-                else:
-                    gdf["highlight"] = False
-            else:
-                gdf["highlight"] = False
-
+            gdf["__region"] = gdf[name_col]
+            gdf["__filter_key"] = layer
+            # Nach Pushdown ein No-op
+            gdf = _filter_regions(gdf, layer, hide_cfg, include_cfg)
             dfs.append(gdf)
 
     merged = pd.concat(dfs, ignore_index=True)
-    return gpd.GeoDataFrame(merged, geometry=dfs[0].geometry.name, crs=dfs[0].crs)
\ No newline at end of file
+    return gpd.GeoDataFrame(merged, geometry=dfs[0].geometry.name, crs=dfs[0].crs)
+
+
+def _filter_regions(
+    gdf: "gpd.GeoDataFrame",
+    key: str,
+    hide_cfg: Optional[Dict[str, Any]],
+    include_cfg: Optional[Dict[str, Any]]
+) -> "gpd.GeoDataFrame":
+    """Entfernt beim Laden ausgeblendete bzw. nicht ausgewählte Regionen."""
+    to_hide = _filter_names(hide_cfg, key)
+    if to_hide:
+        gdf = gdf[~gdf["__region"].isin(to_hide)]
+    to_keep = _filter_names(include_cfg, key)
+    if to_keep:
+        gdf = gdf[gdf["__region"].isin(to_keep)]
+    return gdf
+
+
+# ------------------------------------------------------------
+# Masken-Stufe (Hide/Highlight nach dem Laden)
+# ------------------------------------------------------------
+def categorize_regions(gdf: "gpd.GeoDataFrame") -> "gpd.GeoDataFrame":
+    """
+    Wandelt __region und __filter_key in Kategorien um. Einmal auf einen
+    (gecachten) Basis-Frame angewendet, kostet jede Maske danach nur noch
+    eine Lookup-Tabelle über die Kategorie-Codes.
+    """
+    for col in ("__region", "__filter_key"):
+        if col in gdf.columns and gdf[col].dtype.name != "category":
+            gdf[col] = gdf[col].astype("category")
+    return gdf
+
+
+def region_mask(gdf: "gpd.GeoDataFrame", selection: Dict[str, Any]):
+    """
+    Bool-Array der Zeilen, deren Region in selection ({Schlüssel: [Namen]})
+    steht. Pro Schlüssel: Lookup-Tabelle über die Kategorie-Codes von
+    __region, kombiniert mit dem Code von __filter_key. Die beiden Spalten
+    werden dafür bei Bedarf einmalig in Kategorien umgewandelt.
+    """
+    import numpy as np
+
+    mask = np.zeros(len(gdf), dtype=bool)
+    if not selection or "__region" not in gdf.columns or gdf.empty:
+        return mask
+
+    categorize_regions(gdf)
+    regions = gdf["__region"].cat
+    keys = gdf["__filter_key"].cat
+    region_codes = regions.codes.to_numpy()
+    key_codes = keys.codes.to_numpy()
+
+    for key, names in selection.items():
+        if not isinstance(names, (list, set, tuple)):
+            continue
+        k = keys.categories.get_indexer([key])[0]
+        if k < 0:
+            continue
+        idx = regions.categories.get_indexer([v for v in names if isinstance(v, str)])
+        # Ein Platz mehr: Code -1 (fehlender Name) landet auf dem letzten, leeren Eintrag
+        lut = np.zeros(len(regions.categories) + 1, dtype=bool)
+        lut[idx[idx >= 0]] = True
+        mask |= (key_codes == k) & lut[region_codes]
+    return mask
+
+
+def _selection_mask(gdf: "gpd.GeoDataFrame", selection: Dict[str, Any], gid_index=None):
+    """region_mask plus – mit GID-Index – alle Nachkommen der Treffer in tieferen Ebenen."""
+    mask = region_mask(gdf, selection)
+    if gid_index is not None and len(gid_index.row_node) == len(gdf) and mask.any():
+        mask |= gid_index.cascade_rows(mask)
+    return mask
+
+
+def apply_region_masks(
+    gdf: "gpd.GeoDataFrame",
+    hide_cfg: Optional[Dict[str, Any]] = None,
+    hl_cfg: Optional[Dict[str, Any]] = None,
+    exclude=None,
+    gid_index=None
+) -> "gpd.GeoDataFrame":
+    """
+    Wendet Hide und Highlight als Bool-Masken auf einen Basis-Frame an
+    (siehe load_base_layers) und gibt einen neuen Frame mit der Spalte
+    "highlight" zurück; der Basis-Frame bleibt unverändert.
+    exclude: optionale Maske von Zeilen, die weder ausgeblendet noch
+    hervorgehoben werden (z. B. das Overlay).
+    gid_index: optionaler GidIndex desselben Frames – dann wirken Hide und
+    Highlight einer Region auch auf ihre Unterregionen in anderen Layern.
+    """
+    import numpy as np
+
+    hidden = np.zeros(len(gdf), dtype=bool)
+    if hide_cfg and hide_cfg.get("aktiv", False):
+        hidden = _selection_mask(gdf, hide_cfg.get("bereiche", {}), gid_index)
+
+    highlight = np.zeros(len(gdf), dtype=bool)
+    if hl_cfg and hl_cfg.get("aktiv", False) and hl_cfg.get("layer"):
+        highlight = _selection_mask(gdf, {hl_cfg["layer"]: hl_cfg.get("namen", [])}, gid_index)
+
+    if exclude is not None:
+        exclude = np.asarray(exclude, dtype=bool)
+        hidden &= ~exclude
+        highlight &= ~exclude
+
+    result = gdf.copy(deep=False)
+    result["highlight"] = highlight
+    if hidden.any():
+        result = result[~hidden]
+    return result
+
+
+def merge_hauptland_layers(
+    gpkg_path: str,
+    selected_layers: Optional[List[str]] = None,
+    hide_cfg: Optional[Dict[str, Any]] = None,
+    hl_cfg: Optional[Dict[str, Any]] = None,
+    crs: str = "EPSG:4326",
+    include_cfg: Optional[Dict[str, Any]] = None
+) -> "gpd.GeoDataFrame":
+    """
+    Lädt die gewählten Layer einer Datei, wendet Hide/Subset an und markiert
+    Highlights. Bei GeoPackages werden Hide und Subset (include_cfg, gleiches
+    Format wie hide_cfg) als WHERE-Klausel schon beim Lesen angewendet.
+    Für interaktives Arbeiten: load_base_layers + apply_region_masks.
+    """
+    base = load_base_layers(gpkg_path, selected_layers, crs, hide_cfg, include_cfg)
+    return apply_region_masks(base, hide_cfg, hl_cfg)
@@ -0,0 +1,115 @@
+# data_processing/prefetch.py
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from data_processing.cache import layer_cache
+from data_processing.gid_index import layer_level
+
+# Standard-Ebene, wenn noch kein Layer angehakt ist (ADM_1 = Bundesländer o. Ä.)
+DEFAULT_LEVEL = 1
+
+
+def default_layers(layer_names: List[str]) -> List[str]:
+    """Wahrscheinlichster erster Layer: Ebene 1, sonst der erste vorhandene."""
+    for name in layer_names:
+        if layer_level(name) == DEFAULT_LEVEL:
+            return [name]
+    return list(layer_names[:1])
+
+
+def _lower_thread_priority() -> None:
+    """Hintergrund-Thread niedriger einplanen (Linux: nice pro Thread), best effort."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+class Prefetcher:
+    """
+    Lädt nach einem Drop spekulativ die Layer, die für die erste Vorschau
+    gebraucht werden: gelesen, ins Ziel-CRS reprojiziert und mit
+    Namensindex – alles mit niedriger Priorität im Layer-Cache
+    (siehe LayerCache.background). Ein einzelner Worker-Thread; jeder neue
+    Auftrag macht ältere überflüssig, sie brechen zwischen zwei Layern ab.
+    Fordert der Vordergrund einen Layer an, der gerade geladen wird, wartet
+    er auf dieses Ergebnis statt doppelt zu lesen.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def schedule(
+        self,
+        main: Optional[str],
+        main_layers: List[str],
+        subs: List[str],
+        crs: Optional[str],
+        include_cfg: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Ersetzt laufende Aufträge durch einen neuen (Quellen wie im MapComposer)."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="prefetch",
+                    initializer=_lower_thread_priority,
+                )
+            self._executor.submit(
+                self._run, generation, main, list(main_layers), list(subs), crs, include_cfg
+            )
+
+    def cancel(self) -> None:
+        """Verwirft alle offenen Aufträge (ein laufender Layer wird noch fertig)."""
+        with self._lock:
+            self._generation += 1
+
+    def _stale(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _run(self, generation, main, main_layers, subs, crs, include_cfg) -> None:
+        from data_processing.layers import preload_layers, region_names
+        from utils.layer_selector import get_simplest_layer
+
+        # Gleiche Quellen und Filter wie MapComposer._load_base_gdf → gleiche Cache-Schlüssel
+        jobs = []
+        if main:
+            jobs.extend((main, [layer], None, include_cfg) for layer in main_layers)
+        for sub in subs:
+            try:
+                layers = get_simplest_layer(sub) or main_layers[:1]
+            except Exception as e:
+                logging.debug("Prefetch: Layer von %s nicht bestimmbar: %s", sub, e)
+                continue
+            jobs.extend((sub, [layer], None, None) for layer in layers)
+
+        with layer_cache.background():
+            for path, layers, hide_cfg, inc_cfg in jobs:
+                if self._stale(generation):
+                    return
+                try:
+                    preload_layers([(path, layers, hide_cfg, inc_cfg)], crs)
+                    for layer in layers:
+                        region_names(path, layer)
+                except Exception as e:
+                    logging.debug("Prefetch von %s (%s) fehlgeschlagen: %s", path, layers, e)
+        logging.debug("Prefetch fertig: %d Layer", len(jobs))
+
+    def shutdown(self) -> None:
+        self.cancel()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Gemeinsame Instanz für die GUI
+prefetcher = Prefetcher()
@@ -0,0 +1,91 @@
+# data_processing/proj_cache.py
+
+import threading
+from typing import Any, Dict, Hashable, Tuple, TYPE_CHECKING
+
+# pyproj erst beim ersten Zugriff laden
+if TYPE_CHECKING:
+    from pyproj import CRS, Transformer
+
+
+def _crs_key(value: Any) -> Hashable:
+    """
+    Normalisiert eine CRS-Angabe (String, EPSG-Code, pyproj.CRS, Dict)
+    zu einem hashbaren Schlüssel.
+    """
+    if isinstance(value, (str, int)):
+        return value
+    if hasattr(value, "to_wkt"):
+        return value.to_wkt()
+    return repr(value)
+
+
+class ProjCache:
+    """
+    Prozessweiter, thread-sicherer Cache für pyproj-Objekte.
+
+    CRS.from_user_input und Transformer.from_crs schlagen jedes Mal in der
+    PROJ-Datenbank nach. Reprojektion und Scalebar holen sich ihre Objekte
+    deshalb hier ab; Transformer werden über (src, dst, always_xy) geteilt.
+    Transformer sind ab pyproj 3.1 thread-sicher und dürfen von mehreren
+    Threads gleichzeitig benutzt werden.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._crs: Dict[Hashable, "CRS"] = {}
+        self._transformers: Dict[Tuple[Hashable, Hashable, bool], "Transformer"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def crs(self, value: Any) -> "CRS":
+        """Gibt das (gecachte) pyproj.CRS zu einer beliebigen CRS-Angabe zurück."""
+        key = _crs_key(value)
+        with self._lock:
+            obj = self._crs.get(key)
+            if obj is not None:
+                self.hits += 1
+                return obj
+            self.misses += 1
+
+        from pyproj import CRS
+        obj = CRS.from_user_input(value)
+        with self._lock:
+            return self._crs.setdefault(key, obj)
+
+    def transformer(self, src: Any, dst: Any, always_xy: bool = True) -> "Transformer":
+        """Gibt den (gecachten) Transformer src → dst zurück."""
+        key = (_crs_key(src), _crs_key(dst), bool(always_xy))
+        with self._lock:
+            obj = self._transformers.get(key)
+            if obj is not None:
+                self.hits += 1
+                return obj
+            self.misses += 1
+
+        from pyproj import Transformer
+        obj = Transformer.from_crs(self.crs(src), self.crs(dst), always_xy=always_xy)
+        with self._lock:
+            return self._transformers.setdefault(key, obj)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._crs.clear()
+            self._transformers.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "crs": len(self._crs),
+                "transformers": len(self._transformers),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# Gemeinsame Instanz für den ganzen Prozess (GUI oder Batch-Worker)
+proj_cache = ProjCache()
@@ -0,0 +1,285 @@
+# data_processing/sources.py
+
+import atexit
+import logging
+import os
+import shutil
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+# Identität einer Datei: (absoluter Pfad, Inode, mtime_ns, Größe)
+Identity = Tuple[str, int, int, int]
+
+# Versteckter Ordner neben der Quelle: gleiches Dateisystem, damit Reflink
+# und Hardlink überhaupt möglich sind. Darin je Prozess ein Unterordner
+# <pid>, damit Reste abgestürzter Sitzungen erkannt und gelöscht werden.
+SNAPSHOT_DIRNAME = ".maptool_snapshots"
+
+
+def file_identity(path: str) -> Identity:
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    return abs_path, st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _pid_alive(pid: int) -> bool:
+    """Ob ein Prozess mit dieser PID (noch) läuft."""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # existiert, gehört aber einem anderen Benutzer
+    return True
+
+
+def sweep_stale_snapshots(folder: str) -> int:
+    """
+    Löscht in einem Schnappschuss-Ordner die Unterordner beendeter
+    Prozesse (Reste nach Absturz) und den Ordner selbst, wenn er leer
+    ist. Rückgabe: Anzahl gelöschter Unterordner.
+    """
+    removed = 0
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return 0
+    for name in names:
+        if name.isdigit() and not _pid_alive(int(name)):
+            shutil.rmtree(os.path.join(folder, name), ignore_errors=True)
+            removed += 1
+    try:
+        os.rmdir(folder)
+    except OSError:
+        pass
+    if removed:
+        logging.info("Verwaiste Schnappschüsse entfernt: %s (%d)", folder, removed)
+    return removed
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """
+    Copy-on-Write-Klon (Reflink) von src nach dst, falls das Dateisystem
+    das kann (Btrfs, XFS, APFS, …). Kostet keine Daten-Kopie: Blöcke werden
+    erst dupliziert, wenn eine der beiden Dateien verändert wird.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            import fcntl
+            FICLONE = 0x40049409
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+            shutil.copystat(src, dst)
+            return True
+        if sys.platform == "darwin":
+            import ctypes
+            libc = ctypes.CDLL("libc.dylib", use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                return True
+    except (OSError, AttributeError):
+        pass
+    # Halb angelegte Zieldatei entfernen
+    try:
+        os.remove(dst)
+    except OSError:
+        pass
+    return False
+
+
+class SourceRegistry:
+    """
+    Verwaltet abgelegte Quelldateien ohne sie zu kopieren.
+
+    Dateien werden an Ort und Stelle gelesen und über ihre Identität
+    (Pfad, Inode, mtime, Größe) verfolgt. Als Absicherung wird beim
+    Registrieren ein Schnappschuss angelegt, im versteckten Ordner
+    SNAPSHOT_DIRNAME/<pid> neben der Quelle (gleiches Dateisystem):
+    - Reflink: kostet nichts; das Dateisystem dupliziert erst die Blöcke,
+      die an der Quelle verändert werden. Schützt gegen jede Änderung.
+    - Hardlink: teilt die Inode mit der Quelle und schützt daher nur, wenn
+      die Quelle ersetzt wird (Speichern per Umbenennen, neue Inode).
+      Wird die Datei an Ort und Stelle überschrieben, ändert sich der
+      Schnappschuss mit – resolve() erkennt das an mtime/Größe.
+    - Sonst (FAT/exFAT, Netzlaufwerk, schreibgeschützter Ordner) wird nur
+      die Identität gemerkt, nie vorab kopiert.
+    Ohne gültigen Schnappschuss übernimmt resolve() nach einer Änderung
+    den neuen Stand (mit Warnung). Schnappschüsse werden beim Vergessen
+    und beim Beenden gelöscht; Reste abgestürzter Sitzungen räumt
+    sweep_stale_snapshots() beim nächsten Zugriff auf den Ordner ab.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str] = None) -> None:
+        self._lock = threading.Lock()
+        # Fester Schnappschuss-Ordner; None = SNAPSHOT_DIRNAME neben der Quelle
+        self._snapshot_dir = snapshot_dir
+        # Bereits auf verwaiste Reste geprüfte Schnappschuss-Ordner
+        self._swept: set = set()
+        # Pfad → (Identität, Schnappschuss-Pfad, Identität des Schnappschusses)
+        self._entries: Dict[str, Tuple[Identity, Optional[str], Optional[Identity]]] = {}
+
+    def register(self, path: str, snapshot: bool = True) -> str:
+        """Registriert path (ohne Kopie) und gibt den absoluten Pfad zurück."""
+        identity = file_identity(path)
+        abs_path = identity[0]
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry[0] == identity:
+                return abs_path
+            if entry is not None:
+                self._remove_snapshot(entry[1])
+
+        snap_path, snap_identity = (None, None)
+        if snapshot:
+            snap_path = self._make_snapshot(abs_path)
+            if snap_path:
+                snap_identity = file_identity(snap_path)
+
+        with self._lock:
+            self._entries[abs_path] = (identity, snap_path, snap_identity)
+        return abs_path
+
+    def accept(self, path: str) -> bool:
+        """
+        Übernimmt den aktuellen Stand einer registrierten Datei (z. B. nach
+        einer Meldung des Datei-Watchers). False, wenn path nicht registriert ist.
+        """
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+        if entry is None:
+            return False
+        self.register(abs_path, snapshot=entry[1] is not None)
+        return True
+
+    def resolve(self, path: Optional[str]) -> Optional[str]:
+        """
+        Pfad zum Lesen: die Quelle selbst, solange sie unverändert ist,
+        sonst der Schnappschuss des registrierten Stands. Nicht registrierte
+        Pfade werden unverändert zurückgegeben.
+        """
+        if not path:
+            return path
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+        if entry is None:
+            return path
+
+        identity, snap_path, snap_identity = entry
+        try:
+            if file_identity(abs_path) == identity:
+                return abs_path
+        except OSError:
+            pass  # Quelle verschwunden → Schnappschuss prüfen
+
+        if snap_path:
+            try:
+                if file_identity(snap_path) == snap_identity:
+                    return snap_path
+            except OSError:
+                pass
+
+        # Kein gültiger Schnappschuss mehr: neuen Stand übernehmen
+        logging.warning("Quelldatei wurde während der Sitzung geändert: %s", abs_path)
+        try:
+            return self.register(abs_path)
+        except OSError:
+            return abs_path
+
+    def forget(self, paths) -> None:
+        """Meldet paths ab und löscht ihre Schnappschüsse."""
+        drop = {os.path.abspath(p) for p in paths if p}
+        with self._lock:
+            keep = [p for p in self._entries if p not in drop]
+        self.retain(keep)
+
+    def retain(self, paths) -> None:
+        """Vergisst alle Quellen außer paths (samt ihrer Schnappschüsse)."""
+        keep = {os.path.abspath(p) for p in paths if p}
+        with self._lock:
+            dropped = [self._entries.pop(p) for p in list(self._entries) if p not in keep]
+        for _, snap_path, _ in dropped:
+            self._remove_snapshot(snap_path)
+
+    def clear(self) -> None:
+        """Vergisst alle Quellen und löscht die Schnappschüsse."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        for _, snap_path, _ in entries.values():
+            self._remove_snapshot(snap_path)
+
+    # ------------------------------------------------------------
+    # Schnappschüsse
+    # ------------------------------------------------------------
+    def _snapshot_folder(self, abs_path: str) -> Optional[str]:
+        """Prozess-Ordner für den Schnappschuss von abs_path; None, wenn nicht anlegbar."""
+        root = self._snapshot_dir or os.path.join(os.path.dirname(abs_path), SNAPSHOT_DIRNAME)
+        if root not in self._swept:
+            self._swept.add(root)
+            sweep_stale_snapshots(root)
+        folder = os.path.join(root, str(os.getpid()))
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError:
+            return None  # Quellordner schreibgeschützt
+        return folder
+
+    def _make_snapshot(self, abs_path: str) -> Optional[str]:
+        """Reflink, sonst Hardlink; None (nur Identität), wenn beides nicht geht."""
+        try:
+            folder = self._snapshot_folder(abs_path)
+            if folder is None:
+                return None
+            base, ext = os.path.splitext(os.path.basename(abs_path))
+            dst = os.path.join(folder, f"{base}{ext}")
+            idx = 1
+            while os.path.exists(dst):
+                dst = os.path.join(folder, f"{base}_{idx}{ext}")
+                idx += 1
+        except OSError:
+            return None
+
+        if _reflink(abs_path, dst):
+            return dst
+        try:
+            os.link(abs_path, dst)
+            logging.debug("Hardlink-Schnappschuss für %s (schützt nur gegen Ersetzen)", abs_path)
+            return dst
+        except OSError:
+            pass
+        # Keine Vorab-Kopie: Änderungen werden erkannt und übernommen
+        logging.debug("Kein Reflink/Hardlink möglich für %s – nur Identität gemerkt", abs_path)
+        self._remove_snapshot(dst)
+        return None
+
+    @staticmethod
+    def _remove_snapshot(snap_path: Optional[str]) -> None:
+        if not snap_path:
+            return
+        try:
+            os.remove(snap_path)
+        except OSError:
+            pass
+        # Leere Prozess- und Schnappschuss-Ordner wieder entfernen
+        folder = os.path.dirname(snap_path)
+        for path in (folder, os.path.dirname(folder)):
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+
+
+# Gemeinsame Instanz für den ganzen Prozess; Schnappschüsse beim Beenden löschen
+source_registry = SourceRegistry()
+atexit.register(source_registry.clear)
@@ -0,0 +1,85 @@
+# data_processing/watcher.py
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from data_processing.cache import file_signature
+
+# Prüfintervall im Headless-Betrieb (Sekunden)
+DEFAULT_INTERVAL = 2.0
+
+
+class SourcePoller:
+    """
+    Datei-Watcher ohne Qt (Headless/Batch): prüft in einem Hintergrund-Thread
+    regelmäßig die Signatur (mtime, Größe) aller Quellen und ruft on_change
+    einmal je geänderter Datei auf. Eine Datei gilt erst als geändert, wenn
+    ihre Signatur zwei Prüfungen lang stabil ist – halb geschriebene
+    Dateien (QGIS speichert in mehreren Schritten) lösen nichts aus.
+    """
+
+    def __init__(
+        self,
+        paths: Callable[[], Iterable[str]],
+        on_change: Callable[[str], None],
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        self._paths = paths
+        self._on_change = on_change
+        self.interval = interval
+        self._known: Dict[str, Optional[tuple]] = {}
+        self._pending: Dict[str, Optional[tuple]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _signature(path: str) -> Optional[tuple]:
+        try:
+            return file_signature(path)
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._known = {p: self._signature(p) for p in self._paths()}
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="source-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logging.exception("Fehler im Datei-Watcher")
+
+    def poll(self) -> None:
+        """Ein Prüfdurchgang (auch direkt aufrufbar, z. B. in Tests oder Schleifen)."""
+        current = {p: self._signature(p) for p in self._paths()}
+        # Neue Quellen nur aufnehmen, nicht melden
+        for path, sig in current.items():
+            self._known.setdefault(path, sig)
+        for path in list(self._known):
+            if path not in current:
+                del self._known[path]
+                self._pending.pop(path, None)
+
+        for path, sig in current.items():
+            if sig == self._known[path]:
+                self._pending.pop(path, None)
+                continue
+            if sig is None or self._pending.get(path) != sig:
+                # Erst beim nächsten Durchgang melden, wenn sich nichts mehr tut
+                self._pending[path] = sig
+                continue
+            self._known[path] = sig
+            del self._pending[path]
+            self._on_change(path)
@@ -1,6 +1,6 @@
 # gui/auswahlfenster.py
 
-from typing        import Dict, Any, List
+from typing        import Dict, Any, List, Optional
 from PySide6.QtCore    import Qt
 from PySide6.QtWidgets import (
     QDialog,
@@ -24,7 +24,7 @@ class AuswahlFenster(QDialog):
     wenn per Autocomplete ein gültiger Eintrag gewählt wurde.
     """
 
-    def __init__(self, epsg_list: List[Dict[str, Any]], parent=None):
+    def __init__(self, epsg_list: List[Dict[str, Any]], parent=None, vorschlag: Optional[str] = None):
         super().__init__(parent)
         self.epsg_list       = epsg_list
         self.epsg_lookup     : Dict[str, Dict[str, Any]] = {}
@@ -32,6 +32,10 @@ class AuswahlFenster(QDialog):
         self._build_ui()
         logger.debug("EPSG-Liste geladen mit %d Einträgen", len(epsg_list))
 
+        # Vorschlag (z. B. Land der Hauptdatei laut Katalog) nur übernehmen, wenn bekannt
+        if vorschlag and vorschlag.lower() in self.epsg_lookup:
+            self.input.setText(vorschlag)
+
     def _build_ui(self):
         self.setWindowTitle("Länderauswahl mit EPSG")
         layout = QVBoxLayout(self)
@@ -22,7 +22,7 @@ class EpsgController:
 
     def select_epsg(self):
         epsg_list = self.session_config.get("epsg_list", [])
-        dlg = AuswahlFenster(epsg_list, parent=self.parent)
+        dlg = AuswahlFenster(epsg_list, parent=self.parent, vorschlag=self._main_country())
         if dlg.exec() != QDialog.Accepted or not dlg.selected_entry:
             return
 
@@ -36,4 +36,15 @@ class EpsgController:
 
         # Kein sofortiger Refresh mehr – nur als 'dirty' markieren
         if self.main_ctrl and hasattr(self.main_ctrl, "mark_preview_dirty"):
-            self.main_ctrl.mark_preview_dirty()
\ No newline at end of file
+            self.main_ctrl.mark_preview_dirty()
+
+    def _main_country(self):
+        """Staat der Hauptdatei aus dem Katalog (ohne das GPKG zu öffnen)."""
+        if not self.composer.main_gpkg:
+            return None
+        from data_processing.catalog import get_catalog
+        try:
+            return get_catalog().country(self.composer.main_gpkg)
+        except Exception as e:
+            logging.debug("Katalog-Abfrage fehlgeschlagen: %s", e)
+            return None
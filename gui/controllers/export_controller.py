@@ -1,5 +1,6 @@
 # gui/controllers/export_controller.py
 
+import logging
 from pathlib import Path
 from gui.map_composer import MapComposer
 from utils.config import config_manager
@@ -26,12 +27,22 @@ class ExportController:
         if self.view.cb_svg.isChecked():
             formats.append("svg")
         self.composer.set_export_formats(formats)
+        self.composer.set_svg_compact(self.view.cb_svg_compact.isChecked())
 
         # 2) Abmessungen synchronisieren
         w = self.view.sp_w.value()
         h = self.view.sp_h.value()
         self.composer.set_dimensions(w, h)
 
+        # Zusatzgrößen (Thumbnail, Druck, …) – ungültige Angaben werden ignoriert
+        from maptool.multi_size import parse_sizes
+        try:
+            sizes = parse_sizes(self.view.le_sizes.text())
+        except ValueError as e:
+            logging.warning("Zusatzgrößen ignoriert: %s", e)
+            sizes = []
+        self.composer.set_extra_sizes(sizes)
+
         # 3) Speichern per Save-Dialog, öffnet danach den Ordner
         initial_dir = self.session_config.get("output_dir", "output")
         saved_path = self.composer.compose_and_save_dialog(
@@ -1,10 +1,13 @@
 # gui/controllers/file_controller.py
 
 import logging
-from fiona import listlayers
-from PySide6.QtCore import Qt
+from typing import Any, Dict, Optional
+
+from PySide6.QtCore import Qt, QThreadPool
 from PySide6.QtWidgets import QListWidgetItem
 
+from gui.ingest_worker import IngestTask
+
 class FileController:
     def __init__(self, composer, view, main_ctrl=None):
         """
@@ -16,6 +19,14 @@ class FileController:
         self.view = view
         self.main_ctrl = main_ctrl
 
+        # Eigener Pool für das Einlesen: ein Task zur Zeit, GUI-Thread bleibt frei
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+        self._task: Optional[IngestTask] = None
+
+        if hasattr(self.view, "btn_ingest_cancel"):
+            self.view.btn_ingest_cancel.clicked.connect(self.cancel_ingest)
+
     def handle_files_changed(self):
         mains = self.view.drop_panel.get_main_paths()
         subs  = self.view.drop_panel.get_sub_paths()
@@ -24,19 +35,48 @@ class FileController:
         if not mains:
             return
 
-        # Composer mit Dateien versorgen
-        self.composer.set_files(mains[0], subs)
+        # Laufendes Einlesen verwerfen – die neue Auswahl ersetzt es
+        self.cancel_ingest()
 
-        # Layer auslesen
-        try:
-            layer_names = listlayers(mains[0])
-        except Exception as e:
-            logging.error("Fehler beim Auslesen der Layer: %s", e)
+        task = IngestTask(mains[0], subs, snapshot=self._wants_snapshot())
+        task.signals.progress.connect(lambda pct, text, t=task: self._on_progress(t, pct, text))
+        task.signals.finished.connect(lambda result, t=task: self._on_finished(t, result))
+        task.signals.failed.connect(lambda msg, t=task: self._on_failed(t, msg))
+        task.signals.cancelled.connect(lambda t=task: self._on_cancelled(t))
+        self._task = task
+        self._show_progress(True)
+        self._pool.start(task)
+
+    def cancel_ingest(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._show_progress(False)
+
+    # ------------------------------------------------------------
+    # Rückmeldungen aus dem Hintergrund (laufen über Signale im GUI-Thread)
+    # ------------------------------------------------------------
+    def _on_progress(self, task: IngestTask, percent: int, text: str) -> None:
+        if task is self._task and hasattr(self.view, "ingest_progress"):
+            self.view.ingest_progress.setValue(percent)
+            self.view.ingest_progress.setFormat(f"{text} – %p%")
+
+    def _on_finished(self, task: IngestTask, result: Dict[str, Any]) -> None:
+        if task is not self._task:
+            # Veraltetes Ergebnis (inzwischen neue Dateien abgelegt)
             return
+        self._task = None
+        self._show_progress(False)
+        self._release_sources(result)
+
+        # Composer mit Dateien versorgen und Änderungen an ihnen überwachen
+        self.composer.set_files(result["main"], result["subs"])
+        if self.main_ctrl and hasattr(self.main_ctrl, "watch_ctrl"):
+            self.main_ctrl.watch_ctrl.sync()
 
         # UI-Layer-Liste befüllen
         self.view.lst_layers.clear()
-        for name in layer_names:
+        for name in result["layers"]:
             item = QListWidgetItem(name)
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             item.setCheckState(Qt.Unchecked)
@@ -46,6 +86,53 @@ class FileController:
         self.view.lst_hide.clear()
         self.view.lst_high.clear()
 
+        # Wahrscheinliche Layer schon im Hintergrund laden (noch nichts angehakt → ADM_1)
+        from data_processing.prefetch import prefetcher, default_layers
+        prefetcher.schedule(
+            result["main"],
+            default_layers(result["layers"]),
+            result["subs"],
+            self.composer.crs,
+            self.composer.include_cfg,
+        )
+
         # Kein sofortiger Refresh mehr – nur als 'dirty' markieren
         if self.main_ctrl and hasattr(self.main_ctrl, "mark_preview_dirty"):
-            self.main_ctrl.mark_preview_dirty()
\ No newline at end of file
+            self.main_ctrl.mark_preview_dirty()
+
+    def _on_failed(self, task: IngestTask, message: str) -> None:
+        if task is self._task:
+            self._task = None
+            self._show_progress(False)
+        logging.error("Fehler beim Auslesen der Layer: %s", message)
+
+    def _on_cancelled(self, task: IngestTask) -> None:
+        logging.info("Einlesen abgebrochen: %s", task.main)
+
+    # ------------------------------------------------------------
+    # Hilfsmethoden
+    # ------------------------------------------------------------
+    def _wants_snapshot(self) -> bool:
+        """
+        copy_to_temp der Drop-Zone: es wird ein Schnappschuss angelegt
+        (Reflink, sonst Hardlink, sonst nur Identität); gelesen wird am Ort.
+        """
+        drop_main = getattr(self.view.drop_panel, "drop_main", None)
+        return bool(getattr(drop_main, "copy_to_temp", False))
+
+    def _release_sources(self, result: Dict[str, Any]) -> None:
+        """Vergisst Quellen früherer Drops, die nicht mehr verwendet werden."""
+        from data_processing.sources import source_registry
+        in_use = [result["main"], *result["subs"]]
+        overlay = getattr(self.composer, "overlay_file", None)
+        if overlay:
+            in_use.append(overlay)
+        source_registry.retain(in_use)
+
+    def _show_progress(self, visible: bool) -> None:
+        for name in ("ingest_progress", "btn_ingest_cancel"):
+            widget = getattr(self.view, name, None)
+            if widget is not None:
+                widget.setVisible(visible)
+        if visible and hasattr(self.view, "ingest_progress"):
+            self.view.ingest_progress.setValue(0)
@@ -6,7 +6,7 @@ from typing import List, Dict
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QListWidgetItem
 
-from data_processing.layers import merge_hauptland_layers
+from data_processing.layers import merge_hauptland_layers, region_names, layer_name_column
 
 
 class LayerController:
@@ -48,7 +48,33 @@ class LayerController:
                 self.main_ctrl.mark_preview_dirty()
             return
 
-        # 2) GDF der gewählten Haupt-Layer laden
+        # Neu angehakte Layer schon vor der Vorschau im Hintergrund laden
+        from data_processing.prefetch import prefetcher
+        prefetcher.schedule(
+            self.composer.main_gpkg,
+            sel,
+            self.composer.sub_gpkgs,
+            self.composer.crs,
+            self.composer.include_cfg,
+        )
+
+        # 2) Schneller Weg: Namensindex per SQL (beim Drop im Hintergrund vorgewärmt)
+        layer = sel[0]
+        try:
+            names = region_names(self.composer.main_gpkg, layer)
+        except Exception as e:
+            logging.debug("Namensindex für '%s' nicht verfügbar: %s", layer, e)
+            names = None
+        if names is not None:
+            self._gdf_main = None
+            self._name_col = layer_name_column(self.composer.main_gpkg, layer)
+            self.view.lst_hide.set_names(names)
+            self.view.lst_high.share_names_from(self.view.lst_hide)
+            if self.main_ctrl:
+                self.main_ctrl.mark_preview_dirty()
+            return
+
+        # Sonst: GDF der gewählten Haupt-Layer laden
         try:
             gdf = merge_hauptland_layers(
                 self.composer.main_gpkg,
@@ -68,7 +94,6 @@ class LayerController:
             self._gdf_main = gdf.copy()
 
         # 3) Dynamisch ermitteln, welche 'NAME_x'-Spalte genutzt wird
-        layer = sel[0]
         lvl   = layer.split("_")[-1]
         col   = f"NAME_{lvl}"
         if col not in self._gdf_main.columns:
@@ -77,47 +102,25 @@ class LayerController:
             col = candidates[0] if candidates else None
         self._name_col = col
 
-        # 4) Einträge extrahieren und in Listen packen
+        # 4) Einträge extrahieren (eindeutig, als Array – kein Widget pro Name)
         if self._name_col:
-            raw = (
-                self._gdf_main[self._name_col]
-                .dropna()
-                .astype(str)
-                .unique()
-            )
-            unique_names = sorted(raw)
+            unique_names = self._gdf_main[self._name_col].dropna().astype(str).unique()
         else:
             logging.warning("Kein NAME_-Feld gefunden für Layer '%s'", layer)
             unique_names = []
 
-        # 5) Hide- und Highlight-Listen befüllen
-        self.view.lst_hide.clear()
-        self.view.lst_high.clear()
-        for name in unique_names:
-            # Ausblenden
-            h_item = QListWidgetItem(name)
-            h_item.setFlags(h_item.flags() | Qt.ItemIsUserCheckable)
-            h_item.setCheckState(Qt.Unchecked)
-            self.view.lst_hide.addItem(h_item)
-
-            # Hervorheben
-            x_item = QListWidgetItem(name)
-            x_item.setFlags(x_item.flags() | Qt.ItemIsUserCheckable)
-            x_item.setCheckState(Qt.Unchecked)
-            self.view.lst_high.addItem(x_item)
+        # 5) Hide- und Highlight-Listen befüllen (gemeinsamer, sortierter Namensindex)
+        self.view.lst_hide.set_names(unique_names)
+        self.view.lst_high.share_names_from(self.view.lst_hide)
 
         # 6) Nur dirty markieren
         if self.main_ctrl:
             self.main_ctrl.mark_preview_dirty()
 
-    def handle_hide_changed(self, item: QListWidgetItem) -> None:
-        """Wird aufgerufen, wenn in lst_hide eine Region ange- oder abgehakt wird."""
+    def handle_hide_changed(self, *_) -> None:
+        """Wird aufgerufen, wenn in lst_hide Regionen ange- oder abgehakt werden."""
         # 1) Ausgeblendete Regionen sammeln
-        hide_list = [
-            self.view.lst_hide.item(i).text()
-            for i in range(self.view.lst_hide.count())
-            if self.view.lst_hide.item(i).checkState() == Qt.Checked
-        ]
+        hide_list = self.view.lst_hide.checked_names()
 
         # 2) Composer informieren
         layer = (
@@ -126,49 +129,25 @@ class LayerController:
         )
         self.composer.set_hide({layer: hide_list} if layer else {})
 
-        # 3) Highlight-Liste nur befüllen, wenn gültige Spalte vorhanden
-        self.view.lst_high.clear()
-        if (
-            self._gdf_main is not None
-            and self._name_col
-            and self._name_col in self._gdf_main.columns
-        ):
-            raw = (
-                self._gdf_main[self._name_col]
-                .dropna()
-                .astype(str)
-                .unique()
-            )
-            remaining = [n for n in raw if n not in hide_list]
-            for name in sorted(remaining):
-                item = QListWidgetItem(name)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Unchecked)
-                self.view.lst_high.addItem(item)
-
-        # 4) Nur dirty markieren
-        if self.main_ctrl:
-            self.main_ctrl.mark_preview_dirty()
+        # 3) Ausgeblendete Regionen in der Highlight-Liste ausschließen.
+        # Gleicher Namensindex → die Hide-Haken sind direkt die Ausschluss-Maske;
+        # eine einzelne Änderung fügt/entfernt genau eine Zeile, Highlight-Haken bleiben.
+        self.view.lst_high.set_excluded(self.view.lst_hide.checked_mask())
 
+        # 4) Highlight ohne ausgeblendete Regionen an den Composer geben
+        self.handle_highlight_changed()
 
-    def handle_highlight_changed(self, item: QListWidgetItem) -> None:
-        """Wird aufgerufen, wenn in lst_high eine Region ange- oder abgehakt wird."""
-        hl = [
-            self.view.lst_high.item(i).text()
-            for i in range(self.view.lst_high.count())
-            if self.view.lst_high.item(i).checkState() == Qt.Checked
-        ]
+
+    def handle_highlight_changed(self, *_) -> None:
+        """Wird aufgerufen, wenn in lst_high Regionen ange- oder abgehakt werden."""
+        hl = self.view.lst_high.checked_names()
         layer = (
             self.composer.primary_layers[0]
             if self.composer.primary_layers else ""
         )
 
         # Nur setzen, wenn gültige Spalte vorhanden
-        if (
-            self._gdf_main is not None
-            and self._name_col
-            and self._name_col in self._gdf_main.columns
-        ):
+        if self._name_col:
             self.composer.set_highlight(layer, hl)
         else:
             # Overlay oder kein gültiger Name-Col → Highlight deaktivieren
@@ -181,4 +160,4 @@ class LayerController:
 
             # Nur dirty markieren
             if self.main_ctrl:
-                self.main_ctrl.mark_preview_dirty()
\ No newline at end of file
+                self.main_ctrl.mark_preview_dirty()
@@ -16,6 +16,7 @@ from .appearance_controller import AppearanceController
 from .export_controller import ExportController
 from .epsg_controller import EpsgController
 from .reset_service import ResetService
+from .watch_controller import WatchController
 
 class MainController:
     """
@@ -47,6 +48,7 @@ class MainController:
         self.appearance_ctrl = AppearanceController(self.composer, self.view, self.view, main_ctrl=self)
         self.export_ctrl = ExportController(self.composer, self.view, self.view, main_ctrl=self)
         self.epsg_ctrl = EpsgController(self.composer, self.view, self.view, main_ctrl=self)
+        self.watch_ctrl = WatchController(self.composer, self.view, main_ctrl=self)
 
     # ------------------------------------------------------------
     # Signal-Verbindungen
@@ -57,11 +59,14 @@ class MainController:
             dp.drop_main.dropChanged.connect(self._on_files_changed)
         if hasattr(dp, "drop_sub"):
             dp.drop_sub.dropChanged.connect(self._on_files_changed)
+        if hasattr(dp, "drop_overlay"):
+            # MainWindow setzt das Overlay zuerst, danach Watcher abgleichen
+            dp.drop_overlay.dropChanged.connect(self.watch_ctrl.sync)
 
     def _connect_layer_signals(self) -> None:
         self.view.lst_layers.itemChanged.connect(self.layer_ctrl.handle_primary_selection)
-        self.view.lst_hide.itemChanged.connect(self.layer_ctrl.handle_hide_changed)
-        self.view.lst_high.itemChanged.connect(self.layer_ctrl.handle_highlight_changed)
+        self.view.lst_hide.checkedChanged.connect(self.layer_ctrl.handle_hide_changed)
+        self.view.lst_high.checkedChanged.connect(self.layer_ctrl.handle_highlight_changed)
 
     def _connect_settings_signals(self) -> None:
         self.view.sp_w.valueChanged.connect(self.settings_ctrl.handle_dimensions_changed)
@@ -0,0 +1,60 @@
+# gui/controllers/watch_controller.py
+
+import logging
+import os
+from typing import Set
+
+from PySide6.QtCore import QFileSystemWatcher, QTimer
+
+# Wartezeit, bis eine Änderung übernommen wird (Editoren schreiben in mehreren Schritten)
+DEBOUNCE_MS = 500
+
+
+class WatchController:
+    """
+    Überwacht alle Quellen des Composers (Haupt-, Neben-, Overlay-Datei)
+    per QFileSystemWatcher. Ändert sich eine Datei, werden nur ihre
+    Cache-Einträge und der Basis-Frame verworfen und die Vorschau als
+    'dirty' markiert – übrige Caches bleiben erhalten.
+    """
+
+    def __init__(self, composer, view, main_ctrl=None):
+        """
+        :param composer: MapComposer-Instanz
+        :param view: MainWindow-Instanz
+        :param main_ctrl: Optionaler Verweis auf MainController
+        """
+        self.composer = composer
+        self.view = view
+        self.main_ctrl = main_ctrl
+
+        self._watcher = QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._changed: Set[str] = set()
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._apply_changes)
+
+    def sync(self, *_) -> None:
+        """Gleicht die überwachten Dateien mit den aktuellen Quellen des Composers ab."""
+        wanted = {os.path.abspath(p) for p in self.composer.sources() if os.path.exists(p)}
+        watched = set(self._watcher.files())
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(list(wanted - watched))
+
+    def _on_file_changed(self, path: str) -> None:
+        self._changed.add(path)
+        self._timer.start()
+
+    def _apply_changes(self) -> None:
+        changed, self._changed = self._changed, set()
+        invalidated = [p for p in changed if self.composer.invalidate_source(p)]
+        # Speichern per Umbenennen entfernt die Datei aus dem Watcher → neu anmelden
+        self.sync()
+        if invalidated:
+            logging.info("Quelldateien geändert: %s", ", ".join(invalidated))
+            if self.main_ctrl and hasattr(self.main_ctrl, "mark_preview_dirty"):
+                self.main_ctrl.mark_preview_dirty()
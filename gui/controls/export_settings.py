@@ -1,6 +1,6 @@
 # gui/controls/export_settings.py
 
-from PySide6.QtWidgets import QGroupBox, QHBoxLayout, QCheckBox
+from PySide6.QtWidgets import QGroupBox, QHBoxLayout, QCheckBox, QLineEdit
 
 class ExportSettingsGroup(QGroupBox):
     """
@@ -16,5 +16,23 @@ class ExportSettingsGroup(QGroupBox):
 
         self.cb_svg = QCheckBox("SVG", self)
 
+        # Kompaktes SVG: gerundete Koordinaten, zusammengefasste Pfade
+        self.cb_svg_compact = QCheckBox("kompakt", self)
+        self.cb_svg_compact.setToolTip(
+            "SVG mit gerundeten Koordinaten und zusammengefassten Pfaden (deutlich kleinere Dateien)"
+        )
+        self.cb_svg_compact.setEnabled(False)
+        self.cb_svg.toggled.connect(self.cb_svg_compact.setEnabled)
+
         layout.addWidget(self.cb_png)
-        layout.addWidget(self.cb_svg)
\ No newline at end of file
+        layout.addWidget(self.cb_svg)
+        layout.addWidget(self.cb_svg_compact)
+
+        # Zusatzgrößen, z. B. "320x200@72, 3200x1940" → map_320x200.png …
+        self.le_sizes = QLineEdit(self)
+        self.le_sizes.setPlaceholderText("Zusatzgrößen, z. B. 320x200@72, 3200x1940")
+        self.le_sizes.setToolTip(
+            "Weitere Ausgabegrößen (Breite x Höhe, optional @DPI), kommagetrennt;\n"
+            "werden parallel aus denselben Daten gerendert"
+        )
+        layout.addWidget(self.le_sizes, stretch=1)
\ No newline at end of file
@@ -1,8 +1,12 @@
 # gui/controls/layer_selection.py
 
-from PySide6.QtWidgets import QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QListWidget
+from PySide6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QLineEdit, QPushButton
+)
 from PySide6.QtCore import Qt
 
+from gui.region_list import RegionListView
+
 def toggle_item_check(item):
     if item.checkState() == Qt.Checked:
         item.setCheckState(Qt.Unchecked)
@@ -35,26 +39,40 @@ class LayerFilterGroup(QGroupBox):
         row = QHBoxLayout(self)
 
         # Ausblenden
-        col_hide = QVBoxLayout()
-        lbl_hide = QLabel("Ausblenden")
-        lbl_hide.setStyleSheet("font-weight: bold;")
-        col_hide.addWidget(lbl_hide)
-
-        self.lst_hide = QListWidget(self)
-        self.lst_hide.itemChanged.connect(on_hide_changed)
-        self.lst_hide.itemClicked.connect(toggle_item_check)
-        col_hide.addWidget(self.lst_hide)
+        self.lst_hide = RegionListView(self)
+        self.lst_hide.checkedChanged.connect(on_hide_changed)
+        col_hide = self._build_column("Ausblenden", self.lst_hide)
 
         # Hervorheben
-        col_high = QVBoxLayout()
-        lbl_high = QLabel("Hervorheben")
-        lbl_high.setStyleSheet("font-weight: bold;")
-        col_high.addWidget(lbl_high)
-
-        self.lst_high = QListWidget(self)
-        self.lst_high.itemChanged.connect(on_highlight_changed)
-        self.lst_high.itemClicked.connect(toggle_item_check)
-        col_high.addWidget(self.lst_high)
+        self.lst_high = RegionListView(self)
+        self.lst_high.checkedChanged.connect(on_highlight_changed)
+        col_high = self._build_column("Hervorheben", self.lst_high)
 
         row.addLayout(col_hide)
-        row.addLayout(col_high)
\ No newline at end of file
+        row.addLayout(col_high)
+
+    def _build_column(self, title: str, lst: RegionListView) -> QVBoxLayout:
+        """Überschrift, Suchfeld, Liste und Alle/Keine-Buttons für eine Spalte."""
+        col = QVBoxLayout()
+        lbl = QLabel(title)
+        lbl.setStyleSheet("font-weight: bold;")
+        col.addWidget(lbl)
+
+        search = QLineEdit(self)
+        search.setPlaceholderText("Suchen…")
+        search.setClearButtonEnabled(True)
+        search.textChanged.connect(lst.set_filter)
+        col.addWidget(search)
+
+        col.addWidget(lst)
+
+        # Massen-Aktionen wirken auf die aktuell gefilterten Einträge
+        buttons = QHBoxLayout()
+        btn_all = QPushButton("Alle", self)
+        btn_all.clicked.connect(lambda: lst.set_all_checked(True))
+        btn_none = QPushButton("Keine", self)
+        btn_none.clicked.connect(lambda: lst.set_all_checked(False))
+        buttons.addWidget(btn_all)
+        buttons.addWidget(btn_none)
+        col.addLayout(buttons)
+        return col
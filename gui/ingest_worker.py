@@ -0,0 +1,110 @@
+# gui/ingest_worker.py
+
+import logging
+import os
+import threading
+from typing import Any, Dict, List
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+class IngestCancelled(Exception):
+    """Der Benutzer hat das Einlesen abgebrochen."""
+
+
+class IngestSignals(QObject):
+    """Signale des IngestTask (QRunnable kann selbst keine Signale haben)."""
+    progress = Signal(int, str)      # Prozent, Statustext
+    finished = Signal(object)        # Ergebnis-Dict
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class IngestTask(QRunnable):
+    """
+    Verarbeitet abgelegte Dateien im Hintergrund:
+    1. Dateien in der Quell-Registry anmelden (am Ort; optional mit
+       Schnappschuss, siehe data_processing.sources)
+    2. Layer der Hauptdatei auslesen
+    3. Metadaten vorwärmen: einfachster Layer der Nebenländer
+    4. Regionsnamen je Layer indizieren (per SQL, ohne Geometrien)
+
+    Alle Ergebnisse der Schritte 3 und 4 landen im prozessweiten
+    Layer-Cache; die GUI bekommt nur das Ergebnis-Dict über finished.
+    """
+
+    def __init__(self, main: str, subs: List[str], snapshot: bool = False) -> None:
+        super().__init__()
+        self.main = main
+        self.subs = list(subs)
+        self.snapshot = snapshot
+        self.signals = IngestSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _check_cancel(self) -> None:
+        if self._cancel.is_set():
+            raise IngestCancelled()
+
+    def run(self) -> None:
+        try:
+            result = self._ingest()
+        except IngestCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logging.exception("Fehler beim Einlesen der Dateien")
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(result)
+
+    # ------------------------------------------------------------
+    # Schritte
+    # ------------------------------------------------------------
+    def _ingest(self) -> Dict[str, Any]:
+        # 1) Quellen am Ort registrieren (0–10 %)
+        from data_processing.sources import source_registry
+        sources = [self.main] + self.subs
+        registered = []
+        for i, src in enumerate(sources):
+            self._emit(10 * i // len(sources), f"Registriere {os.path.basename(src)}")
+            registered.append(source_registry.register(src, snapshot=self.snapshot))
+            self._check_cancel()
+        main, subs = registered[0], registered[1:]
+
+        # 2) Layer der Hauptdatei (10–70 %)
+        # Katalog: einmal indiziert (Layer, Metadaten, Namen), danach ohne GPKG-Zugriff
+        self._emit(10, f"Katalog: {os.path.basename(main)}")
+        from data_processing.catalog import get_catalog
+        layer_names = get_catalog().layers(main)
+        if layer_names is None:
+            from fiona import listlayers
+            layer_names = listlayers(main)
+        self._check_cancel()
+
+        # 3) Einfachster Layer der Nebenländer (70–80 %)
+        from utils.layer_selector import get_simplest_layer
+        for i, sub in enumerate(subs):
+            self._emit(70 + 10 * i // max(1, len(subs)), f"Metadaten: {os.path.basename(sub)}")
+            try:
+                get_simplest_layer(sub)
+            except Exception as e:
+                logging.debug("Metadaten von %s nicht lesbar: %s", sub, e)
+            self._check_cancel()
+
+        # 4) Regionsnamen je Layer der Hauptdatei (80–100 %)
+        from data_processing.layers import region_names
+        for i, layer in enumerate(layer_names):
+            self._emit(80 + 20 * i // max(1, len(layer_names)), f"Namen indizieren: {layer}")
+            try:
+                region_names(main, layer)
+            except Exception as e:
+                logging.debug("Namen von %s (%s) nicht lesbar: %s", main, layer, e)
+            self._check_cancel()
+
+        self._emit(100, "Fertig")
+        return {"main": main, "subs": subs, "layers": list(layer_names)}
+
+    def _emit(self, percent: int, text: str) -> None:
+        self.signals.progress.emit(int(percent), text)
@@ -5,7 +5,7 @@ from typing import Any, Dict
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QPlainTextEdit, QTabWidget, QLabel, QGroupBox, QFormLayout, QGridLayout,
-    QDoubleSpinBox, QCheckBox, QColorDialog, QListWidgetItem
+    QDoubleSpinBox, QCheckBox, QColorDialog, QListWidgetItem, QProgressBar
 )
 from PySide6.QtCore import Qt
 
@@ -85,6 +85,17 @@ class MainWindow(QMainWindow):
         self.drop_panel = DropPanel(copy_to_temp=True)
         left_col.addWidget(self.drop_panel, stretch=1)
 
+        # Fortschritt beim Einlesen abgelegter Dateien (läuft im Hintergrund)
+        ingest_row = QHBoxLayout()
+        self.ingest_progress = QProgressBar()
+        self.ingest_progress.setRange(0, 100)
+        self.btn_ingest_cancel = QPushButton("Abbrechen")
+        ingest_row.addWidget(self.ingest_progress, stretch=1)
+        ingest_row.addWidget(self.btn_ingest_cancel)
+        self.ingest_progress.hide()
+        self.btn_ingest_cancel.hide()
+        left_col.addLayout(ingest_row)
+
         # Karten-Vorschau
         karte_cfg = self.session_config.get("karte", {})
         w = karte_cfg.get("breite", 800)
@@ -161,8 +172,8 @@ class MainWindow(QMainWindow):
 
         # Ausblenden/Hervorheben
         self.layer_filter = LayerFilterGroup(
-            on_hide_changed=lambda _: None,
-            on_highlight_changed=lambda _: None
+            on_hide_changed=lambda: None,
+            on_highlight_changed=lambda: None
         )
         self.lst_hide = self.layer_filter.lst_hide
         self.lst_high = self.layer_filter.lst_high
@@ -227,6 +238,8 @@ class MainWindow(QMainWindow):
         self.export_settings = ExportSettingsGroup()
         self.cb_png = self.export_settings.cb_png
         self.cb_svg = self.export_settings.cb_svg
+        self.cb_svg_compact = self.export_settings.cb_svg_compact
+        self.le_sizes = self.export_settings.le_sizes
         bottom_panel.addWidget(self.export_settings)
 
         btn_row = QHBoxLayout()
@@ -372,6 +385,8 @@ class MainWindow(QMainWindow):
         # Export-Formate zurücksetzen
         self.cb_png.setChecked(False)
         self.cb_svg.setChecked(False)
+        self.cb_svg_compact.setChecked(False)
+        self.le_sizes.clear()
 
         # Overlay-UI zurücksetzen (auf Config-Defaults)
         style_cfg = self.session_config.get("overlay_style", {})
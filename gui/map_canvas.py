@@ -5,7 +5,6 @@ from typing import Optional, Any
 from PySide6.QtWidgets import QLabel, QSizePolicy
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
-from PIL.ImageQt import ImageQt
 
 
 class MapCanvas(QLabel):
@@ -115,6 +114,8 @@ class MapCanvas(QLabel):
         """
         Konvertiert ein PIL.Image in ein QPixmap und zeigt es.
         """
+        from PIL.ImageQt import ImageQt  # erst beim ersten Bild laden
+
         qt_img = ImageQt(img)
         pixmap = QPixmap.fromImage(qt_img)
         self.clear()
@@ -0,0 +1,227 @@
+# gui/region_list.py
+
+from typing import Iterable, List
+
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex
+from PySide6.QtWidgets import QListView
+
+
+class RegionListModel(QAbstractListModel):
+    """
+    Virtualisierte Liste von Regionsnamen mit Checkbox je Eintrag.
+
+    Statt ein QListWidgetItem pro Region anzulegen, hält das Model nur
+    ein NumPy-Array der Namen, ein Bool-Array für den Haken-Status und
+    die Zeilenindizes des aktuellen Filters. Die View fragt nur die
+    sichtbaren Zeilen ab; Befüllen, Filtern und Massen-Haken laufen
+    vektorisiert und lösen jeweils nur ein Reset bzw. dataChanged aus.
+
+    Zusätzlich kann ein Bool-Array "excluded" Namen ausblenden (z. B. in
+    der Highlight-Liste die ausgeblendeten Regionen). Beide Listen teilen
+    sich denselben Namensindex (share_names_from), so dass Haken und
+    Ausschlüsse als Masken über dieselben Positionen verglichen werden.
+    """
+
+    # Wird nach jeder Änderung des Haken-Status genau einmal gesendet
+    checkedChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        # numpy erst beim ersten Befüllen laden (schneller GUI-Start)
+        self._names = ()       # np.ndarray[str] – alle Namen, sortiert
+        self._lower = ()       # np.ndarray[str] – Kleinschreibung für die Suche
+        self._checked = ()     # np.ndarray[bool] – Haken je Name
+        self._excluded = ()    # np.ndarray[bool] – ausgeschlossene Namen
+        self._rows = ()        # np.ndarray[int] – sichtbare Zeilen → Index in _names
+        self._filter = ""
+
+    # ------------------------------------------------------------
+    # Qt-Model-Schnittstelle
+    # ------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return str(self._names[i])
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self._checked[i] else Qt.Unchecked
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        # Kein ItemIsUserCheckable: umgeschaltet wird per Klick auf die ganze Zeile
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # ------------------------------------------------------------
+    # Befüllen & Filtern
+    # ------------------------------------------------------------
+    def set_names(self, names: Iterable[str], checked: Iterable[str] = ()) -> None:
+        """Ersetzt alle Namen (werden sortiert); checked gibt vorab angehakte Namen an."""
+        import numpy as np
+
+        sorted_names = np.sort(np.asarray(list(names), dtype=str))
+        self._reset_index(sorted_names, np.char.lower(sorted_names), checked)
+
+    def share_names_from(self, other: "RegionListModel") -> None:
+        """Übernimmt den Namensindex eines anderen Models (ohne erneutes Sortieren)."""
+        self._reset_index(other._names, other._lower, ())
+
+    def _reset_index(self, names, lower, checked: Iterable[str]) -> None:
+        import numpy as np
+
+        self.beginResetModel()
+        self._names = names
+        self._lower = lower
+        self._checked = np.isin(names, np.asarray(list(checked), dtype=str))
+        self._excluded = np.zeros(len(names), dtype=bool)
+        self._rows = self._filtered_rows()
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._names = self._lower = self._checked = self._excluded = self._rows = ()
+        self.endResetModel()
+
+    def set_filter(self, text: str) -> None:
+        """Zeigt nur Namen, die text enthalten (ohne Groß-/Kleinschreibung)."""
+        self._filter = (text or "").strip().lower()
+        self.beginResetModel()
+        self._rows = self._filtered_rows()
+        self.endResetModel()
+
+    def _filtered_rows(self):
+        import numpy as np
+
+        if not len(self._names):
+            return ()
+        visible = ~self._excluded
+        if self._filter:
+            visible &= np.char.find(self._lower, self._filter) >= 0
+        return np.flatnonzero(visible)
+
+    def _matches_filter(self, i: int) -> bool:
+        return not self._filter or self._filter in self._lower[i]
+
+    # ------------------------------------------------------------
+    # Ausschluss (z. B. ausgeblendete Regionen in der Highlight-Liste)
+    # ------------------------------------------------------------
+    def set_excluded(self, mask) -> None:
+        """
+        Setzt die Ausschluss-Maske (gleicher Namensindex). Ändert sich nur
+        ein Eintrag, wird genau eine Zeile eingefügt bzw. entfernt; bei
+        mehreren Änderungen gibt es ein einziges Reset.
+        """
+        import numpy as np
+
+        if len(mask) != len(self._names):
+            return
+        mask = np.asarray(mask, dtype=bool)
+        changed = np.flatnonzero(mask != self._excluded)
+        if not len(changed):
+            return
+
+        if len(changed) == 1:
+            i = int(changed[0])
+            self._excluded = mask.copy()
+            if not self._matches_filter(i):
+                return
+            row = int(np.searchsorted(self._rows, i))
+            if mask[i]:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._rows = np.delete(self._rows, row)
+                self.endRemoveRows()
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows = np.insert(self._rows, row, i)
+                self.endInsertRows()
+            return
+
+        self.beginResetModel()
+        self._excluded = mask.copy()
+        self._rows = self._filtered_rows()
+        self.endResetModel()
+
+    # ------------------------------------------------------------
+    # Haken setzen & abfragen
+    # ------------------------------------------------------------
+    def toggle(self, index) -> None:
+        if not index.isValid():
+            return
+        i = self._rows[index.row()]
+        self._checked[i] = not self._checked[i]
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.checkedChanged.emit()
+
+    def set_all_checked(self, checked: bool) -> None:
+        """Hakt alle aktuell sichtbaren (gefilterten) Einträge an bzw. ab."""
+        if not len(self._rows):
+            return
+        self._checked[self._rows] = checked
+        self.dataChanged.emit(
+            self.index(0), self.index(len(self._rows) - 1), [Qt.CheckStateRole]
+        )
+        self.checkedChanged.emit()
+
+    def names(self) -> List[str]:
+        return self._names.tolist() if len(self._names) else []
+
+    def checked_mask(self):
+        """Haken als Bool-Array über den Namensindex (Kopie)."""
+        return self._checked.copy() if len(self._names) else ()
+
+    def checked_names(self) -> List[str]:
+        """Angehakte Namen ohne ausgeschlossene (Haken bleiben aber erhalten)."""
+        if not len(self._names):
+            return []
+        return self._names[self._checked & ~self._excluded].tolist()
+
+
+class RegionListView(QListView):
+    """
+    QListView für RegionListModel. Ein Klick irgendwo auf die Zeile
+    schaltet den Haken um (wie toggle_item_check bei den QListWidgets).
+    """
+
+    checkedChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.region_model = RegionListModel(self)
+        self.setModel(self.region_model)
+        # Gleich hohe Zeilen → Layout ohne Messen jeder einzelnen Zeile
+        self.setUniformItemSizes(True)
+        self.clicked.connect(self.region_model.toggle)
+        self.region_model.checkedChanged.connect(self.checkedChanged)
+
+    # Durchreichen, damit Controller die View wie eine Liste verwenden können
+    def set_names(self, names: Iterable[str], checked: Iterable[str] = ()) -> None:
+        self.region_model.set_names(names, checked)
+
+    def clear(self) -> None:
+        self.region_model.clear()
+
+    def set_filter(self, text: str) -> None:
+        self.region_model.set_filter(text)
+
+    def set_all_checked(self, checked: bool) -> None:
+        self.region_model.set_all_checked(checked)
+
+    def share_names_from(self, other: "RegionListView") -> None:
+        self.region_model.share_names_from(other.region_model)
+
+    def set_excluded(self, mask) -> None:
+        self.region_model.set_excluded(mask)
+
+    def checked_mask(self):
+        return self.region_model.checked_mask()
+
+    def names(self) -> List[str]:
+        return self.region_model.names()
+
+    def checked_names(self) -> List[str]:
+        return self.region_model.checked_names()
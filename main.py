@@ -3,6 +3,14 @@
 import sys
 import os
 
+# Startzeit-Messung so früh wie möglich (python main.py --startup-timing)
+from utils.startup_timing import startup_timer, timing_requested
+
+STARTUP_TIMING = timing_requested(sys.argv)
+if STARTUP_TIMING:
+    startup_timer.enable()
+    sys.argv = [a for a in sys.argv if a != "--startup-timing"]
+
 print("▶ Starte GUI-EntryPoint aus", __file__)
 
 # Projekt-Root ins sys.path (damit gui/ und utils/ als Packages erkannt werden)
@@ -11,15 +19,15 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 # Logging & Config
-from utils.config import config_manager  # Zugriff auf ConfigManager
+from utils.config import config_manager, setup_logging  # Zugriff auf ConfigManager
 
-# Basis-Config für Logging
+# Basis-Config für Logging (config.json wird hier zum ersten Mal gelesen)
 BASE_CONFIG = config_manager.get_base()
-from utils.logging_config import setup_logging
 setup_logging(BASE_CONFIG["logging"])  # Logging bleibt auf Basis der Original-Config
 
 # Session-Config abrufen
 SESSION_CONFIG = config_manager.get_session()
+startup_timer.mark("Config geladen")
 
 # Sicherstellen, dass output_dir existiert
 DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
@@ -34,22 +42,36 @@ if not os.path.exists(output_dir):
 os.makedirs(output_dir, exist_ok=True)
 
 # Qt-App, Composer, View & Controller koppeln
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from gui.map_composer import MapComposer
 from gui.main_window import MainWindow
 from gui.controllers.main_controller import MainController
+startup_timer.mark("GUI-Module importiert")
+
+
+def _finish_startup_timing() -> None:
+    """Läuft im ersten Event-Loop-Durchlauf, d.h. sobald das Fenster sichtbar ist."""
+    startup_timer.mark("Fenster sichtbar")
+    startup_timer.disable()
+    startup_timer.log_report()
+
 
 def main():
     app = QApplication(sys.argv)
+    startup_timer.mark("Qt-App erstellt")
 
     # Composer bekommt die Session-Config
     composer = MapComposer(SESSION_CONFIG, [])
 
     # MainWindow bekommt ebenfalls die Session-Config
     window = MainWindow(composer)
+    startup_timer.mark("Fenster erzeugt")
 
     controller = MainController(composer, window)
+    if STARTUP_TIMING:
+        QTimer.singleShot(0, _finish_startup_timing)
     sys.exit(controller.run())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
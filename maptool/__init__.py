@@ -0,0 +1,27 @@
+# maptool/__init__.py
+"""
+Qt-freier Kern von mapTool: Kartenaufbau (MapComposer, MapBuilder),
+Export (MapExporter) und Headless-Batch-Rendering.
+
+Der Import ist bewusst leicht: PySide6 wird nie geladen, geopandas und
+matplotlib erst beim ersten Rendern, config.json erst beim ersten Zugriff.
+
+Aufruf:
+    python -m maptool render jobs.yaml [--workers N] [--resume]
+"""
+
+__all__ = ["MapComposer", "MapBuilder", "MapExporter"]
+
+
+def __getattr__(name: str):
+    # Lazy-Exports, damit "import maptool" nichts Schweres nachlädt
+    if name == "MapComposer":
+        from maptool.map_composer import MapComposer
+        return MapComposer
+    if name == "MapBuilder":
+        from maptool.map_builder import MapBuilder
+        return MapBuilder
+    if name == "MapExporter":
+        from maptool.map_exporter import MapExporter
+        return MapExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,8 @@
+# maptool/__main__.py
+
+import sys
+
+from maptool.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
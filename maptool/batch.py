@@ -0,0 +1,400 @@
+# maptool/batch.py
+"""
+Batch-Rendering ohne Qt.
+
+Eine Job-Datei (YAML oder JSON) enthält entweder eine Liste von Jobs oder
+ein Dict mit gemeinsamen "defaults" und der Liste "jobs":
+
+    defaults:
+      crs: EPSG:3857
+      size: [1600, 970]
+      formats: [png, svg]
+      output_dir: output/batch
+    jobs:
+      - name: oesterreich
+        main: daten/gadm41_AUT.gpkg
+        subs: [daten/gadm41_DEU.gpkg, daten/gadm41_CHE.gpkg]
+        overlay: daten/seen.shp
+        layers: [ADM_ADM_1]
+        hide: {ADM_ADM_1: [Wien]}
+        include: {ADM_ADM_1: [Tirol, Salzburg]}   # optional: nur diese Regionen laden
+        highlight: {layer: ADM_ADM_1, names: [Tirol]}
+        styles: {hauptland: {fill: "#538B32"}}
+        dpi: 300
+        raster: {png_palette: true, png_compress_level: 9}   # Kodier-Optionen (export.raster)
+        xyz: {min_zoom: 5, max_zoom: 10}                     # für formats [xyz] / [mbtiles]
+        sizes: [320x200@72, [3200, 1940, 300]]              # optional: zusätzlich <name>_<w>x<h>.<format>
+        themes:                                              # optional: je Theme <name>_<theme>.<format>
+          grau: {styles: {hauptland: {fill: "#DDDDDD"}}, background: {transparent: false}}
+          dark: {styles: {hauptland: {fill: "#30343F"}}, background: {color: "#101218"}}
+
+Relative Pfade beziehen sich auf das Verzeichnis der Job-Datei. Ohne
+"output" landet ein Job unter <output_dir>/<name>.<format>.
+"""
+
+import copy
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("maptool.batch")
+
+# Standardwerte je Job (werden von "defaults" und dem Job selbst überschrieben)
+JOB_DEFAULTS: Dict[str, Any] = {
+    "subs": [],
+    "overlay": None,
+    "layers": [],
+    "crs": None,
+    "hide": {},
+    "include": {},
+    "highlight": {},
+    "styles": {},
+    "size": None,
+    "dpi": None,
+    "formats": ["png"],
+    "raster": {},
+    "xyz": {},
+    "themes": {},
+    "sizes": [],
+    "background": {},
+    "scalebar": {},
+    "output_dir": "output",
+}
+
+
+# ------------------------------------------------------------
+# Job-Datei einlesen
+# ------------------------------------------------------------
+def _deep_merge(base: Dict[str, Any], override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mischt override rekursiv in eine Kopie von base."""
+    result = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = _deep_merge(result[key], value)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def load_job_file(path) -> List[Dict[str, Any]]:
+    """
+    Liest eine Job-Datei (YAML oder JSON) und gibt die normalisierten Jobs zurück.
+    """
+    job_path = Path(path)
+    text = job_path.read_text(encoding="utf-8")
+    if job_path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise RuntimeError("Für YAML-Job-Dateien wird PyYAML benötigt (pip install pyyaml).") from e
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if isinstance(data, list):
+        defaults, raw_jobs = {}, data
+    elif isinstance(data, dict):
+        defaults, raw_jobs = data.get("defaults") or {}, data.get("jobs") or []
+    else:
+        raise ValueError(f"Ungültige Job-Datei: {job_path}")
+
+    base_dir = job_path.resolve().parent
+    jobs = [normalize_job(raw, defaults, base_dir, i) for i, raw in enumerate(raw_jobs)]
+
+    # Doppelte Ausgabeziele würden sich gegenseitig überschreiben (und --resume verwirren)
+    seen: Dict[str, str] = {}
+    for job in jobs:
+        if job["output"] in seen:
+            raise ValueError(
+                f"Jobs '{seen[job['output']]}' und '{job['name']}' schreiben nach {job['output']} "
+                "– bitte 'name' oder 'output' setzen."
+            )
+        seen[job["output"]] = job["name"]
+    return jobs
+
+
+def normalize_job(
+    raw: Dict[str, Any],
+    defaults: Dict[str, Any],
+    base_dir: Path,
+    index: int
+) -> Dict[str, Any]:
+    """Ergänzt Defaults, löst Pfade auf und prüft Pflichtfelder eines Jobs."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"Job {index}: Eintrag muss ein Dict sein")
+
+    job = _deep_merge(_deep_merge(JOB_DEFAULTS, defaults), raw)
+    if not job.get("main"):
+        raise ValueError(f"Job {index}: 'main' fehlt")
+
+    def resolve(p: Optional[str]) -> Optional[str]:
+        if not p:
+            return None
+        p = Path(os.path.expanduser(str(p)))
+        return str(p if p.is_absolute() else (base_dir / p).resolve())
+
+    job["index"] = index
+    job["main"] = resolve(job["main"])
+    job["subs"] = [resolve(s) for s in _as_list(job.get("subs")) if s]
+    job["overlay"] = resolve(job.get("overlay"))
+    job["layers"] = [str(l) for l in _as_list(job.get("layers"))]
+    job["formats"] = [str(f).lower().lstrip(".") for f in _as_list(job.get("formats"))] or ["png"]
+    job["name"] = str(job.get("name") or Path(job["main"]).stem)
+
+    if job.get("size") is not None:
+        size = _as_list(job["size"])
+        if len(size) != 2:
+            raise ValueError(f"Job '{job['name']}': 'size' muss [breite, hoehe] sein")
+        job["size"] = [int(size[0]), int(size[1])]
+
+    if job.get("sizes"):
+        from maptool.multi_size import parse_size
+        try:
+            # Normalisiert als [w, h] bzw. [w, h, dpi]
+            job["sizes"] = [[v for v in parse_size(s) if v is not None] for s in _as_list(job["sizes"])]
+        except ValueError as e:
+            raise ValueError(f"Job '{job['name']}': {e}") from None
+
+    output = job.get("output") or str(Path(job["output_dir"]) / job["name"])
+    job["output"] = resolve(output)
+    return job
+
+
+def expected_outputs(job: Dict[str, Any]) -> List[Path]:
+    """Alle Dateien, die ein Job schreibt (eine pro Format, mit Themes eine pro Theme und Format)."""
+    sized = [path for targets in expected_size_outputs(job).values() for _, path in targets]
+    return [path for _, _, path in _output_targets(job)] + sized
+
+
+def expected_size_outputs(job: Dict[str, Any]) -> Dict[tuple, List[tuple]]:
+    """Zusatzgrößen eines Jobs: (w, h, dpi) → [(Format, Pfad), …]."""
+    from maptool.multi_size import parse_size, sized_path
+
+    base = Path(job["output"])
+    formats = [f for f in job["formats"] if f not in ("xyz", "mbtiles")]
+    sizes = [parse_size(s) for s in job.get("sizes") or []]
+    return {
+        size: [(fmt, sized_path(base.parent / f"{base.name}.{fmt}", size)) for fmt in formats]
+        for size in sizes
+    }
+
+
+def _output_targets(job: Dict[str, Any]) -> List[tuple]:
+    """(Theme oder None, Format, Pfad) je Ausgabedatei eines Jobs (ohne Zusatzgrößen)."""
+    base = Path(job["output"])
+    if job.get("themes"):
+        return [
+            (theme, fmt, base.parent / f"{base.name}_{theme}.{fmt}")
+            for theme in job["themes"]
+            for fmt in job["formats"]
+        ]
+    return [(None, fmt, base.parent / f"{base.name}.{fmt}") for fmt in job["formats"]]
+
+
+# ------------------------------------------------------------
+# Einzelnen Job rendern
+# ------------------------------------------------------------
+def build_session_config(base_config: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Erzeugt die Session-Config eines Jobs: Kopie der Basis-Config plus
+    die Job-Overrides in genau den Schlüsseln, die MapComposer liest.
+    """
+    cfg = copy.deepcopy(base_config)
+    cfg["styles"] = _deep_merge(cfg.get("styles", {}), job.get("styles"))
+    cfg["background"] = _deep_merge(cfg.get("background", {}), job.get("background"))
+    cfg["scalebar"] = _deep_merge(cfg.get("scalebar", {}), job.get("scalebar"))
+
+    if job.get("crs"):
+        cfg["crs"] = job["crs"]
+    if job.get("size"):
+        karte = cfg.setdefault("karte", {})
+        karte["breite"], karte["hoehe"] = job["size"]
+
+    export_cfg = cfg.setdefault("export", {})
+    export_cfg["formats"] = list(job["formats"])
+    if job.get("dpi"):
+        export_cfg["dpi"] = job["dpi"]
+    export_cfg["raster"] = _deep_merge(export_cfg.get("raster", {}), job.get("raster"))
+    export_cfg["xyz"] = _deep_merge(export_cfg.get("xyz", {}), job.get("xyz"))
+
+    hide = {k: list(v) for k, v in (job.get("hide") or {}).items() if v}
+    cfg["hide_cfg"] = {"aktiv": bool(hide), "bereiche": hide}
+
+    include = {k: list(v) for k, v in (job.get("include") or {}).items() if v}
+    cfg["include_cfg"] = {"aktiv": bool(include), "bereiche": include}
+
+    hl = job.get("highlight") or {}
+    names = list(hl.get("names") or [])
+    hl_layer = hl.get("layer") or (job["layers"][0] if job["layers"] else None)
+    cfg["highlight_cfg"] = {"aktiv": bool(names), "layer": hl_layer, "namen": names}
+    return cfg
+
+
+def job_composer(job: Dict[str, Any], base_config: Dict[str, Any]):
+    """MapComposer mit Session-Config, Dateien und Layern eines Jobs."""
+    from maptool.map_composer import MapComposer
+
+    cfg = build_session_config(base_config, job)
+    composer = MapComposer(cfg, job["layers"], crs=job.get("crs"))
+    # Ein Render pro Job → Hide direkt beim Lesen per SQL anwenden
+    composer.pushdown_hide = True
+    composer.set_files(job["main"], job["subs"])
+    composer.set_overlay(job["overlay"])
+    return composer
+
+
+def render_job(job: Dict[str, Any], base_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Rendert einen Job und schreibt alle Formate. Gibt ein Ergebnis-Dict zurück."""
+    start = time.perf_counter()
+    composer = job_composer(job, base_config)
+
+    targets = _output_targets(job)
+    outputs = [path for _, _, path in targets]
+    if job.get("themes"):
+        # Einmal laden und aufbauen, je Theme nur umfärben und schreiben
+        by_theme: Dict[str, list] = {}
+        for theme, fmt, path in targets:
+            by_theme.setdefault(theme, []).append((fmt, path))
+        per_theme = composer.render_themes(job["themes"], by_theme)
+        timings = {f"{theme}:{fmt}": sec for theme, t in per_theme.items() for fmt, sec in t.items()}
+    else:
+        timings = composer.save_outputs([(fmt, path) for _, fmt, path in targets])
+
+    # Zusatzgrößen: Daten und Ausschnitt wiederverwenden, parallel rendern
+    sized = expected_size_outputs(job)
+    if sized:
+        for size, t in composer.render_sizes(sized).items():
+            timings.update({f"{size[0]}x{size[1]}:{fmt}": sec for fmt, sec in t.items()})
+        outputs += [path for size_targets in sized.values() for _, path in size_targets]
+
+    return {
+        "index": job["index"],
+        "name": job["name"],
+        "status": "ok",
+        "outputs": [str(p) for p in outputs],
+        "seconds": time.perf_counter() - start,
+        "format_seconds": timings,
+    }
+
+
+# ------------------------------------------------------------
+# Ausführung (Prozess-Pool)
+# ------------------------------------------------------------
+def _init_worker() -> None:
+    """Initialisiert einen Worker-Prozess: reines Agg-Backend, kein GUI-Toolkit."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _run_group(jobs: List[Dict[str, Any]], base_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rendert eine Gruppe von Jobs nacheinander im selben Prozess.
+    Jobs einer Gruppe nutzen dieselben Quelldateien und treffen daher
+    den prozessweiten Layer-Cache.
+    """
+    results = []
+    for job in jobs:
+        try:
+            results.append(render_job(job, base_config))
+        except Exception as e:
+            logger.exception("Job '%s' fehlgeschlagen", job["name"])
+            results.append({
+                "index": job["index"],
+                "name": job["name"],
+                "status": "error",
+                "error": f"{type(e).__name__}: {e}",
+                "outputs": [],
+                "seconds": 0.0,
+            })
+
+    from data_processing.cache import layer_cache
+    from data_processing.proj_cache import proj_cache
+    logger.info(
+        "Cache-Trefferquote (pid %d): Layer %.0f%%, pyproj %.0f%%",
+        os.getpid(),
+        layer_cache.stats()["hit_rate"] * 100,
+        proj_cache.stats()["hit_rate"] * 100,
+    )
+    return results
+
+
+def group_jobs(jobs: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """
+    Fasst Jobs mit denselben Quelldateien (Haupt-, Neben-, Overlay-Datei)
+    zu Gruppen zusammen. Gibt es weniger Gruppen als Worker, werden große
+    Gruppen geteilt, damit alle Kerne ausgelastet sind.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for job in jobs:
+        key = (job["main"], tuple(job["subs"]), job["overlay"])
+        groups.setdefault(key, []).append(job)
+
+    chunks = list(groups.values())
+    if workers > 1 and 0 < len(chunks) < workers:
+        parts = math.ceil(workers / len(chunks))
+        split = []
+        for group in chunks:
+            size = max(1, math.ceil(len(group) / parts))
+            split.extend(group[i:i + size] for i in range(0, len(group), size))
+        chunks = split
+    return chunks
+
+
+def run_jobs(
+    jobs: List[Dict[str, Any]],
+    base_config: Dict[str, Any],
+    workers: Optional[int] = None,
+    resume: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Führt alle Jobs aus – bei mehreren Gruppen in einem Prozess-Pool.
+    Mit resume=True werden Jobs übersprungen, deren Ausgabedateien
+    bereits vollständig existieren.
+    """
+    results: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    for job in jobs:
+        outputs = expected_outputs(job)
+        if resume and all(p.exists() for p in outputs):
+            results.append({
+                "index": job["index"],
+                "name": job["name"],
+                "status": "skipped",
+                "outputs": [str(p) for p in outputs],
+                "seconds": 0.0,
+            })
+        else:
+            pending.append(job)
+
+    if pending:
+        workers = max(1, workers or os.cpu_count() or 1)
+        groups = group_jobs(pending, workers)
+
+        if workers == 1 or len(groups) == 1:
+            _init_worker()
+            for group in groups:
+                results.extend(_run_group(group, base_config))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(groups)),
+                initializer=_init_worker
+            ) as pool:
+                futures = [pool.submit(_run_group, group, base_config) for group in groups]
+                for fut in as_completed(futures):
+                    results.extend(fut.result())
+
+    results.sort(key=lambda r: r["index"])
+    return results
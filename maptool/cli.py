@@ -0,0 +1,201 @@
+# maptool/cli.py
+
+import argparse
+import logging
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m maptool",
+        description="mapTool ohne GUI: Karten aus Job-Dateien rendern."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser("render", help="Alle Jobs einer YAML/JSON-Datei rendern")
+    render.add_argument("jobfile", help="Pfad zur Job-Datei (.yaml, .yml oder .json)")
+    render.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Anzahl Worker-Prozesse (Default: Anzahl CPU-Kerne)"
+    )
+    render.add_argument(
+        "--resume", action="store_true",
+        help="Jobs überspringen, deren Ausgabedateien bereits existieren"
+    )
+    render.add_argument(
+        "--config", default=None,
+        help="Alternative config.json (Default: config/config.json)"
+    )
+    render.add_argument(
+        "--watch", action="store_true",
+        help="Danach Quelldateien überwachen und betroffene Jobs bei Änderungen neu rendern"
+    )
+
+    report = sub.add_parser(
+        "encoding-report",
+        help="Größe und Dauer verschiedener PNG/WebP-Kodierungen für einen Job messen"
+    )
+    report.add_argument("jobfile", help="Pfad zur Job-Datei (.yaml, .yml oder .json)")
+    report.add_argument("--job", default=None, help="Name des Jobs (Default: erster Job)")
+    report.add_argument(
+        "--config", default=None,
+        help="Alternative config.json (Default: config/config.json)"
+    )
+
+    series = sub.add_parser(
+        "series",
+        help="Je Region eines Layers eine Karte mit dieser Region hervorgehoben"
+    )
+    series.add_argument("jobfile", help="Pfad zur Job-Datei (.yaml, .yml oder .json)")
+    series.add_argument("--job", default=None, help="Name des Jobs (Default: erster Job)")
+    series.add_argument("--layer", default=None, help="Layer der Regionen (Default: erster Layer des Jobs)")
+    series.add_argument("--names", nargs="*", default=None, help="Nur diese Regionen (Default: alle)")
+    series.add_argument("--out", default=None, help="Zielordner (Default: Ausgabe des Jobs)")
+    series.add_argument(
+        "--config", default=None,
+        help="Alternative config.json (Default: config/config.json)"
+    )
+    return parser
+
+
+def _select_job(jobs, name):
+    job = next((j for j in jobs if name in (None, j["name"])), None)
+    if job is None:
+        print(f"✖ Job '{name}' nicht gefunden")
+    return job
+
+
+def _cmd_series(args: argparse.Namespace) -> int:
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from utils.config import load_config
+    from maptool.batch import job_composer, load_job_file
+
+    base_config = load_config(args.config)
+    job = _select_job(load_job_file(args.jobfile), args.job)
+    if job is None:
+        return 1
+    layer = args.layer or (job["layers"][0] if job["layers"] else None)
+    if not layer:
+        print("✖ Kein Layer angegeben")
+        return 1
+
+    composer = job_composer(job, base_config)
+    paths = composer.render_highlight_series(
+        layer, args.out or job["output"], names=args.names, formats=job["formats"]
+    )
+    print(f"✔ {len(paths)} Datei(en) in {args.out or job['output']}")
+    return 0
+
+
+def _cmd_encoding_report(args: argparse.Namespace) -> int:
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from utils.config import load_config
+    from maptool.batch import job_composer, load_job_file
+    from maptool.map_exporter import MapExporter
+
+    base_config = load_config(args.config)
+    jobs = load_job_file(args.jobfile)
+    job = _select_job(jobs, args.job)
+    if job is None:
+        return 1
+
+    composer = job_composer(job, base_config)
+    fig = composer.compose()
+    rows = MapExporter.encoding_report(fig, composer.background_cfg["transparent"])
+
+    print(f"▶ {job['name']}: {composer.width_px}×{composer.height_px} px")
+    for r in sorted(rows, key=lambda r: r["bytes"]):
+        print(f"  {r['option']:<18} {r['bytes'] / 1024:>10.1f} KB  {r['seconds']:.3f}s")
+    return 0
+
+
+def _cmd_render(args: argparse.Namespace) -> int:
+    import matplotlib
+    matplotlib.use("Agg")
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    )
+
+    from utils.config import load_config
+    from maptool.batch import load_job_file, run_jobs
+
+    base_config = load_config(args.config)
+    jobs = load_job_file(args.jobfile)
+    print(f"▶ {len(jobs)} Job(s) aus {args.jobfile}")
+
+    results = run_jobs(jobs, base_config, workers=args.workers, resume=args.resume)
+
+    _print_results(results)
+    failed = sum(1 for r in results if r["status"] == "error")
+    done = sum(1 for r in results if r["status"] == "ok")
+    skipped = sum(1 for r in results if r["status"] == "skipped")
+    print(f"Fertig: {done} gerendert, {skipped} übersprungen, {failed} fehlgeschlagen")
+
+    if args.watch:
+        return _watch_jobs(jobs, base_config)
+    return 1 if failed else 0
+
+
+def _print_results(results) -> None:
+    for r in results:
+        if r["status"] == "ok":
+            print(f"✔ {r['name']} ({r['seconds']:.1f}s): {', '.join(r['outputs'])}")
+            if r.get("format_seconds"):
+                print("    " + ", ".join(f"{k} {v:.2f}s" for k, v in r["format_seconds"].items()))
+        elif r["status"] == "skipped":
+            print(f"↷ {r['name']} übersprungen (Ausgabe vorhanden)")
+        else:
+            print(f"✘ {r['name']}: {r['error']}")
+
+
+def _watch_jobs(jobs, base_config) -> int:
+    """
+    Headless-Watcher: pollt alle Quelldateien der Jobs und rendert bei
+    einer Änderung nur die betroffenen Jobs neu – im selben Prozess, so
+    dass die Cache-Einträge unveränderter Dateien erhalten bleiben.
+    """
+    import os
+    import queue
+    from data_processing.cache import layer_cache
+    from data_processing.watcher import SourcePoller
+    from maptool.batch import run_jobs
+
+    by_source = {}
+    for job in jobs:
+        for path in [job["main"], *job["subs"], job["overlay"]]:
+            if path:
+                by_source.setdefault(os.path.abspath(path), []).append(job)
+
+    changes: "queue.Queue[str]" = queue.Queue()
+    poller = SourcePoller(lambda: list(by_source), changes.put)
+    poller.start()
+    print(f"👁 Überwache {len(by_source)} Quelldatei(en) – Abbruch mit Strg+C")
+    try:
+        while True:
+            path = changes.get()
+            dropped = layer_cache.invalidate_path(path)
+            affected = by_source.get(path, [])
+            print(f"↻ {os.path.basename(path)} geändert ({dropped} Cache-Einträge verworfen), "
+                  f"{len(affected)} Job(s) neu")
+            _print_results(run_jobs(affected, base_config, workers=1))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        poller.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "render":
+        return _cmd_render(args)
+    if args.command == "series":
+        return _cmd_series(args)
+    if args.command == "encoding-report":
+        return _cmd_encoding_report(args)
+    return 2
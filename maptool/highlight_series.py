@@ -0,0 +1,153 @@
+# maptool/highlight_series.py
+
+import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from maptool.map_composer import MapComposer
+
+# zorder der Highlight-Ebene in MapBuilder._plot_highlights: darunter liegt
+# die statische Basis, darüber Overlay, Grenzen und Scalebar
+HIGHLIGHT_ZORDER = 3
+
+logger = logging.getLogger(__name__)
+
+
+def safe_filename(name: str) -> str:
+    """Regionsname als Dateiname (ohne Pfad- und Sonderzeichen)."""
+    return re.sub(r"[^\w\-]+", "_", str(name)).strip("_") or "region"
+
+
+@contextmanager
+def _only_visible(ax, keep):
+    """Blendet vorübergehend alle Achsen-Artists außer keep(artist) aus."""
+    artists = [a for a in ax.get_children() if a is not ax.patch]
+    saved = [a.get_visible() for a in artists]
+    for a, visible in zip(artists, saved):
+        a.set_visible(visible and keep(a))
+    try:
+        yield
+    finally:
+        for a, visible in zip(artists, saved):
+            a.set_visible(visible)
+
+
+def render_highlight_series(
+    composer: "MapComposer",
+    layer: str,
+    out_dir,
+    names: Optional[List[str]] = None,
+    formats: Optional[List[str]] = None,
+) -> List[Path]:
+    """
+    Eine Karte je Region von layer, in der genau diese Region hervorgehoben
+    ist: <out_dir>/<Region>.<fmt>. Ohne names alle Regionen des Layers.
+
+    Für Rasterformate wird die Karte nur einmal aufgebaut und in drei
+    Ebenen zerlegt – statische Basis (Nebenländer, Hauptland), die
+    Highlight-Ebene und alles darüber (Overlay, Grenzen, Scalebar). Je
+    Region wird nur die Highlight-Ebene neu gezeichnet und mit den beiden
+    festen Ebenen verrechnet; das Kodieren läuft in Threads parallel zum
+    nächsten Zeichnen. Vektorformate werden je Region vollständig gerendert.
+    """
+    import numpy as np
+    from PIL import Image
+    from data_processing.layers import region_names
+    from maptool.map_builder import MapBuilder, pixel_to_pt
+    from maptool.map_exporter import MapExporter, RASTER_FORMATS, raster_options
+
+    start = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    formats = list(formats or composer.export_formats)
+    if names is None:
+        names = region_names(composer.main_gpkg, layer) or []
+    raster = [f for f in formats if f.lower() in RASTER_FORMATS]
+    vector = [f for f in formats if f.lower() not in RASTER_FORMATS]
+    transparent = composer.background_cfg["transparent"]
+    saved_hl = composer.hl_cfg
+    written: List[Path] = []
+
+    if raster and names:
+        # 1) Karte ohne Highlight einmal aufbauen
+        composer.hl_cfg = {"aktiv": False, "layer": layer, "namen": []}
+        try:
+            fig = composer.compose()
+        finally:
+            composer.hl_cfg = saved_hl
+        ax = fig.axes[0]
+        bbox = MapExporter.prepare_layout(fig)
+
+        # 2) Feste Ebenen unter und über dem Highlight je einmal zeichnen
+        with _only_visible(ax, lambda a: a.get_zorder() <= HIGHLIGHT_ZORDER):
+            under = Image.fromarray(MapExporter.draw_rgba(fig, transparent, bbox), "RGBA")
+        with _only_visible(ax, lambda a: a.get_zorder() > HIGHLIGHT_ZORDER):
+            over = Image.fromarray(MapExporter.draw_rgba(fig, True, bbox), "RGBA")
+
+        builder = MapBuilder(
+            cfg=composer.session_config,
+            hl_cfg={"aktiv": True, "layer": layer, "namen": []},
+        )
+        lw = pixel_to_pt(builder.styles.get("highlight", {}).get("width", 1), fig.dpi)
+        options = raster_options(composer.session_config)
+
+        # 3) Je Region nur die Highlight-Ebene zeichnen und verrechnen
+        # Höchstens ~2 Bilder je Thread in der Warteschlange – jedes hält ein
+        # volles RGBA-Frame im Speicher
+        workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encode") as pool:
+            pending = deque()
+            for name in names:
+                masked = composer.masked_gdf({"aktiv": True, "layer": layer, "namen": [name]})
+                rows = masked[masked["highlight"] & masked["__is_main"]]
+                if rows.empty:
+                    logger.warning("Region '%s' nicht in Layer '%s' – übersprungen", name, layer)
+                    continue
+
+                before = set(ax.get_children())
+                builder._plot_highlights(ax, rows, lw)
+                added = [a for a in ax.get_children() if a not in before]
+                with _only_visible(ax, lambda a: a in added):
+                    layer_img = Image.fromarray(MapExporter.draw_rgba(fig, True, bbox), "RGBA")
+                for a in added:
+                    a.remove()
+
+                image = Image.alpha_composite(Image.alpha_composite(under, layer_img), over)
+                rgba = np.asarray(image)
+                for fmt in raster:
+                    path = out_dir / f"{safe_filename(name)}.{fmt}"
+                    pending.append(pool.submit(
+                        MapExporter.encode_raster, rgba, path, fmt, fig.dpi, options
+                    ))
+                    written.append(path)
+                while len(pending) > 2 * workers:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+
+    # Vektorformate: kein Compositing möglich → je Region komplett.
+    # Nur composer.hl_cfg setzen (nicht set_highlight) – die Session-Config
+    # behält die Hervorhebung des Benutzers.
+    if vector:
+        try:
+            for name in names:
+                composer.hl_cfg = {"aktiv": True, "layer": layer, "namen": [name]}
+                composer.save_outputs(
+                    [(fmt, out_dir / f"{safe_filename(name)}.{fmt}") for fmt in vector]
+                )
+                written.extend(out_dir / f"{safe_filename(name)}.{fmt}" for fmt in vector)
+        finally:
+            composer.hl_cfg = saved_hl
+
+    logger.info(
+        "Highlight-Serie %s: %d Regionen, %d Dateien, %.1fs",
+        layer, len(names), len(written), time.perf_counter() - start,
+    )
+    return written
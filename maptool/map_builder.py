@@ -1,21 +1,27 @@
-# gui/map_builder.py
+# maptool/map_builder.py
 
-import matplotlib.pyplot as plt
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from data_processing.layers import merge_hauptland_layers
-from data_processing.crs import compute_bbox
+from data_processing.crs import compute_bbox, DEFAULT_PADDING
 from utils.scalebar import add_scalebar
 from utils.constants import BOUNDARY_TO_COLUMN
 from utils.config import config_manager
 
-import pandas as pd
+# matplotlib/pandas erst beim Zeichnen laden
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Ab so vielen Stützpunkten – gezählt nach Vereinfachung auf ein Ausgabepixel –
+# wird eine Flächen-Ebene in PDF/SVG als Bild eingebettet
+# (styles.<ebene>.rasterize = "auto"; überschreibbar per export.rasterize_vertices)
+RASTERIZE_VERTICES = 200_000
+
 
 def pixel_to_pt(px: float, dpi: float) -> float:
     """Konvertiert Pixel in Points (für Matplotlib-Linienbreiten)."""
     return px * 72.0 / dpi
 
-from utils.config import config_manager
-
 class MapBuilder:
     def __init__(
         self,
@@ -28,7 +34,7 @@ class MapBuilder:
         gdf=None,
     ):
         # Wenn keine Config übergeben wurde, Session-Config verwenden
-        self.cfg = config_manager.get_session()
+        self.cfg = cfg if cfg is not None else config_manager.get_session()
         self.styles = self.cfg.get("styles", {})
         self.main_gpkg = main_gpkg
         self.layers = layers or []
@@ -48,11 +54,26 @@ class MapBuilder:
 
         # Scalebar-Defaults sichern
         self._scalebar_defaults = self.cfg.get("scalebar", {}).copy()
+
+        # Optional: fester Kartenausschnitt (xmin, xmax, ymin, ymax) statt compute_bbox
+        self.extent: Optional[tuple] = None
+        # Optional: Fenster (x0, y0, Breite, Höhe) in Pixeln der Gesamtkarte, y0 von oben.
+        # Die Figure zeigt dann nur diesen Ausschnitt der width_px × height_px großen
+        # Karte (gekachelter Export); Achse, Scalebar & Co. liegen wie in der Gesamtkarte.
+        self.view_window: Optional[tuple] = None
+        # Breite eines Ausgabepixels in CRS-Einheiten (setzt build_figure, für _rasterize)
+        self._pixel_size = 0.0
+
+        # Gezeichnete Artists je Ebene ("nebenland", "hauptland", "highlight",
+        # "overlay", "boundary:ADM_1", "scalebar") – zum Umstylen ohne Neuaufbau
+        self.artists: Dict[str, list] = {}
     # ------------------------------------------------------------
     # Hauptmethode
     # ------------------------------------------------------------  
-    def build_figure(self, fig=None, preview_mode: bool = False, preview_scale: float = 0.5) -> plt.Figure:
+    def build_figure(self, fig=None, preview_mode: bool = False, preview_scale: float = 0.5) -> "Figure":
         """Erzeugt die Karte als Matplotlib-Figure."""
+        import pandas as pd
+
         gdf = self._get_geodataframe()
         if gdf is None or gdf.empty:
             return self._empty_figure()
@@ -83,31 +104,43 @@ class MapBuilder:
             ax.clear()  # Wichtig: alte Inhalte entfernen
 
         self._apply_background(ax)
+        self._position_axes(fig, ax)
 
         lw_grenze = pixel_to_pt(self.styles.get("hauptland", {}).get("width", 1), dpi)
         lw_highlight = pixel_to_pt(self.styles.get("highlight", {}).get("width", 1), dpi)
+        self._pixel_size = self._output_pixel_size(gdf, main_gdf)
 
         # Zeichnen
-        self._plot_subcountries(ax, sub_gdf, lw_grenze)
-        if not main_gdf.empty:
+        self.artists = {}
+        with self._record(ax, "nebenland"):
+            self._plot_subcountries(ax, sub_gdf, lw_grenze)
+        if self.extent is not None:
+            ax.set_xlim(self.extent[0], self.extent[1])
+            ax.set_ylim(self.extent[2], self.extent[3])
+        elif not main_gdf.empty:
             self._set_bbox(ax, main_gdf)
-        self._plot_maincountry(ax, main_gdf, lw_grenze)
-        self._plot_highlights(ax, main_gdf, lw_highlight)
+        with self._record(ax, "hauptland"):
+            self._plot_maincountry(ax, main_gdf, lw_grenze)
+        with self._record(ax, "highlight"):
+            self._plot_highlights(ax, main_gdf, lw_highlight)
         if not overlay_gdf.empty:
             style = self.cfg.get("styles", {}).get("overlay", {})
             lw = style.get("line_width", 1.0)
-            overlay_gdf.plot(
-                ax=ax,
-                color=style.get("fill_color", "none"),
-                edgecolor=style.get("line_color", "black") if lw > 0 and style.get("show_lines", True) else "none",
-                linewidth=lw,
-                zorder=5
-            )
+            with self._record(ax, "overlay"):
+                overlay_gdf.plot(
+                    ax=ax,
+                    color=style.get("fill_color", "none"),
+                    edgecolor=style.get("line_color", "black") if lw > 0 and style.get("show_lines", True) else "none",
+                    linewidth=lw,
+                    zorder=5,
+                    rasterized=self._rasterize("overlay", overlay_gdf),
+                )
 
         self._plot_boundaries(ax, gdf, dpi)
-        self._add_scalebar(ax, preview_mode=preview_mode, preview_scale=preview_scale)
+        with self._record(ax, "scalebar"):
+            self._add_scalebar(ax, preview_mode=preview_mode, preview_scale=preview_scale)
 
-        fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        self._position_axes(fig, ax)
         return fig
 
     # ------------------------------------------------------------
@@ -131,13 +164,40 @@ class MapBuilder:
     # ------------------------------------------------------------
     def _create_figure_and_axis(self):
         """Erstellt Figure und Achse mit korrekten Abmessungen."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
         dpi = self.cfg.get("export", {}).get("dpi", 300)
         fig_w = self.width_px / dpi
         fig_h = self.height_px / dpi
-        fig, ax = plt.subplots(figsize=(fig_w, fig_h), dpi=dpi)
+        fig = Figure(figsize=(fig_w, fig_h), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
         ax.set_axis_off()
         return fig, ax, dpi
 
+    def _position_axes(self, fig, ax):
+        """Achse füllt die Figure – bzw. die Gesamtkarte, wenn nur ein Fenster gerendert wird."""
+        if self.view_window is None:
+            fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+            return
+        x0, y0, w, h = self.view_window
+        ax.set_position([
+            -x0 / w,
+            -(self.height_px - y0 - h) / h,
+            self.width_px / w,
+            self.height_px / h,
+        ])
+
+    @contextmanager
+    def _record(self, ax, role: str):
+        """Merkt sich alle Artists, die im with-Block zur Achse hinzukommen, unter role."""
+        before = set(ax.get_children())
+        yield
+        added = [a for a in ax.get_children() if a not in before]
+        if added:
+            self.artists.setdefault(role, []).extend(added)
+
     def _apply_background(self, ax):
         """Setzt Hintergrundfarbe, falls nicht transparent."""
         if not self.background.get("transparent", False):
@@ -145,6 +205,42 @@ class MapBuilder:
             ax.figure.patch.set_facecolor(bg)
             ax.set_facecolor(bg)
 
+    def _output_pixel_size(self, gdf, main_gdf) -> float:
+        """Kartenbreite eines Ausgabepixels: Ausschnitt (wie _set_bbox) / width_px."""
+        if self.extent is not None:
+            width = self.extent[1] - self.extent[0]
+        elif not main_gdf.empty:
+            bbox = self._compute_bbox(main_gdf)
+            width = bbox[1] - bbox[0]
+        else:
+            minx, _, maxx, _ = gdf.total_bounds
+            width = maxx - minx
+        return max(float(width), 0.0) / max(self.width_px, 1)
+
+    def _rasterize(self, style_key: str, gdf) -> bool:
+        """
+        Ob eine Ebene in Vektorausgaben (PDF/SVG) gerastert wird – per
+        styles[style_key]["rasterize"]: true/false oder "auto" (Default),
+        dann ab RASTERIZE_VERTICES Stützpunkten. Gezählt wird nach
+        Vereinfachung auf ein Ausgabepixel: Details, die in der Ausgabe
+        ohnehin zusammenfallen, zählen nicht mit. Gerastert wird mit der
+        Export-DPI der Figure; bei PNG & Co. hat das keine Wirkung.
+        """
+        policy = self.styles.get(style_key, {}).get("rasterize", "auto")
+        if policy != "auto":
+            return bool(policy)
+        import numpy as np
+        import shapely
+
+        limit = self.cfg.get("export", {}).get("rasterize_vertices", RASTERIZE_VERTICES)
+        geoms = np.asarray(gdf.geometry.values)
+        # Vereinfachen kann nur weniger Stützpunkte ergeben → kleine Ebenen sofort ausschließen
+        if int(shapely.get_num_coordinates(geoms).sum()) < limit:
+            return False
+        if self._pixel_size > 0:
+            geoms = shapely.simplify(geoms, self._pixel_size)
+        return int(shapely.get_num_coordinates(geoms).sum()) >= limit
+
     def _get_linewidths(self, dpi):
         """Berechnet Linienbreiten in Points."""
         lw_grenze = pixel_to_pt(self.lines_cfg.get("grenze_px", 1), dpi)
@@ -162,14 +258,25 @@ class MapBuilder:
                 ax=ax,
                 color=self.styles.get("nebenland", {}).get("fill", "lightgray"),
                 edgecolor=self.styles.get("nebenland",{}).get("edge", "#000000"),
-                linewidth=lw_grenze
+                linewidth=lw_grenze,
+                rasterized=self._rasterize("nebenland", sub_gdf),
             )
 
 
+    def _compute_bbox(self, main_gdf) -> tuple:
+        """Kartenausschnitt (xmin, xmax, ymin, ymax) um das Hauptland."""
+        aspect = self.width_px / self.height_px
+        karte = self.cfg.get("karte", {})
+        return compute_bbox(
+            main_gdf,
+            aspect,
+            padding_x=karte.get("padding_x", DEFAULT_PADDING),
+            padding_y=karte.get("padding_y", DEFAULT_PADDING),
+        )
+
     def _set_bbox(self, ax, main_gdf):
         """Setzt Bounding Box basierend auf Hauptland."""
-        aspect = self.width_px / self.height_px
-        bbox = compute_bbox(main_gdf, aspect)
+        bbox = self._compute_bbox(main_gdf)
         ax.set_xlim(bbox[0], bbox[1])
         ax.set_ylim(bbox[2], bbox[3])
 
@@ -181,7 +288,8 @@ class MapBuilder:
                 ax=ax,
                 color=self.styles.get("hauptland", {}).get("fill", "white"),
                 edgecolor=None,  # Kein Rand
-                linewidth=0      # Rand komplett deaktivieren
+                linewidth=0,     # Rand komplett deaktivieren
+                rasterized=self._rasterize("hauptland", main_gdf),
             )
 
     def _plot_highlights(self, ax, main_gdf, lw_highlight):
@@ -200,6 +308,7 @@ class MapBuilder:
                     edgecolor=self.styles.get("highlight", {}).get("edge", "darkred"),
                     linewidth=lw_highlight,
                     zorder=3,
+                    rasterized=self._rasterize("highlight", to_high),
                 )
 
     def _plot_boundaries(self, ax, gdf, dpi):
@@ -231,13 +340,14 @@ class MapBuilder:
             color = opts.get("color", "#000000")
             linestyle = opts.get("style", "solid")
 
-            gdf_main_level.boundary.plot(
-                ax=ax,
-                edgecolor=color,
-                linewidth=lw,
-                linestyle=linestyle,
-                zorder=6
-            )
+            with self._record(ax, f"boundary:{level}"):
+                gdf_main_level.boundary.plot(
+                    ax=ax,
+                    edgecolor=color,
+                    linewidth=lw,
+                    linestyle=linestyle,
+                    zorder=6
+                )
 
         print("BOUNDARY CFG:", boundaries_cfg)
     
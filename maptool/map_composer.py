@@ -0,0 +1,712 @@
+# maptool/map_composer.py
+
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple, Union, TYPE_CHECKING
+
+from data_processing.layers import (
+    load_base_layers, apply_region_masks, categorize_regions, preload_layers
+)
+from maptool.map_builder import MapBuilder
+from maptool.map_exporter import MapExporter, raster_options
+from utils.layer_selector import get_simplest_layer
+
+# Schwere Abhängigkeiten (PIL, matplotlib, geopandas) erst bei Bedarf laden
+if TYPE_CHECKING:
+    from PIL import Image
+    from matplotlib.figure import Figure
+    from geopandas import GeoDataFrame
+
+class MapComposer:
+    """
+    Zentrale Klasse für den Kartenaufbau.
+    Verwaltet Datenquellen, Layer-Konfiguration, Hintergrund, Dimensionen
+    und steuert den Build- und Exportprozess. Qt-frei; der Save-Dialog
+    kommt in gui.map_composer dazu.
+    """
+
+    def __init__(
+        self,
+        config: Dict,
+        primary_layers: List[str],
+        crs: Optional[str] = None
+    ) -> None:
+        from utils.config import config_manager
+        # Übergebene Config bevorzugen (Batch-Jobs), sonst globale Session-Config
+        self.session_config = config if config is not None else config_manager.get_session()
+        self.crs = crs or self.session_config.get("crs", "EPSG:3857")
+
+        # Dimensionen
+        karte_cfg = self.session_config.get("karte", {})
+        ui_cfg = self.session_config.get("ui", {})
+        self.width_px = karte_cfg.get("breite", ui_cfg.get("default_width", 800))
+        self.height_px = karte_cfg.get("hoehe", ui_cfg.get("default_height", 600))
+
+        # Scalebar
+        self.scalebar_cfg = self.session_config.get("scalebar", {"show": False})
+
+        # Hintergrund
+        bg_cfg = self.session_config.get("background", {})
+        self.background_cfg = {
+            "color": bg_cfg.get("color", "#ffffff"),
+            "transparent": bg_cfg.get("transparent", False),
+        }
+
+        # Export-Formate – Fallback, falls leer
+        self.export_formats = self.session_config.get("export", {}).get("formats") or ["png"]
+        # Zusätzliche Ausgabegrößen [(breite, hoehe, dpi|None), …] neben width_px × height_px
+        self.extra_sizes = [tuple(s) for s in self.session_config.get("export", {}).get("sizes", [])]
+
+        # Hide- und Highlight-Configs
+        self.hide_cfg = self.session_config.get("hide_cfg", {}) or {"aktiv": False, "bereiche": {}}
+        self.hl_cfg = self.session_config.get("highlight_cfg", {}) or {"aktiv": False, "layer": None, "namen": []}
+        # Optionale Teilauswahl des Hauptlands (nur diese Regionen laden)
+        self.include_cfg = self.session_config.get("include_cfg", {}) or {"aktiv": False, "bereiche": {}}
+
+        # Primäre Layer
+        self.primary_layers = list(primary_layers)
+
+        # GPKG-Dateien
+        self.main_gpkg: Optional[str] = None
+        self.sub_gpkgs: List[str] = []
+
+        # Overlay-Datei
+        self.overlay_file: Optional[str] = None
+
+        # Nachbarländer automatisch aus den Katalog-Ordnern ergänzen
+        catalog_cfg = self.session_config.get("catalog", {})
+        self.neighbour_dirs: List[str] = (
+            list(catalog_cfg.get("dirs", [])) if catalog_cfg.get("auto_neighbours", True) else []
+        )
+        # Weitere Seitenverhältnisse (Breite/Höhe), deren Ausschnitt die Nachbarn
+        # ebenfalls abdecken müssen (Zusatzgrößen, siehe maptool.multi_size)
+        self.neighbour_aspects: List[float] = [s[0] / s[1] for s in self.extra_sizes]
+
+        # Hide schon beim Lesen anwenden (Batch: ein Render pro Job). In der GUI
+        # bleibt der Basis-Frame stabil und Hide/Highlight sind reine Masken.
+        self.pushdown_hide = False
+
+        # Gecachter Basis-Frame (ohne Hide/Highlight) und sein Schlüssel
+        self._base_key = None
+        self._base_gdf: Optional["GeoDataFrame"] = None
+        self._gid_index = None
+
+        # MapBuilder der letzten Komposition (dessen Artists je Ebene)
+        self._last_builder: Optional[MapBuilder] = None
+
+    # ------------------------------------------------------------
+    # Setter-Methoden
+    # ------------------------------------------------------------
+    def set_files(self, main: str, subs: List[str]) -> None:
+        self.main_gpkg = main
+        self.sub_gpkgs = subs or []
+
+    def set_primary_layers(self, layers: List[str]) -> None:
+        self.primary_layers = list(layers)
+
+    def set_hide(self, hide_map: Dict[str, List[str]]) -> None:
+        aktiv = any(hide_map.values())
+        self.hide_cfg = {"aktiv": aktiv, "bereiche": hide_map}
+        self.session_config["hide_cfg"] = self.hide_cfg
+
+    def set_include(self, include_map: Dict[str, List[str]]) -> None:
+        aktiv = any(include_map.values())
+        self.include_cfg = {"aktiv": aktiv, "bereiche": include_map}
+        self.session_config["include_cfg"] = self.include_cfg
+
+    def set_highlight(self, layer: str, names: List[str]) -> None:
+        aktiv = bool(names)
+        self.hl_cfg = {"aktiv": aktiv, "layer": layer, "namen": names}
+        self.session_config["highlight_cfg"] = self.hl_cfg
+
+    def set_scalebar(self, cfg: Dict) -> None:
+        from utils.config import SCALER
+        SCALER.clear()
+        SCALER.update(cfg)
+        self.scalebar_cfg = dict(cfg)
+        self.session_config["scalebar"] = self.scalebar_cfg
+
+    def set_background(self, color: Optional[str] = None, transparent: Optional[bool] = None) -> None:
+        if color is not None:
+            self.background_cfg["color"] = color
+        if transparent is not None:
+            self.background_cfg["transparent"] = transparent
+        self.session_config["background"] = self.background_cfg
+
+    def set_dimensions(self, width: int, height: int) -> None:
+        self.width_px = width
+        self.height_px = height
+
+    def set_export_formats(self, formats: List[str]) -> None:
+        self.export_formats = formats or ["png"]
+        self.session_config.setdefault("export", {})["formats"] = self.export_formats
+
+    def set_extra_sizes(self, sizes: List[tuple]) -> None:
+        """Zusätzliche Ausgabegrößen (w, h, dpi|None), z. B. Thumbnail und Druck."""
+        self.extra_sizes = [tuple(s) for s in sizes]
+        self.session_config.setdefault("export", {})["sizes"] = [list(s) for s in self.extra_sizes]
+        self.neighbour_aspects = [s[0] / s[1] for s in self.extra_sizes]
+
+    def set_svg_compact(self, compact: bool) -> None:
+        """Kompakten SVG-Export ein-/ausschalten (config export.svg.compact)."""
+        self.session_config.setdefault("export", {}).setdefault("svg", {})["compact"] = bool(compact)
+
+    def set_overlay(self, overlay_path: Optional[str]) -> None:
+        """Setzt oder entfernt den Overlay-Layer."""
+        self.overlay_file = overlay_path
+
+    def sources(self) -> List[str]:
+        """Alle referenzierten Quelldateien (Haupt-, Neben-, Overlay-Datei)."""
+        paths = [self.main_gpkg, *self.sub_gpkgs, self.overlay_file]
+        return [p for p in paths if p]
+
+    def invalidate_source(self, path: str) -> bool:
+        """
+        Übernimmt eine geänderte Quelldatei (z. B. in QGIS bearbeitet):
+        verwirft nur ihre Cache-Einträge und den Basis-Frame samt GID-Index.
+        False, wenn path keine Quelle dieses Composers ist.
+        """
+        import os
+        from data_processing.cache import layer_cache
+        from data_processing.sources import source_registry
+
+        abs_path = os.path.abspath(path)
+        if abs_path not in {os.path.abspath(p) for p in self.sources()}:
+            return False
+        # Neuen Stand bewusst übernehmen (statt des Schnappschusses beim Ablegen)
+        try:
+            source_registry.accept(abs_path)
+        except OSError:
+            pass  # Datei gerade weg (Speichern per Umbenennen) – nächster Zugriff klärt das
+        dropped = layer_cache.invalidate_path(abs_path)
+        self._base_key = None
+        self._base_gdf = None
+        self._gid_index = None
+        print(f"Quelle geändert: {abs_path} ({dropped} Cache-Einträge verworfen)")
+        return True
+
+    # ------------------------------------------------------------
+    # Datenaufbereitung
+    # ------------------------------------------------------------
+    def _get_combined_gdf(self) -> Optional["GeoDataFrame"]:
+        """
+        Basis-Frame plus Hide/Highlight als Masken. Ändert sich nur die
+        Auswahl, kostet das ein Masken-Update statt eines Neuladens.
+        """
+        return self.masked_gdf(self.hl_cfg)
+
+    def masked_gdf(self, hl_cfg: Optional[Dict] = None) -> Optional["GeoDataFrame"]:
+        """
+        Basis-Frame mit Hide und der Hervorhebung hl_cfg (Default: die
+        aktuelle) als Masken – ohne hl_cfg oder session_config zu ändern.
+        """
+        base = self._get_base_gdf()
+        if base is None:
+            return None
+        exclude = base["__is_overlay"].to_numpy() if "__is_overlay" in base.columns else None
+        return apply_region_masks(
+            base, self.hide_cfg, self.hl_cfg if hl_cfg is None else hl_cfg,
+            exclude=exclude, gid_index=self._gid_index,
+        )
+
+    def _resolved_sources(self) -> tuple:
+        """
+        Lesepfade von Haupt-, Neben- und Overlay-Datei. Abgelegte Dateien
+        werden am Ort gelesen; hat sich eine Quelle seit dem Ablegen
+        geändert, liefert die Registry den Schnappschuss des alten Stands.
+        """
+        from data_processing.sources import source_registry
+        resolve = source_registry.resolve
+        return (
+            resolve(self.main_gpkg),
+            [resolve(s) for s in self.sub_gpkgs if s],
+            resolve(self.overlay_file),
+        )
+
+    def _base_cache_key(self, main: Optional[str], subs: List[str], overlay: Optional[str]) -> tuple:
+        """Alles, wovon der Basis-Frame abhängt (Dateien samt Signatur, Layer, CRS, Filter)."""
+        import json
+        from data_processing.cache import file_signature
+
+        def sig(path):
+            try:
+                return file_signature(path)
+            except OSError:
+                return path
+
+        def frozen(cfg):
+            return json.dumps(cfg, sort_keys=True, default=list)
+
+        return (
+            sig(main) if main else None,
+            tuple(sig(s) for s in subs),
+            sig(overlay) if overlay else None,
+            tuple(self.primary_layers),
+            self.crs,
+            frozen(self.include_cfg),
+            frozen(self.hide_cfg) if self.pushdown_hide else None,
+            tuple(self.neighbour_dirs),
+            self._neighbour_extent_key(),
+        )
+
+    def _neighbour_extent_key(self) -> Optional[tuple]:
+        """
+        Wovon der bbox-Filter der Nachbarn abhängt (Seitenverhältnis, Padding) –
+        ohne Nachbar-Ordner None, damit Größenänderungen dann nichts neu laden.
+        """
+        if not self.neighbour_dirs:
+            return None
+        karte = self.session_config.get("karte", {})
+        return (
+            self._neighbour_aspect_list(),
+            karte.get("padding_x"),
+            karte.get("padding_y"),
+        )
+
+    def _neighbour_aspect_list(self) -> tuple:
+        """Alle Seitenverhältnisse, für die Nachbarn geladen werden (Hauptgröße + neighbour_aspects)."""
+        aspects = {round(self.width_px / self.height_px, 6)}
+        aspects.update(round(a, 6) for a in self.neighbour_aspects)
+        return tuple(sorted(aspects))
+
+    def _get_base_gdf(self) -> Optional["GeoDataFrame"]:
+        sources = self._resolved_sources()
+        key = self._base_cache_key(*sources)
+        if key != self._base_key:
+            self._base_gdf = self._load_base_gdf(*sources)
+            self._gid_index = self._load_gid_index(key, self._base_gdf)
+            self._base_key = key
+        return self._base_gdf
+
+    @staticmethod
+    def _load_gid_index(key: tuple, base: Optional["GeoDataFrame"]):
+        """
+        GID-Hierarchie des Basis-Frames – einmal je Quellen-Kombination gebaut
+        und im Layer-Cache abgelegt (der Basis-Frame entsteht deterministisch
+        aus denselben Quellen, die Zeilen passen also auch für neue Composer).
+        """
+        if base is None:
+            return None
+        from data_processing.cache import layer_cache
+        from data_processing.gid_index import GidIndex
+        return layer_cache.get_or_load((key[0], "gid_index", key), lambda: GidIndex.from_frame(base))
+
+    def _load_base_gdf(
+        self, main: Optional[str], subs: List[str], overlay: Optional[str]
+    ) -> Optional["GeoDataFrame"]:
+        import os
+        import pandas as pd
+        parts = []
+        load_hide = self.hide_cfg if self.pushdown_hide else None
+
+        # Layer der Nebenländer und des Overlays bestimmen
+        sub_layers = {
+            sub: get_simplest_layer(sub) or [self.primary_layers[0]]
+            for sub in subs
+        }
+        overlay_file, overlay_layers = overlay, None
+        if overlay_file:
+            try:
+                if os.path.splitext(overlay_file)[1].lower() != ".shp":
+                    overlay_layers = get_simplest_layer(overlay_file) or [self.primary_layers[0]]
+            except Exception as e:
+                print(f"Fehler beim Laden des Overlays: {e}")
+                overlay_file = None
+
+        # Alle Quellen in einem Durchgang laden und gemeinsam reprojizieren
+        sources = []
+        if main:
+            sources.append((main, self.primary_layers, load_hide, self.include_cfg))
+        sources.extend((sub, layers, load_hide, None) for sub, layers in sub_layers.items())
+        if overlay_file:
+            sources.append((overlay_file, overlay_layers))
+        preload_layers(sources, self.crs)
+
+        # --- Hauptland ---
+        if main:
+            main_gdf = load_base_layers(
+                main,
+                self.primary_layers,
+                crs=self.crs,
+                hide_cfg=load_hide,
+                include_cfg=self.include_cfg
+            )
+            if main_gdf is not None and not main_gdf.empty:
+                main_gdf["__is_main"] = True
+                parts.append(main_gdf)
+                # --- Nachbarländer aus dem Katalog (nur im Kartenausschnitt) ---
+                if self.neighbour_dirs:
+                    parts.extend(self._load_neighbours(main_gdf, exclude=[main, *subs, overlay]))
+
+        # --- Nebenländer ---
+        for sub, layers in sub_layers.items():
+            sub_gdf = load_base_layers(
+                sub,
+                layers,
+                crs=self.crs,
+                hide_cfg=load_hide
+            )
+            if sub_gdf is not None and not sub_gdf.empty:
+                sub_gdf["__is_main"] = False
+                parts.append(sub_gdf)
+
+        # --- Overlay ---
+        if overlay_file:
+            try:
+                # Shapefile → kein Layername (overlay_layers ist dann None)
+                overlay_gdf = load_base_layers(
+                    overlay_file,
+                    overlay_layers,
+                    crs=self.crs
+                )
+                if overlay_gdf is not None and not overlay_gdf.empty:
+                    overlay_gdf["__is_overlay"] = True
+                    parts.append(overlay_gdf)
+            except Exception as e:
+                print(f"Fehler beim Laden des Overlays: {e}")
+
+        # --- Wenn nichts da ist, abbrechen ---
+        if not parts:
+            return None
+
+        # --- Nur nicht-leere Frames zusammenführen ---
+        non_empty = [p for p in parts if p is not None and not p.empty]
+        if not non_empty:
+            return None
+
+        gdf = pd.concat(non_empty, ignore_index=True)
+
+        # --- Sanfte Bereinigung ---
+
+        if "geometry" in gdf.columns:
+            gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+            try:
+                from shapely.validation import make_valid
+                gdf["geometry"] = gdf["geometry"].apply(make_valid)
+            except ImportError:
+                try:
+                    gdf["geometry"] = gdf["geometry"].buffer(0)
+                except Exception:
+                    pass
+
+        for col in gdf.columns:
+            if gdf[col].dtype == "object" or pd.api.types.is_categorical_dtype(gdf[col]):
+                gdf[col] = gdf[col].fillna("")
+
+        # --- Typbereinigung ---
+        for col in ("__is_main", "__is_overlay"):
+            if col in gdf.columns:
+                try:
+                    gdf[col] = gdf[col].astype(bool)
+                except Exception as e:
+                    print(f"WARN: {col} cast failed:", e)
+                    gdf[col] = False
+
+        # Regionsnamen als Kategorien → Hide/Highlight-Masken per Lookup-Tabelle
+        return categorize_regions(gdf)
+
+    def _load_neighbours(self, main_gdf: "GeoDataFrame", exclude: List[str]) -> List["GeoDataFrame"]:
+        """
+        Lädt die Nachbardateien aus neighbour_dirs, deren ADM_0-Ausdehnung
+        den gepolsterten Kartenausschnitt schneidet – nur Features innerhalb
+        des Ausschnitts (bbox-Filter beim Lesen). Auswahl per STRtree über
+        die Katalog-Ausdehnungen, ohne eine Datei zu öffnen.
+        """
+        from data_processing.catalog import get_catalog
+        from data_processing.crs import compute_bbox, transform_bounds
+
+        catalog = get_catalog()
+        try:
+            for directory in self.neighbour_dirs:
+                catalog.refresh(directory)
+            karte = self.session_config.get("karte", {})
+            # Vereinigung der Ausschnitte aller benötigten Seitenverhältnisse
+            boxes = [
+                compute_bbox(
+                    main_gdf,
+                    aspect,
+                    padding_x=karte.get("padding_x"),
+                    padding_y=karte.get("padding_y"),
+                )
+                for aspect in self._neighbour_aspect_list()
+            ]
+            xmin, xmax = min(b[0] for b in boxes), max(b[1] for b in boxes)
+            ymin, ymax = min(b[2] for b in boxes), max(b[3] for b in boxes)
+            extent = transform_bounds((xmin, ymin, xmax, ymax), self.crs, "EPSG:4326")
+            hits = catalog.neighbours(extent, self.neighbour_dirs, exclude=exclude)
+        except Exception as e:
+            print(f"Fehler bei der Nachbarsuche: {e}")
+            return []
+
+        # Box je Datei im Layer-CRS; alle Treffer gemeinsam lesen und reprojizieren
+        sources = []
+        for path, layer, layer_crs in hits:
+            try:
+                bbox = transform_bounds(extent, "EPSG:4326", layer_crs) if layer_crs else extent
+            except Exception:
+                bbox = extent
+            sources.append((path, [layer], None, None, bbox))
+        preload_layers(sources, self.crs)
+
+        parts = []
+        for path, layers, _, _, bbox in sources:
+            try:
+                gdf = load_base_layers(path, layers, crs=self.crs, bbox=bbox)
+            except Exception as e:
+                print(f"Fehler beim Laden des Nachbarlands {path}: {e}")
+                continue
+            if gdf is not None and not gdf.empty:
+                gdf["__is_main"] = False
+                parts.append(gdf)
+        if hits:
+            print(f"Nachbarländer automatisch geladen: {len(parts)} von {len(hits)} Treffern")
+        return parts
+
+    # ------------------------------------------------------------
+    # Figure-Erstellung
+    # ------------------------------------------------------------
+    def _create_empty_figure(self) -> "Figure":
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        dpi = self.session_config.get("export", {}).get("dpi", 300)
+        fig_w = self.width_px / dpi
+        fig_h = self.height_px / dpi
+        # Figure ohne pyplot: reiner Agg-Canvas, kein GUI-Backend nötig
+        fig = Figure(figsize=(fig_w, fig_h), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        ax.set_axis_off()
+
+        if not self.background_cfg["transparent"]:
+            fig.patch.set_facecolor(self.background_cfg["color"])
+            ax.set_facecolor(self.background_cfg["color"])
+
+        return fig
+
+    def map_extent(self, combined: "GeoDataFrame", aspect: Optional[float] = None) -> tuple:
+        """
+        Kartenausschnitt (xmin, xmax, ymin, ymax) wie MapBuilder._set_bbox – fürs
+        Hauptland; aspect (Breite/Höhe) Default: aktuelle Kartengröße.
+        """
+        from data_processing.crs import compute_bbox, DEFAULT_PADDING
+
+        main = combined[combined["__is_main"]] if "__is_main" in combined.columns else combined
+        karte = self.session_config.get("karte", {})
+        return compute_bbox(
+            main if not main.empty else combined,
+            aspect or self.width_px / self.height_px,
+            padding_x=karte.get("padding_x", DEFAULT_PADDING),
+            padding_y=karte.get("padding_y", DEFAULT_PADDING),
+        )
+
+    def compose(self, preview_mode: bool = False, preview_scale: float = 0.5) -> "Figure":
+        return self._compose_gdf(self._get_combined_gdf(), preview_mode, preview_scale)
+
+    def _compose_gdf(
+        self,
+        combined: Optional["GeoDataFrame"],
+        preview_mode: bool = False,
+        preview_scale: float = 0.5,
+        extent: Optional[tuple] = None,
+    ) -> "Figure":
+        # Immer neue Figure erzeugen
+        fig = self._create_empty_figure()
+        ax = fig.axes[0]
+        ax.clear()  # Wichtig: alte Inhalte entfernen
+
+        if combined is None or combined.empty:
+            return fig
+
+        builder = MapBuilder(
+            cfg=self.session_config,
+            main_gpkg=None,
+            layers=self.primary_layers,
+            crs=self.crs,
+            hide_cfg=self.hide_cfg,
+            hl_cfg=self.hl_cfg,
+            gdf=combined
+        )
+        builder.width_px = self.width_px if not preview_mode else int(self.width_px * preview_scale)
+        builder.height_px = self.height_px if not preview_mode else int(self.width_px * preview_scale)
+        builder.background = self.background_cfg
+        builder.scalebar_cfg = self.scalebar_cfg
+        builder.extent = extent
+        self._last_builder = builder
+
+        # Übergib die neue Figure an den Builder
+        return builder.build_figure(fig=fig, preview_mode=preview_mode, preview_scale=preview_scale)
+
+    # ------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------
+    def compose_and_save(self, output: BytesIO) -> None:
+        fig = self.compose()
+        MapExporter.save(
+            fig,
+            output,
+            self.export_formats,
+            transparent=self.background_cfg["transparent"],
+        )
+
+    def needs_tiling(self, fmt: str) -> bool:
+        """Ob fmt bei der aktuellen Kartengröße gekachelt exportiert wird (config export.tiled)."""
+        from maptool.tiled_export import needs_tiling
+        return needs_tiling(self.session_config, fmt, int(self.width_px), int(self.height_px))
+
+    def save_outputs(self, targets: List[Tuple[str, Union[str, Path]]]) -> Dict[str, float]:
+        """
+        Schreibt mehrere (Format, Pfad)-Ziele. Sehr große Raster (PNG/TIFF)
+        werden gekachelt im Prozess-Pool gerendert, "xyz"/"mbtiles" als
+        Web-Kachelpyramide (maptool.xyz_export), SVG auf Wunsch kompakt
+        (maptool.svg_export), alle übrigen Formate
+        aus einer einzigen compose()-Figure in einem Zeichendurchgang.
+        Gibt die Sekunden je Format zurück.
+        """
+        import time
+        from maptool.tiled_export import render_tiled
+        from maptool.svg_export import render_compact_svg, svg_settings
+
+        compact_svg = svg_settings(self.session_config)["compact"]
+        timings: Dict[str, float] = {}
+        single = []
+        for fmt, out in targets:
+            if self.needs_tiling(fmt):
+                start = time.perf_counter()
+                render_tiled(self, out, fmt)
+                timings[fmt] = time.perf_counter() - start
+            elif fmt.lower() in ("xyz", "mbtiles"):
+                # Kachelpyramide: Ordner <z>/<x>/<y>.png bzw. MBTiles-Datei
+                from maptool.xyz_export import render_xyz
+                start = time.perf_counter()
+                render_xyz(self, out)
+                timings[fmt] = time.perf_counter() - start
+            elif fmt.lower() == "svg" and compact_svg:
+                start = time.perf_counter()
+                render_compact_svg(self, out)
+                timings[fmt] = time.perf_counter() - start
+            else:
+                Path(out).parent.mkdir(parents=True, exist_ok=True)
+                single.append((fmt, Path(out)))
+        if single:
+            fig = self.compose()
+            timings.update(MapExporter.save_many(
+                fig,
+                single,
+                transparent=self.background_cfg["transparent"],
+                options=raster_options(self.session_config),
+            ))
+        return timings
+
+    def render_highlight_series(
+        self,
+        layer: str,
+        out_dir: Union[str, Path],
+        names: Optional[List[str]] = None,
+        formats: Optional[List[str]] = None,
+    ) -> List[Path]:
+        """
+        Eine Karte je Region von layer mit genau dieser Region hervorgehoben
+        (<out_dir>/<Region>.<fmt>); die statischen Ebenen werden dabei nur
+        einmal gerendert. Siehe maptool.highlight_series.
+        """
+        from maptool.highlight_series import render_highlight_series
+        return render_highlight_series(self, layer, out_dir, names=names, formats=formats)
+
+    def render_themes(
+        self,
+        themes: Dict[str, Dict],
+        targets: Dict[str, List[Tuple[str, Union[str, Path]]]],
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Dieselbe Karte in mehreren Style-Themes: einmal aufbauen, je Theme
+        nur Farben/Linien tauschen und schreiben. Siehe maptool.themes.
+        """
+        from maptool.themes import render_themes
+        return render_themes(self, themes, targets)
+
+    def render_sizes(
+        self,
+        targets: Dict[tuple, List[Tuple[str, Union[str, Path]]]],
+    ) -> Dict[tuple, Dict[str, float]]:
+        """
+        Dieselbe Karte in mehreren Größen (w, h, dpi|None) – Daten, Ausschnitt
+        und Detailstufen werden geteilt, die Größen rendern parallel.
+        Siehe maptool.multi_size.
+        """
+        from maptool.multi_size import render_sizes
+        return render_sizes(self, targets)
+
+    def save_to(self, out: Union[str, Path]) -> Dict[str, float]:
+        """
+        Pfad ohne Endung: Ordner mit map.<fmt> je Exportformat. Pfad mit
+        Endung eines der Exportformate: alle Formate nebeneinander unter
+        diesem Namen (map.png → map.png + map.svg). Sonst nur diese Datei.
+        Zusatzgrößen (extra_sizes) landen daneben als map_<w>x<h>.<fmt>.
+        """
+        path = Path(out)
+        fmt = path.suffix.lstrip(".")
+        if not path.suffix:
+            targets = [(f, path / f"map.{f}") for f in self.export_formats]
+        elif fmt in self.export_formats:
+            targets = [(f, path.with_suffix(f".{f}")) for f in self.export_formats]
+        else:
+            targets = [(fmt, path)]
+        timings = self.save_outputs(targets)
+
+        # Zusatzgrößen: map.png → map_320x200.png usw.
+        if self.extra_sizes:
+            from maptool.multi_size import sized_path
+            sized = self.render_sizes({
+                size: [(f, sized_path(p, size)) for f, p in targets if f not in ("xyz", "mbtiles")]
+                for size in self.extra_sizes
+            })
+            for size, t in sized.items():
+                timings.update({f"{size[0]}x{size[1]}:{k}": v for k, v in t.items()})
+        return timings
+
+    # ------------------------------------------------------------
+    # Vorschau
+    # ------------------------------------------------------------
+    def render(self, preview_mode: bool = False) -> "Image.Image":
+        from PIL import Image
+
+        buffer = BytesIO()
+        preview_scale = 0.5 if preview_mode else 1.0
+
+        if preview_mode:
+            combined = self._get_combined_gdf()
+            if combined is not None and not combined.empty:
+                combined = combined.copy()
+                # Geometrien weiter vereinfachen für die schnelle Vorschau
+                try:
+                    combined["geometry"] = combined["geometry"].simplify(
+                        tolerance=0.01, preserve_topology=True
+                    )
+                except Exception:
+                    pass
+
+                builder = MapBuilder(
+                    cfg=self.session_config,
+                    main_gpkg=None,
+                    layers=self.primary_layers,
+                    crs=self.crs,
+                    hide_cfg=self.hide_cfg,
+                    hl_cfg=self.hl_cfg,
+                    gdf=combined
+                )
+                builder.width_px = int(self.width_px * preview_scale)
+                builder.height_px = int(self.height_px * preview_scale)
+                builder.background = self.background_cfg
+                builder.scalebar_cfg = self.scalebar_cfg
+
+                fig = builder.build_figure(preview_mode=True, preview_scale=preview_scale)
+            else:
+                fig = self._create_empty_figure()
+        else:
+            fig = self.compose(preview_mode=False)
+
+        # Für die Vorschau immer PNG in den Speicher schreiben
+        MapExporter.save(fig, buffer, ["png"], transparent=self.background_cfg["transparent"])
+        buffer.seek(0)
+        return Image.open(buffer)
\ No newline at end of file
@@ -0,0 +1,273 @@
+# maptool/map_exporter.py
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Optional, Union, List, IO, Dict, Tuple
+
+# Rasterformate, die direkt aus dem gezeichneten RGBA-Puffer kodiert werden (Pillow-Name)
+RASTER_FORMATS = {
+    "png": "PNG",
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "tif": "TIFF",
+    "tiff": "TIFF",
+    "webp": "WEBP",
+}
+
+# Kodier-Optionen für Raster (config export.raster)
+RASTER_DEFAULTS: Dict[str, Any] = {
+    "png_compress_level": 6,   # zlib 0–9: 1 schnell, 9 klein
+    "png_palette": False,      # 8-Bit-PNG mit adaptiver Palette (flächige Karten)
+    "palette_colors": 256,
+    "webp_lossless": True,
+    "webp_quality": 80,        # verlustfrei: Aufwand, verlustbehaftet: Qualität
+    "webp_method": 4,          # 0 schnell … 6 klein
+}
+
+logger = logging.getLogger(__name__)
+
+# Varianten für MapExporter.encoding_report: (Name, Format, Optionen)
+REPORT_VARIANTS = [
+    ("png level 1", "png", {"png_compress_level": 1}),
+    ("png level 6", "png", {"png_compress_level": 6}),
+    ("png level 9", "png", {"png_compress_level": 9}),
+    ("png palette 256", "png", {"png_palette": True, "palette_colors": 256}),
+    ("png palette 64", "png", {"png_palette": True, "palette_colors": 64}),
+    ("webp lossless", "webp", {"webp_lossless": True}),
+    ("webp q80", "webp", {"webp_lossless": False, "webp_quality": 80}),
+]
+
+
+def raster_options(session_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**RASTER_DEFAULTS, **session_config.get("export", {}).get("raster", {})}
+
+
+class MapExporter:
+    """
+    Verantwortlich für das Speichern von Matplotlib-Figures
+    in verschiedenen Formaten. Qt-frei; Save-Dialog und Ordner-Öffnen
+    liegen in gui.map_exporter.
+    """
+
+    # ------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------
+    @staticmethod
+    def save(
+        fig,
+        out: Union[str, Path, IO],
+        export_formats: List[str],
+        transparent: bool,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, float]:
+        """
+        Speichert eine Matplotlib-Figure exakt in den vorgegebenen Pixelmaßen.
+
+        Parameter:
+        - fig: Matplotlib-Figure
+        - out: file-like Objekt, Pfad mit Extension oder Pfad ohne Extension
+        - export_formats: Liste der Formate (z. B. ["png", "svg"])
+        - transparent: Hintergrund transparent speichern
+        - options: Kodier-Optionen für Raster (siehe RASTER_DEFAULTS)
+
+        Rückgabe: Sekunden je Format
+        """
+        fmt_list = list(export_formats)
+
+        # Speichern je nach Zieltyp
+        if hasattr(out, "write"):
+            targets = [(fmt_list[0], out)]
+        else:
+            path = Path(out)
+            if path.suffix:
+                # Einzeldatei
+                path.parent.mkdir(parents=True, exist_ok=True)
+                targets = [(path.suffix.lstrip("."), path)]
+            else:
+                # Ordner + alle Formate
+                path.mkdir(parents=True, exist_ok=True)
+                targets = [(fmt, path / f"map.{fmt}") for fmt in fmt_list]
+        return MapExporter.save_many(fig, targets, transparent, options)
+
+    @staticmethod
+    def save_many(
+        fig,
+        targets: List[Tuple[str, Union[Path, IO]]],
+        transparent: bool,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, float]:
+        """
+        Schreibt alle (Format, Ziel)-Paare aus einem einzigen Zeichendurchgang.
+
+        Layout und Bounding Box werden einmal bestimmt, die Figure einmal
+        mit Agg gezeichnet. Rasterformate werden aus diesem RGBA-Puffer in
+        Threads kodiert, während Vektorformate (SVG, PDF, …) parallel im
+        aufrufenden Thread geschrieben werden. Gibt die Sekunden je Format
+        zurück (bei Rastern: Kodieren + Schreiben; der gemeinsame
+        Zeichendurchgang steht unter "draw").
+        """
+        # Figure-Rand entfernen, Bounding Box berechnen
+        bbox_inches = MapExporter.prepare_layout(fig)
+
+        options = {**RASTER_DEFAULTS, **(options or {})}
+        raster = [(fmt, t) for fmt, t in targets if fmt.lower() in RASTER_FORMATS]
+        vector = [(fmt, t) for fmt, t in targets if fmt.lower() not in RASTER_FORMATS]
+        timings: Dict[str, float] = {}
+
+        pool = None
+        futures = []
+        if raster:
+            start = time.perf_counter()
+            rgba = MapExporter.draw_rgba(fig, transparent, bbox_inches)
+            timings["draw"] = time.perf_counter() - start
+            pool = ThreadPoolExecutor(max_workers=len(raster), thread_name_prefix="encode")
+            futures = [
+                (fmt, pool.submit(MapExporter.encode_raster, rgba, target, fmt, fig.dpi, options))
+                for fmt, target in raster
+            ]
+        try:
+            for fmt, target in vector:
+                start = time.perf_counter()
+                MapExporter._save_single(fig, target, fmt, transparent, bbox_inches)
+                timings[fmt] = time.perf_counter() - start
+            for fmt, future in futures:
+                timings[fmt] = future.result()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        # Zeiten nur für echte Dateien melden – nicht für Vorschau-Puffer der GUI
+        summary = ", ".join(f"{k} {v:.2f}s" for k, v in timings.items())
+        if any(not hasattr(target, "write") for _, target in targets):
+            logger.info("Export: %s", summary)
+        else:
+            logger.debug("Export (Puffer): %s", summary)
+        return timings
+
+    @staticmethod
+    def encoding_report(fig, transparent: bool, variants=None) -> List[Dict[str, Any]]:
+        """
+        Kodiert die gezeichnete Figure in allen Varianten (REPORT_VARIANTS)
+        und misst Größe und Dauer – als Entscheidungshilfe, welche Optionen
+        ein Kanal (Web, Druck, …) bekommt. Die Varianten laufen parallel.
+        """
+        rgba = MapExporter.draw_rgba(fig, transparent, MapExporter.prepare_layout(fig))
+
+        def run(variant):
+            name, fmt, opts = variant
+            buffer = BytesIO()
+            seconds = MapExporter.encode_raster(
+                rgba, buffer, fmt, fig.dpi, {**RASTER_DEFAULTS, **opts}
+            )
+            return {"option": name, "format": fmt, "bytes": buffer.tell(), "seconds": seconds}
+
+        variants = list(variants or REPORT_VARIANTS)
+        with ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="encode") as pool:
+            return list(pool.map(run, variants))
+
+    # ------------------------------------------------------------
+    # Bausteine (auch für Serien, Kacheln & Co.)
+    # ------------------------------------------------------------
+    @staticmethod
+    def prepare_layout(fig):
+        """Entfernt den Figure-Rand und liefert die Bounding Box für draw_rgba/savefig."""
+        fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        return MapExporter._get_bbox_inches(fig)
+
+    @staticmethod
+    def draw_rgba(fig, transparent: bool, bbox_inches):
+        """Zeichnet die Figure einmal mit Agg und liefert den (auf bbox_inches zugeschnittenen) RGBA-Puffer."""
+        import numpy as np
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        old_canvas = fig.canvas
+        canvas = old_canvas if isinstance(old_canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+        try:
+            with MapExporter._transparent_patches(fig, transparent):
+                canvas.draw()
+                # Kopie: Vektor-Export zeichnet parallel in dieselbe Figure
+                rgba = np.array(canvas.buffer_rgba())
+        finally:
+            if canvas is not old_canvas:
+                fig.set_canvas(old_canvas)
+
+        if bbox_inches is not None:
+            h = rgba.shape[0]
+            dpi = fig.dpi
+            x0, x1 = round(bbox_inches.x0 * dpi), round(bbox_inches.x1 * dpi)
+            top, bottom = h - round(bbox_inches.y1 * dpi), h - round(bbox_inches.y0 * dpi)
+            rgba = rgba[max(top, 0):max(bottom, 0), max(x0, 0):max(x1, 0)]
+        return rgba
+
+    @staticmethod
+    def encode_raster(rgba, target, fmt: str, dpi: float, options: Dict[str, Any]) -> float:
+        """Kodiert den RGBA-Puffer per Pillow in das Rasterformat fmt. Gibt die Dauer zurück."""
+        from PIL import Image
+
+        start = time.perf_counter()
+        img = Image.fromarray(rgba, "RGBA")
+        pil_fmt = RASTER_FORMATS[fmt.lower()]
+        params: Dict[str, Any] = {"dpi": (dpi, dpi)}
+        if pil_fmt == "JPEG":
+            # JPEG kennt keinen Alphakanal → auf Weiß legen
+            bg = Image.new("RGBA", img.size, "white")
+            img = Image.alpha_composite(bg, img).convert("RGB")
+        elif pil_fmt == "PNG":
+            params["compress_level"] = options["png_compress_level"]
+            if options["png_palette"]:
+                # Fast-Octree kann RGBA – Transparenz bleibt in der Palette erhalten
+                img = img.quantize(options["palette_colors"], method=Image.Quantize.FASTOCTREE)
+        elif pil_fmt == "WEBP":
+            params.update(
+                lossless=options["webp_lossless"],
+                quality=options["webp_quality"],
+                method=options["webp_method"],
+            )
+        img.save(target, format=pil_fmt, **params)
+        return time.perf_counter() - start
+
+    # ------------------------------------------------------------
+    # Private Hilfsmethoden
+    # ------------------------------------------------------------
+    @staticmethod
+    def _get_bbox_inches(fig):
+        """Berechnet die Bounding Box der Figure."""
+        ax = fig.axes[0] if fig.axes else None
+        if not ax:
+            return None
+        return ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
+
+    @staticmethod
+    def _save_single(fig, target, fmt: str, transparent: bool, bbox_inches) -> None:
+        """Speichert Figure in ein einzelnes Ziel (file-like oder Pfad)."""
+        fig.savefig(
+            target,
+            format=fmt,
+            transparent=transparent,
+            dpi=fig.dpi,
+            bbox_inches=bbox_inches,
+            pad_inches=0
+        )
+
+    @staticmethod
+    @contextmanager
+    def _transparent_patches(fig, transparent: bool):
+        """Wie savefig(transparent=True): Figure- und Achsen-Hintergrund vorübergehend ausblenden."""
+        if not transparent:
+            yield
+            return
+        patches = [fig.patch] + [ax.patch for ax in fig.axes]
+        saved = [(p.get_facecolor(), p.get_edgecolor()) for p in patches]
+        for p in patches:
+            p.set_facecolor("none")
+            p.set_edgecolor("none")
+        try:
+            yield
+        finally:
+            for p, (fc, ec) in zip(patches, saved):
+                p.set_facecolor(fc)
+                p.set_edgecolor(ec)
@@ -0,0 +1,184 @@
+# maptool/multi_size.py
+
+import logging
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+    from maptool.map_composer import MapComposer
+
+# (Breite, Höhe, DPI oder None = Export-DPI)
+Size = Tuple[int, int, Optional[int]]
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+)\s*[x×]\s*(\d+)\s*(?:@\s*(\d+))?\s*$")
+
+logger = logging.getLogger(__name__)
+
+
+def parse_size(value: Union[str, List[int], Tuple[int, ...]]) -> Size:
+    """'1600x970', '320x200@72', [1600, 970] oder [320, 200, 72] → (w, h, dpi)."""
+    if isinstance(value, str):
+        match = _SIZE_PATTERN.match(value)
+        if not match:
+            raise ValueError(f"Ungültige Größe '{value}' (erwartet z. B. 1600x970 oder 320x200@72)")
+        w, h, dpi = match.groups()
+        return int(w), int(h), int(dpi) if dpi else None
+    if len(value) not in (2, 3):
+        raise ValueError(f"Ungültige Größe {value!r} (erwartet [breite, hoehe] oder [breite, hoehe, dpi])")
+    return int(value[0]), int(value[1]), int(value[2]) if len(value) == 3 else None
+
+
+def parse_sizes(text: str) -> List[Size]:
+    """Kommagetrennte Liste wie '320x200@72, 1600x970'."""
+    return [parse_size(part) for part in text.split(",") if part.strip()]
+
+
+def sized_path(path: Union[str, Path], size: Size) -> Path:
+    """map.png + 320×200 → map_320x200.png"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_{size[0]}x{size[1]}{path.suffix}")
+
+
+# ------------------------------------------------------------
+# Worker (Prozess-Pool)
+# ------------------------------------------------------------
+_SIZE_STATE: Dict[str, Any] = {}
+
+
+def _init_size_worker(state: Dict[str, Any]) -> None:
+    """Übernimmt Daten und Einstellungen einmal je Worker-Prozess."""
+    import matplotlib
+    matplotlib.use("Agg")
+    _SIZE_STATE.clear()
+    _SIZE_STATE.update(state)
+    _SIZE_STATE["lod_cache"] = {}
+
+
+def _lod_gdf(tolerance: float) -> "GeoDataFrame":
+    """Auf tolerance vereinfachte Geometrien – je Worker und Detailstufe einmal."""
+    cache = _SIZE_STATE["lod_cache"]
+    if tolerance not in cache:
+        gdf = _SIZE_STATE["gdf"].copy()
+        gdf["geometry"] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+        cache[tolerance] = gdf[~gdf.geometry.is_empty]
+    return cache[tolerance]
+
+
+def _render_size(
+    width: int,
+    height: int,
+    dpi: int,
+    extent: tuple,
+    tolerance: float,
+    targets: List[Tuple[str, Path]],
+) -> Dict[str, float]:
+    """Rendert eine Größe und schreibt ihre Ziele. Gibt Sekunden je Format zurück."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from maptool.map_builder import MapBuilder
+    from maptool.map_exporter import MapExporter
+
+    st = _SIZE_STATE
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_axis_off()
+
+    # Linienbreiten und Scalebar rechnet der Builder per pixel_to_pt mit dieser DPI
+    builder = MapBuilder(
+        cfg=st["cfg"],
+        layers=st["layers"],
+        crs=st["crs"],
+        hide_cfg=st["hide_cfg"],
+        hl_cfg=st["hl_cfg"],
+        gdf=_lod_gdf(tolerance).copy(),
+    )
+    builder.width_px, builder.height_px = width, height
+    builder.background = st["background"]
+    builder.scalebar_cfg = st["scalebar_cfg"]
+    builder.extent = extent
+    builder.build_figure(fig=fig)
+
+    for _, out in targets:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+    return MapExporter.save_many(fig, targets, st["transparent"], st["raster_options"])
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def render_sizes(
+    composer: "MapComposer",
+    targets: Dict[Size, List[Tuple[str, Union[str, Path]]]],
+    workers: Optional[int] = None,
+) -> Dict[Size, Dict[str, float]]:
+    """
+    Schreibt dieselbe Karte in mehreren Pixelgrößen/DPIs.
+
+    Daten werden einmal geladen – Nachbarländer für die Vereinigung der
+    Ausschnitte aller Seitenverhältnisse –, der Ausschnitt je
+    Seitenverhältnis nur einmal berechnet. Die Vereinfachung (Detailstufe: halbes Pixel, auf
+    Zweierpotenzen gerundet) teilen sich alle Größen ähnlicher Auflösung.
+    Die Größen rendern parallel im Prozess-Pool.
+    targets: (w, h, dpi) → [(Format, Pfad), …]. Gibt Sekunden je Größe und Format zurück.
+    """
+    from maptool.map_exporter import raster_options
+
+    start = time.perf_counter()
+    # Nachbarn für die Vereinigung aller Ausschnitte laden – sonst fehlen sie
+    # dort, wo ein anderes Seitenverhältnis den Ausschnitt verbreitert.
+    # Nur für diesen Aufruf: danach gilt wieder die Liste des Composers.
+    saved_aspects = composer.neighbour_aspects
+    composer.neighbour_aspects = list(saved_aspects) + [w / h for w, h, _ in targets]
+    try:
+        combined = composer._get_combined_gdf()
+    finally:
+        composer.neighbour_aspects = saved_aspects
+    if combined is None or combined.empty:
+        raise ValueError("Keine Daten zum Exportieren")
+    default_dpi = composer.session_config.get("export", {}).get("dpi", 300)
+
+    extents: Dict[float, tuple] = {}
+    jobs = []
+    for size, size_targets in targets.items():
+        width, height, dpi = size
+        aspect = round(width / height, 6)
+        if aspect not in extents:
+            extents[aspect] = composer.map_extent(combined, aspect=width / height)
+        extent = extents[aspect]
+        half_px = (extent[1] - extent[0]) / width / 2
+        tolerance = 2.0 ** math.floor(math.log2(half_px)) if half_px > 0 else 0.0
+        jobs.append((size, (
+            width, height, dpi or default_dpi, extent, tolerance,
+            [(fmt, Path(out)) for fmt, out in size_targets],
+        )))
+
+    state = {
+        "gdf": combined,
+        "cfg": composer.session_config,
+        "layers": composer.primary_layers,
+        "crs": composer.crs,
+        "hide_cfg": composer.hide_cfg,
+        "hl_cfg": composer.hl_cfg,
+        "background": composer.background_cfg,
+        "scalebar_cfg": composer.scalebar_cfg,
+        "transparent": composer.background_cfg["transparent"],
+        "raster_options": raster_options(composer.session_config),
+    }
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_size_worker, initargs=(state,)
+    ) as pool:
+        futures = [(size, pool.submit(_render_size, *args)) for size, args in jobs]
+        timings = {size: future.result() for size, future in futures}
+
+    logger.info(
+        "%d Größen in %.1fs (%d Prozesse)", len(jobs), time.perf_counter() - start, workers
+    )
+    return timings
@@ -0,0 +1,196 @@
+# maptool/svg_export.py
+
+import logging
+import math
+import re
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, TYPE_CHECKING
+
+from utils.constants import BOUNDARY_TO_COLUMN
+
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+    from maptool.map_composer import MapComposer
+
+# Defaults für config["export"]["svg"]
+SVG_DEFAULTS: Dict[str, Any] = {
+    "compact": False,         # kompakten SVG-Export verwenden
+    "precision_px": 0.1,      # Raster, auf das Koordinaten gerundet werden (Pixel der Ausgabe)
+    "min_feature_px": 0.5,    # kleinere Features (Bounding Box) sind unsichtbar → weglassen
+}
+
+# Spalten, die über den Stil eines Features entscheiden (siehe MapBuilder._plot_*)
+STYLE_COLUMNS = ("__is_main", "__is_overlay", "highlight", "source_layer")
+
+_PATH_ATTR = re.compile(rb'(\sd=")([^"]*)(")')
+_NUMBER = re.compile(rb"-?\d+\.\d+")
+_COMMAND = re.compile(rb"([MLQCz])([^MLQCz]*)")
+
+logger = logging.getLogger(__name__)
+
+
+def svg_settings(session_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**SVG_DEFAULTS, **session_config.get("export", {}).get("svg", {})}
+
+
+# ------------------------------------------------------------
+# Geometrie
+# ------------------------------------------------------------
+def compact_gdf(
+    gdf: "GeoDataFrame",
+    extent: tuple,
+    width_px: int,
+    precision_px: float = SVG_DEFAULTS["precision_px"],
+    min_feature_px: float = SVG_DEFAULTS["min_feature_px"],
+) -> "GeoDataFrame":
+    """
+    Bereitet ein GeoDataFrame für eine kompakte Vektorausgabe vor:
+
+    1. Features außerhalb des Ausschnitts oder kleiner als min_feature_px
+       (in Pixeln der Ausgabe) entfallen.
+    2. Koordinaten werden auf ein Raster von precision_px gerundet;
+       doppelte und kollineare Stützpunkte fallen dabei weg.
+    3. Features gleichen Stils werden zu je einer Multi-Geometrie
+       zusammengefasst (ohne Union – innere Grenzen bleiben erhalten),
+       matplotlib schreibt dann einen Compound-Path statt einem je Polygon.
+    """
+    import numpy as np
+    import pandas as pd
+    import shapely
+    import geopandas as gpd
+
+    xmin, xmax, ymin, ymax = extent
+    px = (xmax - xmin) / width_px
+
+    # 1) Unsichtbares weglassen (Punkte haben keine Ausdehnung → nur Lage prüfen)
+    geoms = np.asarray(gdf.geometry.values)
+    b = shapely.bounds(geoms)
+    is_point = np.isin(shapely.get_type_id(geoms), (0, 4))
+    with np.errstate(invalid="ignore"):
+        size_px = np.maximum(b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]) / px
+        visible = (
+            (is_point | (size_px >= min_feature_px))
+            & (b[:, 2] >= xmin) & (b[:, 0] <= xmax)
+            & (b[:, 3] >= ymin) & (b[:, 1] <= ymax)
+        )
+    gdf = gdf[visible]
+
+    # 2) Auf das Ausgaberaster runden, dann kollineare Punkte entfernen
+    grid = precision_px * px
+    geoms = shapely.set_precision(np.asarray(gdf.geometry.values), grid)
+    geoms = shapely.simplify(geoms, grid * 1e-3, preserve_topology=True)
+    keep = ~shapely.is_empty(geoms) & ~shapely.is_missing(geoms)
+    gdf, geoms = gdf[keep], geoms[keep]
+    if gdf.empty:
+        return gdf
+
+    # 3) Nach Stil gruppieren und zu Multi-Geometrien zusammenfassen
+    key = pd.DataFrame(index=gdf.index)
+    for col in STYLE_COLUMNS:
+        if col in gdf.columns:
+            key[col] = gdf[col]
+    boundary_cols = [c for c in dict.fromkeys(BOUNDARY_TO_COLUMN.values()) if c in gdf.columns]
+    for col in boundary_cols:
+        key[f"__has_{col}"] = gdf[col].notna()
+    type_id = shapely.get_type_id(geoms)
+    key["__kind"] = np.select(
+        [np.isin(type_id, (3, 6)), np.isin(type_id, (1, 2, 5))],
+        ["polygon", "line"],
+        default="other",
+    )
+
+    rows, merged = [], []
+    for _, idx in key.groupby(list(key.columns), sort=False, dropna=False).indices.items():
+        part_geoms = geoms[idx]
+        kind = key["__kind"].iat[idx[0]]
+        parts = shapely.get_parts(part_geoms)
+        if kind == "polygon":
+            merged.append(shapely.multipolygons(parts))
+        elif kind == "line":
+            merged.append(shapely.multilinestrings(parts))
+        else:
+            merged.append(shapely.geometrycollections(part_geoms))
+        first = gdf.iloc[idx[0]]
+        row = {col: first[col] for col in STYLE_COLUMNS if col in gdf.columns}
+        for col in boundary_cols:
+            values = gdf[col].iloc[idx].dropna()
+            row[col] = values.iat[0] if not values.empty else None
+        rows.append(row)
+
+    return gpd.GeoDataFrame(rows, geometry=merged, crs=gdf.crs)
+
+
+# ------------------------------------------------------------
+# SVG-Text
+# ------------------------------------------------------------
+def _round_number(match, decimals: int) -> bytes:
+    text = f"{float(match.group(0)):.{decimals}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return (text if text != "-0" else "0").encode()
+
+
+def _compact_path(d: bytes, decimals: int) -> bytes:
+    """Rundet die Koordinaten eines d-Attributs und entfernt doppelte L-Punkte."""
+    d = _NUMBER.sub(lambda m: _round_number(m, decimals), d)
+    out, last = [], None
+    for cmd, args in _COMMAND.findall(d):
+        coords = args.split()
+        if cmd == b"L" and coords == last:
+            continue
+        if coords:
+            last = coords[-2:]
+        out.append(cmd + (b" " + b" ".join(coords) if coords else b""))
+    return b" ".join(out)
+
+
+def compact_svg_text(data: bytes, decimals: int) -> bytes:
+    """Kürzt die Pfaddaten einer von matplotlib geschriebenen SVG-Datei."""
+    return _PATH_ATTR.sub(
+        lambda m: m.group(1) + _compact_path(m.group(2), decimals) + m.group(3), data
+    )
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def render_compact_svg(composer: "MapComposer", path) -> Path:
+    """
+    Schreibt die Karte des Composers als kompaktes SVG: gerundete und
+    ausgedünnte Koordinaten, ein Compound-Path je Stil, ohne Features
+    unterhalb der Sichtbarkeitsgrenze.
+    """
+    from maptool.map_exporter import MapExporter
+
+    path = Path(path)
+    cfg = svg_settings(composer.session_config)
+    dpi = composer.session_config.get("export", {}).get("dpi", 300)
+    start = time.perf_counter()
+
+    combined = composer._get_combined_gdf()
+    if combined is None or combined.empty:
+        raise ValueError("Keine Daten zum Exportieren")
+    extent = composer.map_extent(combined)
+    compact = compact_gdf(
+        combined, extent, int(composer.width_px), cfg["precision_px"], cfg["min_feature_px"]
+    )
+    fig = composer._compose_gdf(compact, extent=extent)
+
+    buffer = BytesIO()
+    MapExporter.save(fig, buffer, ["svg"], transparent=composer.background_cfg["transparent"])
+
+    # SVG-Einheiten sind pt: 1 px = 72/dpi pt
+    step_pt = cfg["precision_px"] * 72.0 / dpi
+    decimals = max(0, math.ceil(-math.log10(step_pt)))
+    data = compact_svg_text(buffer.getvalue(), decimals)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    logger.info(
+        "Kompaktes SVG: %d → %d Pfade, %.1f → %.1f MB, %.2fs",
+        len(combined), len(compact), len(buffer.getvalue()) / 1e6, len(data) / 1e6,
+        time.perf_counter() - start,
+    )
+    return path
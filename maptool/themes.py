@@ -0,0 +1,146 @@
+# maptool/themes.py
+"""
+Style-Themes: dieselbe Karte in mehreren Farbschemata.
+
+Ein Theme ist ein Dict mit optionalen Schlüsseln wie in der Session-Config:
+
+    themes:
+      print_grau:
+        styles: {hauptland: {fill: "#DDDDDD"}, nebenland: {fill: "#F2F2F2"}}
+        background: {color: "#FFFFFF", transparent: false}
+      dark:
+        styles: {hauptland: {fill: "#30343F"}, highlight: {fill: "#E0A030"}}
+        background: {color: "#101218"}
+        scalebar: {color: "#EEEEEE"}
+
+Die Werte überschreiben die Styles der Basis-Config. Welche Grenzen
+überhaupt gezeichnet werden, legt die Basis fest; ein Theme kann sie
+über "show": false ausblenden, aber keine neuen hinzufügen.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from maptool.map_composer import MapComposer
+
+logger = logging.getLogger(__name__)
+
+
+def merge_theme(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Rekursives Überschreiben von base mit override (base bleibt unverändert)."""
+    result = dict(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge_theme(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def _set_collection(artists, facecolor=None, edgecolor=None, linewidth=None, linestyle=None):
+    for a in artists:
+        if facecolor is not None:
+            a.set_facecolor(facecolor)
+        if edgecolor is not None:
+            a.set_edgecolor(edgecolor)
+        if linewidth is not None:
+            a.set_linewidth(linewidth)
+        if linestyle is not None:
+            a.set_linestyle(linestyle)
+
+
+def apply_theme(fig: "Figure", artists: Dict[str, list], cfg: Dict[str, Any], theme: Dict[str, Any]) -> bool:
+    """
+    Setzt Farben und Linien aller aufgezeichneten Artists (MapBuilder.artists)
+    auf Basis-Config + theme. Geometrie und Layout bleiben unangetastet.
+    Gibt zurück, ob der Hintergrund transparent ist.
+    """
+    from maptool.map_builder import pixel_to_pt
+
+    dpi = fig.dpi
+    styles = merge_theme(cfg.get("styles", {}), theme.get("styles", {}))
+
+    # Defaults wie in MapBuilder._plot_*
+    haupt = styles.get("hauptland", {})
+    lw_grenze = pixel_to_pt(haupt.get("width", 1), dpi)
+    neben = styles.get("nebenland", {})
+    _set_collection(
+        artists.get("nebenland", []),
+        facecolor=neben.get("fill", "lightgray"),
+        edgecolor=neben.get("edge", "#000000"),
+        linewidth=lw_grenze,
+    )
+    _set_collection(artists.get("hauptland", []), facecolor=haupt.get("fill", "white"))
+
+    hl = styles.get("highlight", {})
+    _set_collection(
+        artists.get("highlight", []),
+        facecolor=hl.get("fill", "red"),
+        edgecolor=hl.get("edge", "darkred"),
+        linewidth=pixel_to_pt(hl.get("width", 1), dpi),
+    )
+
+    ov = styles.get("overlay", {})
+    lw = ov.get("line_width", 1.0)
+    _set_collection(
+        artists.get("overlay", []),
+        facecolor=ov.get("fill_color", "none"),
+        edgecolor=ov.get("line_color", "black") if lw > 0 and ov.get("show_lines", True) else "none",
+        linewidth=lw,
+    )
+
+    for level, opts in styles.get("hauptland_boundaries", {}).items():
+        drawn = artists.get(f"boundary:{level}", [])
+        _set_collection(
+            drawn,
+            edgecolor=opts.get("color", "#000000"),
+            linewidth=pixel_to_pt(opts.get("width", 1.0), dpi),
+            linestyle=opts.get("style", "solid"),
+        )
+        for a in drawn:
+            a.set_visible(opts.get("show", False))
+
+    scalebar = merge_theme(cfg.get("scalebar", {}), theme.get("scalebar", {}))
+    for a in artists.get("scalebar", []):
+        a.set_color(scalebar.get("color", "black"))
+
+    background = merge_theme(cfg.get("background", {}), theme.get("background", {}))
+    transparent = background.get("transparent", False)
+    color = background.get("color", "#ffffff")
+    fig.patch.set_facecolor(color)
+    for ax in fig.axes:
+        ax.set_facecolor(color)
+    return transparent
+
+
+def render_themes(
+    composer: "MapComposer",
+    themes: Dict[str, Dict[str, Any]],
+    targets: Dict[str, List[Tuple[str, Union[str, Path]]]],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Rendert die Karte einmal (Laden, Reprojizieren, Geometrie-Collections)
+    und schreibt sie danach je Theme: nur Farben und Linien der Artists
+    werden getauscht, dann folgt der Zeichen- und Schreibdurchgang.
+    targets: Theme-Name → [(Format, Pfad), …]. Gibt Sekunden je Theme und Format zurück.
+    """
+    from maptool.map_exporter import MapExporter, raster_options
+
+    start = time.perf_counter()
+    fig = composer.compose()
+    artists = composer._last_builder.artists if composer._last_builder else {}
+    logger.info("Themes: Karte aufgebaut in %.1fs", time.perf_counter() - start)
+
+    options = raster_options(composer.session_config)
+    timings: Dict[str, Dict[str, float]] = {}
+    for name, theme in themes.items():
+        transparent = apply_theme(fig, artists, composer.session_config, theme or {})
+        theme_targets = [(fmt, Path(out)) for fmt, out in targets.get(name, [])]
+        for _, out in theme_targets:
+            out.parent.mkdir(parents=True, exist_ok=True)
+        timings[name] = MapExporter.save_many(fig, theme_targets, transparent, options)
+    return timings
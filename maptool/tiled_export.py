@@ -0,0 +1,351 @@
+# maptool/tiled_export.py
+
+import logging
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from maptool.map_composer import MapComposer
+
+# Formate, die gekachelt geschrieben werden können
+TILED_FORMATS = ("png", "tif", "tiff")
+
+# Defaults für config["export"]["tiled"]
+TILED_DEFAULTS: Dict[str, Any] = {
+    "mode": "auto",          # "auto" (ab threshold_mp), "always", "never"
+    "threshold_mp": 50,      # Megapixel, ab denen automatisch gekachelt wird
+    "tile_px": 2048,         # Kantenlänge einer Kachel
+    "bleed_px": 32,          # Rand, in dem Features noch mitgezeichnet werden
+    "workers": None,         # Prozesse (Default: Anzahl CPU-Kerne)
+}
+
+logger = logging.getLogger(__name__)
+
+
+def tiled_settings(session_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**TILED_DEFAULTS, **session_config.get("export", {}).get("tiled", {})}
+
+
+def needs_tiling(session_config: Dict[str, Any], fmt: str, width_px: int, height_px: int) -> bool:
+    """Ob ein Export im Format fmt gekachelt gerendert wird (siehe TILED_DEFAULTS)."""
+    if fmt.lower() not in TILED_FORMATS:
+        return False
+    cfg = tiled_settings(session_config)
+    if cfg["mode"] == "always":
+        return True
+    if cfg["mode"] == "never":
+        return False
+    return width_px * height_px >= cfg["threshold_mp"] * 1_000_000
+
+
+# ------------------------------------------------------------
+# Streaming-Writer (zeilenweise, ohne das Gesamtbild im Speicher)
+# ------------------------------------------------------------
+class PngStreamWriter:
+    """
+    RGBA-PNG, das Zeilenblock für Zeilenblock komprimiert geschrieben wird.
+    close() schließt die Datei erst ab, wenn alle Zeilen da sind; nach
+    einem Fehler verwirft abort() die angefangene Datei.
+    """
+
+    def __init__(self, path: Path, width: int, height: int, level: int = 6) -> None:
+        self.path = Path(path)
+        self.width, self.height = width, height
+        self._rows = 0
+        self._fh = open(self.path, "wb")
+        self._zip = zlib.compressobj(level)
+        self._fh.write(b"\x89PNG\r\n\x1a\n")
+        # 8 Bit, Farbtyp 6 (RGBA), keine Interlace
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+
+    def _chunk(self, tag: bytes, data: bytes) -> None:
+        self._fh.write(struct.pack(">I", len(data)))
+        self._fh.write(tag)
+        self._fh.write(data)
+        self._fh.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+
+    def write_rows(self, rows: "np.ndarray") -> None:
+        import numpy as np
+        # Jede Zeile mit Filterbyte 0 (None) – die Kompression übernimmt zlib
+        filtered = np.zeros((rows.shape[0], rows.shape[1] * 4 + 1), dtype=np.uint8)
+        filtered[:, 1:] = rows.reshape(rows.shape[0], -1)
+        data = self._zip.compress(filtered.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+        self._rows += rows.shape[0]
+
+    def close(self) -> None:
+        if self._rows != self.height:
+            self.abort()
+            raise ValueError(f"PNG unvollständig: {self._rows} von {self.height} Zeilen geschrieben")
+        self._chunk(b"IDAT", self._zip.flush())
+        self._chunk(b"IEND", b"")
+        self._fh.close()
+
+    def abort(self) -> None:
+        """Schließt ohne IEND und löscht die unvollständige Datei."""
+        _discard(self._fh, self.path)
+
+
+class TiffStreamWriter:
+    """
+    Unkomprimiertes RGBA-Baseline-TIFF mit einem Strip je Zeilenblock.
+    Das IFD (Strip-Offsets) wird am Ende geschrieben; klassisches TIFF,
+    also maximal 4 GB. Nach einem Fehler verwirft abort() die angefangene Datei.
+    """
+
+    def __init__(self, path: Path, width: int, height: int) -> None:
+        if width * height * 4 >= 2 ** 32 - 2 ** 20:
+            raise ValueError("TIFF größer als 4 GB – bitte PNG wählen oder kleiner exportieren")
+        self.path = Path(path)
+        self.width, self.height = width, height
+        self._rows = 0
+        self._fh = open(self.path, "wb")
+        self._fh.write(b"II*\x00" + struct.pack("<I", 0))  # IFD-Offset wird in close() gesetzt
+        self._offsets: List[int] = []
+        self._counts: List[int] = []
+        self._rows_per_strip: Optional[int] = None
+
+    def write_rows(self, rows: "np.ndarray") -> None:
+        if self._rows_per_strip is None:
+            self._rows_per_strip = rows.shape[0]
+        data = rows.tobytes()
+        self._offsets.append(self._fh.tell())
+        self._counts.append(len(data))
+        self._fh.write(data)
+        self._rows += rows.shape[0]
+
+    def abort(self) -> None:
+        """Schließt ohne IFD und löscht die unvollständige Datei."""
+        _discard(self._fh, self.path)
+
+    def close(self) -> None:
+        if not self._offsets or self._rows != self.height:
+            self.abort()
+            raise ValueError(f"TIFF unvollständig: {self._rows} von {self.height} Zeilen geschrieben")
+        fh = self._fh
+        # Arrays der Strip-Offsets/-Längen und BitsPerSample vor das IFD schreiben
+        if fh.tell() % 2:
+            fh.write(b"\x00")
+        offsets_pos = fh.tell()
+        fh.write(struct.pack(f"<{len(self._offsets)}I", *self._offsets))
+        counts_pos = fh.tell()
+        fh.write(struct.pack(f"<{len(self._counts)}I", *self._counts))
+        bps_pos = fh.tell()
+        fh.write(struct.pack("<4H", 8, 8, 8, 8))
+
+        n = len(self._offsets)
+        SHORT, LONG = 3, 4
+        entries = [
+            (256, LONG, 1, self.width),                       # ImageWidth
+            (257, LONG, 1, self.height),                      # ImageLength
+            (258, SHORT, 4, bps_pos),                         # BitsPerSample
+            (259, SHORT, 1, 1),                               # Compression: keine
+            (262, SHORT, 1, 2),                               # Photometric: RGB
+            (273, LONG, n, offsets_pos if n > 1 else self._offsets[0]),  # StripOffsets
+            (277, SHORT, 1, 4),                               # SamplesPerPixel
+            (278, LONG, 1, self._rows_per_strip or self.height),  # RowsPerStrip
+            (279, LONG, n, counts_pos if n > 1 else self._counts[0]),    # StripByteCounts
+            (284, SHORT, 1, 1),                               # PlanarConfig: chunky
+            (338, SHORT, 1, 2),                               # ExtraSamples: Alpha (unassoziiert)
+        ]
+        if fh.tell() % 2:
+            fh.write(b"\x00")
+        ifd_pos = fh.tell()
+        fh.write(struct.pack("<H", len(entries)))
+        for tag, typ, count, value in entries:
+            if typ == SHORT and count == 1:
+                fh.write(struct.pack("<HHIHH", tag, typ, count, value, 0))
+            else:
+                fh.write(struct.pack("<HHII", tag, typ, count, value))
+        fh.write(struct.pack("<I", 0))
+        fh.seek(4)
+        fh.write(struct.pack("<I", ifd_pos))
+        fh.close()
+
+
+def _discard(fh, path: Path) -> None:
+    """Schließt fh und entfernt die halb geschriebene Datei path."""
+    try:
+        fh.close()
+    finally:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _open_writer(path: Path, fmt: str, width: int, height: int):
+    if fmt.lower() == "png":
+        return PngStreamWriter(path, width, height)
+    return TiffStreamWriter(path, width, height)
+
+
+# ------------------------------------------------------------
+# Worker (Prozess-Pool)
+# ------------------------------------------------------------
+_TILE_STATE: Dict[str, Any] = {}
+
+
+def _init_tile_worker(state: Dict[str, Any]) -> None:
+    """Übernimmt Daten und Einstellungen einmal je Worker-Prozess."""
+    import matplotlib
+    matplotlib.use("Agg")
+    _TILE_STATE.clear()
+    _TILE_STATE.update(state)
+
+
+def _render_tile(x0: int, y0: int, w: int, h: int) -> "np.ndarray":
+    """Rendert das Fenster (x0, y0, w, h) der Gesamtkarte als RGBA-Array (h, w, 4)."""
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from maptool.map_builder import MapBuilder
+
+    st = _TILE_STATE
+    width, height, dpi = st["width"], st["height"], st["dpi"]
+    xmin, xmax, ymin, ymax = st["extent"]
+    sx, sy = (xmax - xmin) / width, (ymax - ymin) / height
+    bleed = st["bleed_px"]
+
+    # Nur Features im Fenster plus Rand (Linienbreiten, Antialiasing)
+    gdf = st["gdf"]
+    subset = gdf.cx[
+        xmin + (x0 - bleed) * sx: xmin + (x0 + w + bleed) * sx,
+        ymax - (y0 + h + bleed) * sy: ymax - (y0 - bleed) * sy,
+    ]
+    if subset.empty:
+        # Ein beliebiges Feature genügt, damit Hintergrund und Scalebar entstehen –
+        # es liegt außerhalb des Fensters und bleibt unsichtbar
+        subset = gdf.iloc[:1]
+
+    fig = Figure(figsize=(w / dpi, h / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_axis_off()
+
+    builder = MapBuilder(
+        cfg=st["cfg"],
+        layers=st["layers"],
+        crs=st["crs"],
+        hide_cfg=st["hide_cfg"],
+        hl_cfg=st["hl_cfg"],
+        gdf=subset.copy(),
+    )
+    builder.width_px, builder.height_px = width, height
+    builder.background = st["background"]
+    builder.scalebar_cfg = st["scalebar_cfg"]
+    builder.extent = st["extent"]
+    builder.view_window = (x0, y0, w, h)
+    builder.build_figure(fig=fig)
+
+    if st["transparent"]:
+        fig.patch.set_alpha(0)
+        ax.patch.set_alpha(0)
+    else:
+        fig.patch.set_facecolor(st["background"]["color"])
+    canvas.draw()
+    buf = np.asarray(canvas.buffer_rgba())
+
+    # Agg rundet die Figure-Größe ab → auf exakt w × h bringen
+    out = np.zeros((h, w, 4), dtype=np.uint8)
+    hh, ww = min(h, buf.shape[0]), min(w, buf.shape[1])
+    out[:hh, :ww] = buf[:hh, :ww]
+    return out
+
+
+def _tile_grid(width: int, height: int, tile: int) -> List[List[Tuple[int, int, int, int]]]:
+    """Kacheln als Zeilenbänder: [[(x0, y0, w, h), …], …] von oben nach unten."""
+    return [
+        [(x, y, min(tile, width - x), min(tile, height - y)) for x in range(0, width, tile)]
+        for y in range(0, height, tile)
+    ]
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def render_tiled(composer: "MapComposer", path, fmt: Optional[str] = None) -> Path:
+    """
+    Rendert die Karte des Composers gekachelt in eine PNG/TIFF-Datei.
+
+    Die Gesamtkarte wird in Kacheln zerlegt, die im Prozess-Pool mit
+    denselben Styles gerendert werden: jede Kachel ist ein Fenster auf
+    dieselbe (virtuelle) Gesamt-Achse, Linien über Kachelgrenzen passen
+    deshalb pixelgenau. Fertige Zeilenbänder werden sofort in den Writer
+    gestreamt: im Speicher liegen höchstens etwa drei Bänder zu tile_px
+    Zeilen über die volle Kartenbreite (zwei in Arbeit, eines beim
+    Schreiben), nicht die Gesamtfläche. Schlägt eine Kachel fehl, wird die
+    angefangene Datei verworfen und der Fehler weitergereicht.
+    """
+    import numpy as np
+
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+    cfg = tiled_settings(composer.session_config)
+    width, height = int(composer.width_px), int(composer.height_px)
+    dpi = composer.session_config.get("export", {}).get("dpi", 300)
+
+    combined = composer._get_combined_gdf()
+    if combined is None or combined.empty:
+        raise ValueError("Keine Daten zum Exportieren")
+
+    # Ausschnitt wie MapBuilder._set_bbox – einmal für alle Kacheln festlegen
+    extent = composer.map_extent(combined)
+
+    state = {
+        "gdf": combined,
+        "cfg": composer.session_config,
+        "layers": composer.primary_layers,
+        "crs": composer.crs,
+        "hide_cfg": composer.hide_cfg,
+        "hl_cfg": composer.hl_cfg,
+        "background": composer.background_cfg,
+        "scalebar_cfg": composer.scalebar_cfg,
+        "transparent": composer.background_cfg["transparent"],
+        "extent": extent,
+        "width": width,
+        "height": height,
+        "dpi": dpi,
+        "bleed_px": cfg["bleed_px"],
+    }
+
+    bands = _tile_grid(width, height, int(cfg["tile_px"]))
+    workers = max(1, cfg["workers"] or os.cpu_count() or 1)
+    start = time.perf_counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = _open_writer(path, fmt, width, height)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, sum(len(b) for b in bands)),
+            initializer=_init_tile_worker,
+            initargs=(state,),
+        ) as pool:
+            # Höchstens zwei Bänder gleichzeitig in Arbeit → begrenzter Speicher
+            def submit(band):
+                return [pool.submit(_render_tile, *tile) for tile in band]
+
+            pending = [submit(b) for b in bands[:2]]
+            for i in range(len(bands)):
+                tiles = [f.result() for f in pending.pop(0)]
+                if i + 2 < len(bands):
+                    pending.append(submit(bands[i + 2]))
+                writer.write_rows(np.concatenate(tiles, axis=1))
+    except BaseException:
+        writer.abort()
+        raise
+    # Erst wenn alle Bänder geschrieben sind: IFD bzw. IEND anhängen
+    writer.close()
+
+    logger.info(
+        "Gekachelter Export %s: %d×%d px, %d Kacheln, %d Prozesse, %.1fs",
+        path.name, width, height, sum(len(b) for b in bands), workers,
+        time.perf_counter() - start,
+    )
+    return path
@@ -0,0 +1,289 @@
+# maptool/xyz_export.py
+
+import logging
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+    from maptool.map_composer import MapComposer
+
+# Defaults für config["export"]["xyz"]
+XYZ_DEFAULTS: Dict[str, Any] = {
+    "min_zoom": 4,
+    "max_zoom": 8,
+    "tile_px": 256,
+    "bleed_px": 8,       # Rand, in dem Features noch in die Kachel gezeichnet werden
+    "workers": None,     # Prozesse (Default: Anzahl CPU-Kerne)
+}
+
+# Web Mercator: halbe Kantenlänge der Welt in Metern
+ORIGIN = 20037508.342789244
+WEB_MERCATOR = "EPSG:3857"
+
+logger = logging.getLogger(__name__)
+
+
+def xyz_settings(session_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**XYZ_DEFAULTS, **session_config.get("export", {}).get("xyz", {})}
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Ausdehnung (minx, miny, maxx, maxy) der XYZ-Kachel in EPSG:3857."""
+    size = 2 * ORIGIN / (1 << z)
+    minx = -ORIGIN + x * size
+    maxy = ORIGIN - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tile_range(bounds: Tuple[float, float, float, float], z: int) -> Tuple[int, int, int, int]:
+    """Kachelindizes (x0, y0, x1, y1), inklusive, die bounds (EPSG:3857) abdecken."""
+    n = 1 << z
+    size = 2 * ORIGIN / n
+
+    def clamp(v):
+        return min(max(v, 0), n - 1)
+
+    minx, miny, maxx, maxy = bounds
+    return (
+        clamp(math.floor((minx + ORIGIN) / size)),
+        clamp(math.floor((ORIGIN - maxy) / size)),
+        clamp(math.floor((maxx + ORIGIN) / size)),
+        clamp(math.floor((ORIGIN - miny) / size)),
+    )
+
+
+# ------------------------------------------------------------
+# Ziele: Verzeichnisbaum oder MBTiles
+# ------------------------------------------------------------
+class DirectoryTileWriter:
+    """Schreibt Kacheln als <root>/<z>/<x>/<y>.png."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def write(self, z: int, x: int, y: int, data: bytes) -> None:
+        folder = self.root / str(z) / str(x)
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"{y}.png").write_bytes(data)
+
+    def close(self, metadata: Dict[str, str]) -> None:
+        pass
+
+
+class MBTilesWriter:
+    """Schreibt Kacheln in eine MBTiles-Datei (SQLite, Zeilen im TMS-Schema)."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(
+            """
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER,
+                                tile_row INTEGER, tile_data BLOB);
+            CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+            """
+        )
+
+    def write(self, z: int, x: int, y: int, data: bytes) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+            (z, x, (1 << z) - 1 - y, sqlite3.Binary(data)),
+        )
+
+    def close(self, metadata: Dict[str, str]) -> None:
+        self._conn.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+        self._conn.commit()
+        self._conn.close()
+
+
+# ------------------------------------------------------------
+# Worker (Prozess-Pool)
+# ------------------------------------------------------------
+_XYZ_STATE: Dict[str, Any] = {}
+
+
+def _init_xyz_worker(state: Dict[str, Any]) -> None:
+    """Übernimmt Daten und Einstellungen einmal je Worker-Prozess."""
+    import matplotlib
+    matplotlib.use("Agg")
+    _XYZ_STATE.clear()
+    _XYZ_STATE.update(state)
+    _XYZ_STATE["zoom_cache"] = {}
+
+
+def _zoom_gdf(z: int) -> "GeoDataFrame":
+    """
+    Auf die Auflösung der Zoomstufe vereinfachte Geometrien samt
+    räumlichem Index – je Worker und Zoomstufe nur einmal berechnet.
+    """
+    cache = _XYZ_STATE["zoom_cache"]
+    if z not in cache:
+        gdf = _XYZ_STATE["gdf"].copy()
+        tolerance = 2 * ORIGIN / ((1 << z) * _XYZ_STATE["tile_px"]) / 2
+        gdf["geometry"] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+        gdf = gdf[~gdf.geometry.is_empty]
+        gdf.sindex  # Index jetzt aufbauen, nicht in der ersten Kachel
+        cache[z] = gdf
+    return cache[z]
+
+
+def _render_xyz_tile(tile: Tuple[int, int, int]) -> Tuple[int, int, int, Optional[bytes]]:
+    """Rendert eine Kachel als PNG; None, wenn in ihr nichts liegt."""
+    import numpy as np
+    from shapely import box
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from maptool.map_builder import MapBuilder
+    from maptool.map_exporter import MapExporter
+
+    st = _XYZ_STATE
+    z, x, y = tile
+    px = st["tile_px"]
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    bleed = st["bleed_px"] * (maxx - minx) / px
+
+    gdf = _zoom_gdf(z)
+    hits = gdf.sindex.query(box(minx - bleed, miny - bleed, maxx + bleed, maxy + bleed))
+    if len(hits) == 0:
+        return z, x, y, None
+
+    fig = Figure(figsize=(1, 1), dpi=px)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_axis_off()
+
+    builder = MapBuilder(
+        cfg=st["cfg"],
+        layers=st["layers"],
+        crs=WEB_MERCATOR,
+        hide_cfg=st["hide_cfg"],
+        hl_cfg=st["hl_cfg"],
+        gdf=gdf.iloc[np.sort(hits)].copy(),
+    )
+    builder.width_px = builder.height_px = px
+    builder.background = st["background"]
+    builder.extent = (minx, maxx, miny, maxy)
+    builder.build_figure(fig=fig)
+
+    rgba = MapExporter.draw_rgba(fig, st["transparent"], None)
+    buffer = BytesIO()
+    MapExporter.encode_raster(rgba, buffer, "png", px, st["raster_options"])
+    return z, x, y, buffer.getvalue()
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def _candidate_tiles(gdf: "GeoDataFrame", bounds, zooms: range, bleed_px: int, tile_px: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Alle Kacheln der Zoomstufen im Kartenausschnitt, in denen laut
+    räumlichem Index etwas liegt – leere Kacheln (nur Meer) entfallen
+    schon hier, ohne gerendert zu werden.
+    """
+    import numpy as np
+    import shapely
+
+    for z in zooms:
+        x0, y0, x1, y1 = tile_range(bounds, z)
+        xs, ys = np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1))
+        xs, ys = xs.ravel(), ys.ravel()
+        size = 2 * ORIGIN / (1 << z)
+        bleed = bleed_px * size / tile_px
+        minx = -ORIGIN + xs * size
+        maxy = ORIGIN - ys * size
+        boxes = shapely.box(minx - bleed, maxy - size - bleed, minx + size + bleed, maxy + bleed)
+        hit = np.unique(gdf.sindex.query(boxes)[0])
+        for i in hit:
+            yield z, int(xs[i]), int(ys[i])
+
+
+def render_xyz(
+    composer: "MapComposer",
+    out,
+    min_zoom: Optional[int] = None,
+    max_zoom: Optional[int] = None,
+) -> Path:
+    """
+    Rendert die Komposition des Composers als XYZ-Kachelpyramide
+    (Web Mercator) für min_zoom…max_zoom. Endet out auf .mbtiles, landen
+    die Kacheln in einer MBTiles-Datei, sonst als <out>/<z>/<x>/<y>.png.
+
+    Daten werden einmal geladen und nach EPSG:3857 gebracht; die Worker
+    vereinfachen je Zoomstufe einmal und rendern dann alle Kacheln dieser
+    Stufe mit den Styles des MapBuilder.
+    """
+    from data_processing.crs import reproject, transform_bounds
+    from maptool.map_exporter import raster_options
+
+    out = Path(out)
+    cfg = xyz_settings(composer.session_config)
+    min_zoom = cfg["min_zoom"] if min_zoom is None else min_zoom
+    max_zoom = cfg["max_zoom"] if max_zoom is None else max_zoom
+    tile_px = int(cfg["tile_px"])
+
+    combined = composer._get_combined_gdf()
+    if combined is None or combined.empty:
+        raise ValueError("Keine Daten zum Exportieren")
+    gdf = reproject(combined, WEB_MERCATOR)
+
+    # Pyramide über den Kartenausschnitt der Komposition
+    xmin, xmax, ymin, ymax = composer.map_extent(gdf)
+    bounds = (xmin, ymin, xmax, ymax)
+
+    # Kachelweise ohne Scalebar
+    session = {**composer.session_config, "scalebar": {"show": False}}
+    state = {
+        "gdf": gdf,
+        "cfg": session,
+        "layers": composer.primary_layers,
+        "hide_cfg": composer.hide_cfg,
+        "hl_cfg": composer.hl_cfg,
+        "background": composer.background_cfg,
+        "transparent": composer.background_cfg["transparent"],
+        "raster_options": raster_options(composer.session_config),
+        "tile_px": tile_px,
+        "bleed_px": cfg["bleed_px"],
+    }
+
+    tiles = list(_candidate_tiles(gdf, bounds, range(min_zoom, max_zoom + 1), cfg["bleed_px"], tile_px))
+    workers = max(1, min(cfg["workers"] or os.cpu_count() or 1, len(tiles) or 1))
+    writer = MBTilesWriter(out) if out.suffix.lower() == ".mbtiles" else DirectoryTileWriter(out)
+
+    start = time.perf_counter()
+    written = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_xyz_worker, initargs=(state,)
+        ) as pool:
+            for z, x, y, data in pool.map(_render_xyz_tile, tiles, chunksize=8):
+                if data is not None:
+                    writer.write(z, x, y, data)
+                    written += 1
+    finally:
+        lon_lat = transform_bounds(bounds, WEB_MERCATOR, "EPSG:4326")
+        writer.close({
+            "name": out.stem,
+            "format": "png",
+            "type": "overlay",
+            "version": "1",
+            "minzoom": str(min_zoom),
+            "maxzoom": str(max_zoom),
+            "bounds": ",".join(f"{v:.6f}" for v in lon_lat),
+        })
+
+    logger.info(
+        "XYZ-Export %s: Zoom %d–%d, %d Kacheln (%d leer übersprungen), %d Prozesse, %.1fs",
+        out.name, min_zoom, max_zoom, written, len(tiles) - written, workers,
+        time.perf_counter() - start,
+    )
+    return out
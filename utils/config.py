@@ -2,8 +2,9 @@ import json
 import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Optional, Tuple, Union
 import copy
+import threading
 
 # Basis-Verzeichnis (Projekt-Root)
 BASE_DIR = Path(__file__).parent.parent
@@ -11,6 +12,27 @@ BASE_DIR = Path(__file__).parent.parent
 # Standard-Pfad zur JSON-Konfigurationsdatei
 DEFAULT_CONFIG_PATH = BASE_DIR / "config" / "config.json"
 
+# Geparste JSON-Dateien: Pfad -> (mtime_ns, Inhalt)
+_JSON_CACHE: Dict[Path, Tuple[int, Any]] = {}
+_JSON_LOCK = threading.Lock()
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """
+    Liest eine JSON-Datei (config.json, epsg_list.json, …) genau einmal
+    pro Dateiversion. Alle Loader teilen sich diesen Cache; das Ergebnis
+    ist geteilt und darf nicht verändert werden.
+    """
+    json_path = Path(path).resolve()
+    mtime = json_path.stat().st_mtime_ns
+    with _JSON_LOCK:
+        cached = _JSON_CACHE.get(json_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+        _JSON_CACHE[json_path] = (mtime, data)
+        return data
+
 
 def setup_logging(log_cfg: dict):
     """
@@ -58,8 +80,9 @@ def setup_logging(log_cfg: dict):
 
 def load_config(path: Union[str, Path] = None) -> dict:
     """
-    Lädt die JSON-Konfiguration, richtet Logging ein
-    und liest optional die EPSG-Liste (assets/epsg_list.json).
+    Lädt die JSON-Konfiguration und liest optional die EPSG-Liste
+    (assets/epsg_list.json). Hat keine Nebenwirkungen – Logging richtet
+    der Aufrufer bei Bedarf selbst über setup_logging() ein.
     """
     cfg_path = Path(path) if path else DEFAULT_CONFIG_PATH
     if not cfg_path.is_absolute():
@@ -67,11 +90,9 @@ def load_config(path: Union[str, Path] = None) -> dict:
     if not cfg_path.exists():
         raise FileNotFoundError(f"Config nicht gefunden: {cfg_path}")
 
-    config = json.loads(cfg_path.read_text(encoding="utf-8"))
-
-    # Logging initialisieren
-    log_cfg = config.setdefault("logging", {})
-    setup_logging(log_cfg)
+    # Kopie, da die Config unten ergänzt wird und der Cache unverändert bleiben muss
+    config = copy.deepcopy(read_json(cfg_path))
+    config.setdefault("logging", {})
 
     # EPSG-Liste aus assets/epsg_list.json laden
     assets = config.get("assets", {})
@@ -79,9 +100,7 @@ def load_config(path: Union[str, Path] = None) -> dict:
     if epsg_rel:
         epsg_path = BASE_DIR / epsg_rel
         if epsg_path.exists():
-            config["epsg_list"] = json.loads(
-                epsg_path.read_text(encoding="utf-8")
-            )
+            config["epsg_list"] = read_json(epsg_path)
         else:
             logging.getLogger(__name__).warning(
                 "epsg_list.json nicht gefunden: %s", epsg_path
@@ -111,36 +130,64 @@ def load_config(path: Union[str, Path] = None) -> dict:
 class ConfigManager:
     """
     Verwaltet Basis-Config (aus config.json) und Session-Config (Laufzeit).
-    - Basis-Config wird nur einmal geladen und nie verändert.
+    - Basis-Config wird erst beim ersten Zugriff geladen und nie verändert.
     - Session-Config ist eine Kopie, die alle User-Änderungen enthält.
     """
 
-    def __init__(self, base_config: dict):
+    def __init__(self, base_config: Optional[dict] = None, path: Union[str, Path, None] = None):
+        self._path = path
+        self._lock = threading.Lock()
         self._base = base_config
-        self._session = copy.deepcopy(base_config)
+        self._session = copy.deepcopy(base_config) if base_config is not None else None
+
+    def _ensure_loaded(self) -> None:
+        """Lädt config.json beim ersten Zugriff (nicht schon beim Import)."""
+        if self._base is not None:
+            return
+        with self._lock:
+            if self._base is None:
+                base = load_config(self._path)
+                self._session = copy.deepcopy(base)
+                self._base = base
 
     def get_session(self) -> dict:
         """Gibt die aktuelle Session-Config zurück."""
+        self._ensure_loaded()
         return self._session
 
     def update_session(self, key: str, value):
         """Aktualisiert einen Wert in der Session-Config."""
+        self._ensure_loaded()
         self._session[key] = value
 
     def reset_session(self):
-        """Setzt die Session-Config auf die Basis-Config zurück."""
-        self._session = copy.deepcopy(self._base)
+        """
+        Setzt die Session-Config auf die Basis-Config zurück.
+        Das Dict wird in-place ersetzt, damit Composer, Builder und Controller,
+        die eine Referenz halten, die zurückgesetzten Werte sehen.
+        """
+        self._ensure_loaded()
+        self._session.clear()
+        self._session.update(copy.deepcopy(self._base))
 
     def get_base(self) -> dict:
         """Gibt die unveränderte Basis-Config zurück (nur lesen!)."""
+        self._ensure_loaded()
         return self._base
 
 
-# Basis-Config laden
-BASE_CONFIG = load_config()
+# ConfigManager initialisieren (config.json wird erst beim ersten Zugriff gelesen)
+config_manager = ConfigManager()
 
-# ConfigManager initialisieren
-config_manager = ConfigManager(BASE_CONFIG)
 
-# Shortcut für Scalebar-Settings
-SCALER = BASE_CONFIG.get("scalebar", {})
+def __getattr__(name: str):
+    """
+    Lazy-Zugriff auf die früheren Modul-Konstanten:
+    - BASE_CONFIG: Basis-Config
+    - SCALER:      Scalebar-Settings der Basis-Config
+    """
+    if name == "BASE_CONFIG":
+        return config_manager.get_base()
+    if name == "SCALER":
+        return config_manager.get_base().setdefault("scalebar", {})
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,10 @@
 # utils/crs_selector.py
 
-import json
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 
+from utils.config import read_json
+
 # Modul­verzeichnis (utils/)
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -15,9 +16,9 @@ EPSG_LIST_PATH  = BASE_DIR.parent / "assets" / "epsg_list.json"
 def load_config(path: Path = CONFIG_PATH) -> Dict[str, Any]:
     """
     Lädt die Haupt-Konfiguration (config.json) und gibt sie als Dict zurück.
+    Die Datei wird über den gemeinsamen JSON-Cache nur einmal geparst.
     """
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(path)
 
 
 def get_regions(config: Dict[str, Any]) -> List[str]:
@@ -47,9 +48,9 @@ def load_epsg_list(path: Path = EPSG_LIST_PATH) -> List[Dict[str, Any]]:
       - 'epsg':       EPSG-Code (Integer)
       - 'projektion': Beschreibung der Projektion
       - 'hinweis':    ggf. zusätzlicher Hinweis
+    Die Datei wird über den gemeinsamen JSON-Cache nur einmal geparst.
     """
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(path)
 
 
 def get_country_names(epsg_list: List[Dict[str, Any]]) -> List[str]:
@@ -1,4 +1,6 @@
-import os, json
+import os
+
+from utils.config import read_json
 
 def get_asset_path(filename):
     base_path = os.path.abspath(os.path.dirname(__file__))
@@ -6,5 +8,5 @@ def get_asset_path(filename):
     return os.path.normpath(asset_path)
 
 def load_epsg_list():
-    with open(get_asset_path('epsg_list.json'), 'r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+    # Gemeinsamer JSON-Cache: epsg_list.json wird nur einmal geparst
+    return read_json(get_asset_path('epsg_list.json'))
\ No newline at end of file
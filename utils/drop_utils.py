@@ -1,16 +1,16 @@
 # mapTool_gui/utils/drop_utils.py
 
 import os
-import shutil
-import tempfile
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import QListWidget, QAbstractItemView, QWidget, QVBoxLayout, QLabel
 
 
 class DropZoneLogic(QListWidget):
     """
-    Basisklasse für eine Drop-Zone, die .gpkg-Dateien akzeptiert,
-    intern Pfade und optional Kopien verwaltet.
+    Basisklasse für eine Drop-Zone, die .gpkg-Dateien akzeptiert und
+    ihre Pfade verwaltet. Beim Ablegen wird nur der Pfad gemerkt; das
+    Anmelden in der Quell-Registry (samt Schnappschuss bei copy_to_temp)
+    übernimmt der IngestTask im Hintergrund (siehe gui.ingest_worker).
     """
     dropChanged = Signal()
 
@@ -26,10 +26,6 @@ class DropZoneLogic(QListWidget):
         self.allow_multiple = allow_multiple
         self.copy_to_temp = copy_to_temp
 
-        self._temp_dir = None
-        if self.copy_to_temp:
-            self._temp_dir = tempfile.mkdtemp(prefix="maptool_")
-
         self._setup_ui()
         # Platzhaltertext initial setzen
         self.addItem(f"Datei hier ablegen ({self.title})")
@@ -79,13 +75,8 @@ class DropZoneLogic(QListWidget):
         for src in gpkg:
             name = os.path.basename(src)
 
-            # Original belassen oder in temp kopieren
-            if self.copy_to_temp:
-                dst = self._unique_temp_path(name)
-                shutil.copy2(src, dst)
-                store_path = dst
-            else:
-                store_path = src
+            # Nur den Pfad merken – Registrieren/Schnappschuss im IngestTask, nicht im GUI-Thread
+            store_path = os.path.abspath(src)
 
             # Platzhalter entfernen, falls vorhanden
             if self.count() == 1 and not self.item(0).data(Qt.UserRole):
@@ -100,18 +91,8 @@ class DropZoneLogic(QListWidget):
         if added:
             self.dropChanged.emit()
 
-    def _unique_temp_path(self, filename: str) -> str:
-        """Erzeugt einen einzigartigen Pfad im Temp-Ordner."""
-        base, ext = os.path.splitext(filename)
-        dst = os.path.join(self._temp_dir, filename)
-        idx = 1
-        while os.path.exists(dst):
-            dst = os.path.join(self._temp_dir, f"{base}_{idx}{ext}")
-            idx += 1
-        return dst
-
     def get_paths(self) -> list[str]:
-        """Alle gespeicherten (originalen oder kopierten) Pfade."""
+        """Alle gespeicherten Pfade (Originale; Lesepfad über source_registry.resolve)."""
         return [
             self.item(i).data(Qt.UserRole)
             for i in range(self.count())
@@ -123,22 +104,19 @@ class DropZoneLogic(QListWidget):
         Leert die Drop-Zone vollständig:
         - Entfernt alle Einträge aus der Anzeige
         - Setzt Platzhaltertext zurück
-        - Löscht ggf. temporäre Dateien
-        - Erstellt bei Bedarf einen neuen Temp-Ordner
+        - Meldet die Dateien bei der Quell-Registry ab (löscht Schnappschüsse)
         """
+        from data_processing.sources import source_registry
+
+        dropped = set(self.get_paths())
         super().clear()
 
         # Platzhaltertext wieder anzeigen
         self.addItem(f"Datei hier ablegen ({self.title})")
 
-        # Temporäre Dateien löschen, falls vorhanden
-        if self.copy_to_temp and self._temp_dir and os.path.exists(self._temp_dir):
-            try:
-                shutil.rmtree(self._temp_dir)
-            except Exception:
-                pass
-            # Neuen Temp-Ordner anlegen
-            self._temp_dir = tempfile.mkdtemp(prefix="maptool_")
+        # Nur diese Zone abmelden – andere Zonen behalten ihre Quellen
+        if dropped:
+            source_registry.forget(dropped)
 
 
 class DropPanel(QWidget):
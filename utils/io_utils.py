@@ -14,8 +14,12 @@ def find_gpkg_files(
     Findet im Verzeichnis hauptland_dir die erste .gpkg-Datei
     und lädt aus nebenlaender_dir alle .gpkg-Dateien als GeoDataFrames
     unter Verwendung des Layers nebenlayer_name.
+    Welche Dateien den Layer überhaupt haben, beantwortet der Katalog
+    (inkrementell aktualisiert) – Dateien ohne den Layer werden nicht geöffnet.
     Liefert (pfad_haupt_gpkg, [gdf_neben1, gdf_neben2, ...]).
     """
+    from data_processing.catalog import get_catalog
+
     # Hauptland-GPKG finden
     haupt_files = [f for f in os.listdir(hauptland_dir) if f.endswith(".gpkg")]
     if not haupt_files:
@@ -23,12 +27,16 @@ def find_gpkg_files(
     haupt_path = os.path.join(hauptland_dir, haupt_files[0])
 
     # Nebenländer laden
+    catalog = get_catalog()
+    catalog.refresh(nebenlaender_dir)
     neben_gdfs: List[gpd.GeoDataFrame] = []
-    for fname in os.listdir(nebenlaender_dir):
+    for fname in sorted(os.listdir(nebenlaender_dir)):
         if not fname.endswith(".gpkg"):
             continue
         pfad = os.path.join(nebenlaender_dir, fname)
+        if nebenlayer_name not in (catalog.layers(pfad) or [nebenlayer_name]):
+            continue
         gdf = gpd.read_file(pfad, layer=nebenlayer_name)
         neben_gdfs.append(gdf)
 
-    return haupt_path, neben_gdfs
\ No newline at end of file
+    return haupt_path, neben_gdfs
@@ -1,20 +1,38 @@
 #layer_selector.py
 
-from fiona import listlayers
-import geopandas as gpd
 import os
 
+from data_processing.cache import file_signature, layer_cache
+
 def get_simplest_layer(gpkg_path: str) -> list[str]:
     """
     Gibt den 'einfachsten' Layer einer Datei zurück.
     - Für GPKG: bevorzugt ADM_ADM_0, sonst Layer mit den wenigsten Geometrien.
     - Für Shapefiles: gibt [] zurück, da es nur einen Layer gibt.
+    Das Ergebnis wird pro Dateisignatur im Layer-Cache gemerkt.
     """
     ext = os.path.splitext(gpkg_path)[1].lower()
     if ext == ".shp":
         # Shapefile → kein Layername nötig
         return []
 
+    key = (file_signature(gpkg_path), "simplest_layer")
+    return list(layer_cache.get_or_load(key, lambda: _find_simplest_layer(gpkg_path)))
+
+
+def _find_simplest_layer(gpkg_path: str) -> list[str]:
+    # Katalog kennt die Feature-Anzahl je Layer – kein Layer muss gelesen werden
+    from data_processing.catalog import get_catalog
+    try:
+        layer = get_catalog().simplest_layer(gpkg_path)
+    except Exception:
+        layer = None
+    if layer:
+        return [layer]
+
+    from fiona import listlayers
+    import geopandas as gpd
+
     layers = listlayers(gpkg_path)
     if "ADM_ADM_0" in layers:
         return ["ADM_ADM_0"]
@@ -1,7 +1,6 @@
 # scalebar.py
 
-import numpy as np
-from pyproj import CRS, Transformer
+import math
 
 def pixel_to_pt(px: float, dpi: float) -> float:
     """
@@ -15,7 +14,7 @@ def nice_number(x: float) -> float:
     """
     if x <= 0:
         return 0
-    exp = np.floor(np.log10(x))
+    exp = math.floor(math.log10(x))
     f   = x / 10**exp
     if f < 1.5:   nice_f = 1
     elif f < 3:   nice_f = 2
@@ -42,11 +41,13 @@ def add_scalebar(ax, extent, src_crs, config,
         return
 
     # 1) Kartenbreite in Meter berechnen
-    crs_obj = CRS.from_user_input(src_crs)
+    from data_processing.proj_cache import proj_cache
+    crs_obj = proj_cache.crs(src_crs)
     if crs_obj.is_geographic:
-        transformer = Transformer.from_crs(crs_obj, "EPSG:3857", always_xy=True)
-        xmin_m, ymin_m = transformer.transform(extent[0], extent[2])
-        xmax_m, ymax_m = transformer.transform(extent[1], extent[3])
+        transformer = proj_cache.transformer(crs_obj, "EPSG:3857", always_xy=True)
+        (xmin_m, xmax_m), (ymin_m, ymax_m) = transformer.transform(
+            [extent[0], extent[1]], [extent[2], extent[3]]
+        )
     else:
         xmin_m, xmax_m, ymin_m, ymax_m = extent
     map_width_m = xmax_m - xmin_m
@@ -0,0 +1,156 @@
+# utils/startup_timing.py
+
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Umgebungsvariable, mit der sich der Bericht ohne CLI-Flag einschalten lässt
+ENV_FLAG = "MAPTOOL_STARTUP_TIMING"
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Umhüllt einen Loader und misst die Ausführungszeit des Moduls."""
+
+    def __init__(self, loader, fullname: str, timer: "StartupTimer") -> None:
+        self._loader = loader
+        self._fullname = fullname
+        self._timer = timer
+
+    def create_module(self, spec):
+        # Bei C-Erweiterungen passiert hier der Großteil der Arbeit
+        self._timer._enter_import(self._fullname)
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._timer._leave_import(self._fullname)
+
+    def exec_module(self, module) -> None:
+        self._timer._enter_import(self._fullname)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._leave_import(self._fullname)
+
+    def __getattr__(self, name):
+        # get_source, get_resource_reader, … an den echten Loader durchreichen
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta-Path-Finder, der die Specs der übrigen Finder mit _TimingLoader versieht."""
+
+    def __init__(self, timer: "StartupTimer") -> None:
+        self._timer = timer
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, fullname, self._timer)
+            return spec
+        return None
+
+
+class StartupTimer:
+    """
+    Misst den Kaltstart der GUI:
+    - Phasen (mark): Zeit seit Prozessstart bis Config, Qt-App, Fenster, …
+    - Importe: eigene und kumulierte Zeit je Modul, wie `python -X importtime`
+    """
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._marks: List[Tuple[str, float]] = []
+        # Modul -> (Tiefe, eigene Zeit, kumulierte Zeit) in Sekunden, in Importreihenfolge
+        self._imports: Dict[str, List[float]] = {}
+        self._stack: List[Tuple[str, float, float]] = []
+        self._finder: Optional[_TimingFinder] = None
+        self._thread_id = threading.get_ident()
+
+    @property
+    def enabled(self) -> bool:
+        return self._finder is not None
+
+    def enable(self) -> None:
+        """Installiert den Import-Hook. Nur bereits nicht geladene Module werden erfasst."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def disable(self) -> None:
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def mark(self, label: str) -> None:
+        """Merkt sich einen Zeitpunkt (Sekunden seit Timer-Start)."""
+        self._marks.append((label, time.perf_counter() - self._t0))
+
+    # ------------------------------------------------------------
+    # Import-Messung (nur im Hauptthread, wie -X importtime)
+    # ------------------------------------------------------------
+    def _enter_import(self, name: str) -> None:
+        if threading.get_ident() != self._thread_id:
+            return
+        self._stack.append((name, time.perf_counter(), 0.0))
+
+    def _leave_import(self, name: str) -> None:
+        if threading.get_ident() != self._thread_id or not self._stack:
+            return
+        _, started, children = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        entry = self._imports.setdefault(name, [len(self._stack), 0.0, 0.0])
+        entry[1] += cumulative - children
+        entry[2] += cumulative
+        if self._stack:
+            parent, p_started, p_children = self._stack[-1]
+            self._stack[-1] = (parent, p_started, p_children + cumulative)
+
+    # ------------------------------------------------------------
+    # Bericht
+    # ------------------------------------------------------------
+    def report(self, top: int = 25) -> str:
+        lines = ["Startzeit-Bericht (mapTool GUI)", "Phasen:"]
+        for label, t in self._marks:
+            lines.append(f"  {t * 1000:9.1f} ms  {label}")
+
+        if self._imports:
+            lines.append("Importe (Format wie -X importtime):")
+            lines.append("import time:  self [us] | cumulative | imported package")
+            for name, (depth, self_t, cum_t) in self._imports.items():
+                lines.append(
+                    f"import time: {self_t * 1e6:10.0f} | {cum_t * 1e6:10.0f} | {'  ' * int(depth)}{name}"
+                )
+
+            slowest = sorted(self._imports.items(), key=lambda kv: kv[1][2], reverse=True)
+            top_level = [(n, v) for n, v in slowest if v[0] == 0][:top]
+            lines.append(f"Langsamste Top-Level-Importe (max. {top}):")
+            for name, (_, _, cum_t) in top_level:
+                lines.append(f"  {cum_t * 1000:9.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        """Schreibt den Bericht nach stderr und ins Log (sichtbar im Log-Widget)."""
+        text = self.report()
+        print(text, file=sys.stderr)
+        logging.getLogger("maptool.startup").info("%s", text)
+
+
+def timing_requested(argv: List[str]) -> bool:
+    """True, wenn --startup-timing übergeben oder MAPTOOL_STARTUP_TIMING gesetzt ist."""
+    return "--startup-timing" in argv or os.environ.get(ENV_FLAG, "") not in ("", "0")
+
+
+# Gemeinsame Instanz für main.py
+startup_timer = StartupTimer()